@@ -0,0 +1,125 @@
+"""앱 시작(import) 시간 측정 - python -X importtime 기반
+
+    python benchmarks/import_time.py              # 측정 후 기준값과 비교
+    python benchmarks/import_time.py --update     # 기준값 다시 저장
+
+모듈마다 새 프로세스에서 여러 번 import해서 누적 시간의 중앙값을 구한다.
+기준값보다 TOLERANCE 이상 느려졌거나, 시작할 때 불러오면 안 되는
+모듈(LAZY_MODULES)이 불러와지면 종료 코드 1로 끝난다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "results", "import_time.json")
+
+# 측정할 모듈 (페이지는 모두 main과 core.service를 불러오므로 이 둘로 대표)
+TARGETS = ["core.service", "main"]
+# 처음 쓸 때 불러오도록 미뤄 둔 모듈 - 시작할 때 불러와지면 실패
+LAZY_MODULES = {
+    "core.service": ["streamlit", "openpyxl", "PIL", "webbrowser"],
+    "main": ["openpyxl", "PIL", "webbrowser"],
+}
+# 기준값보다 이 비율 이상 느려지면 실패
+TOLERANCE = 0.25
+
+
+def _run(code, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run(
+        command + ["-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 -> {모듈: (자체 시간, 누적 시간)} (마이크로초)"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(module, runs):
+    """module을 runs번 새로 import한 누적 시간(ms) 목록과 마지막 실행의 모듈별 시간"""
+    samples = []
+    for _ in range(runs):
+        times = parse_importtime(_run(f"import {module}", importtime=True).stderr)
+        samples.append(times[module][1] / 1000)
+    return samples, times
+
+
+def loaded_lazy_modules(module):
+    """module을 import했을 때 불러와진 LAZY_MODULES 목록"""
+    lazy = LAZY_MODULES.get(module, [])
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {lazy!r} if m in sys.modules))"
+    )
+    output = _run(code).stdout.strip()
+    return output.split(",") if output else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 시작(import) 시간 측정")
+    parser.add_argument("--runs", type=int, default=5, help="모듈마다 측정 횟수")
+    parser.add_argument("--top", type=int, default=10, help="느린 모듈 표시 개수")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="기준값 파일")
+    parser.add_argument("--update", action="store_true", help="기준값 다시 저장")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+    for module in TARGETS:
+        samples, times = measure(module, args.runs)
+        median = statistics.median(samples)
+        results[module] = round(median, 1)
+
+        print(f"{module}: {median:.1f} ms (중앙값, {args.runs}회)")
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, cumulative_us) in slowest[: args.top]:
+            print(f"    {self_us / 1000:8.1f} ms  {cumulative_us / 1000:8.1f} ms  {name}")
+
+        loaded = loaded_lazy_modules(module)
+        if loaded:
+            failures.append(f"{module}: 시작할 때 불러오면 안 되는 모듈 {', '.join(loaded)}")
+
+        limit = baseline.get(module)
+        if limit is not None and not args.update and median > limit * (1 + TOLERANCE):
+            failures.append(
+                f"{module}: {median:.1f} ms > 기준 {limit:.1f} ms x {1 + TOLERANCE}"
+            )
+
+    if args.update:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {args.baseline}")
+
+    for failure in failures:
+        print(f"실패 - {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""배치 생성, 불러오기/저장, 내보내기, 배치 기록 화면, 로그인 성능 측정
+
+    python benchmarks/suite.py                          # small, medium을 csv로 측정
+    python benchmarks/suite.py --scenario all --backend csv --backend sqlite
+    python benchmarks/suite.py --update                 # 기준값 다시 저장
+
+시나리오마다 새 임시 데이터 폴더에 같은 seed로 만든 가상 팀원/구역/배치 기록을
+저장하고, 새 프로세스에서 (모듈 캐시가 없는 상태로) 측정한다.
+실행할 때마다 결과를 HISTORY_FILE에 추가하고, 기준값(BASELINE_FILE)보다
+TOLERANCE 비율과 MIN_DELTA_MS 이상 느려진 항목이 있으면 종료 코드 1로 끝난다.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+BASELINE_FILE = os.path.join(RESULTS_DIR, "suite_baseline.json")
+HISTORY_FILE = os.path.join(RESULTS_DIR, "suite_history.json")
+
+# 시나리오: (팀원 수, 구역 수, 배치 기록 행 수)
+SCENARIOS = {
+    "small": (18, 7, 1_000),
+    "small-history": (18, 7, 1_000_000),
+    "medium": (500, 50, 100_000),
+    "large": (5_000, 500, 1_000_000),
+}
+DEFAULT_SCENARIOS = ["small", "medium"]
+# 기준값보다 이 비율 이상, 그리고 MIN_DELTA_MS 이상 느려지면 실패
+# (아주 짧은 작업은 몇 ms 차이도 비율로는 크므로 절대값 조건을 함께 씀)
+TOLERANCE = 0.25
+MIN_DELTA_MS = 5.0
+# 가상 데이터 seed와 로그인 측정용 계정
+SEED = 20240101
+PASSWORD = "benchmark"
+
+
+def build_data(members, areas, rows, seed=SEED):
+    """가상 데이터를 현재 저장소(환경 변수로 고른 데이터 폴더)에 저장
+
+    배치마다 모든 팀원이 한 구역씩 맡고, 구역 필요인원 합은 팀원 수와 같다.
+    배치 날짜는 2000-01-01 09:00부터 한 시간 간격.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from core import auth
+    from core.backends import get_backend
+
+    backend = get_backend()
+    rng = np.random.default_rng(seed)
+
+    member_ids = np.array(backend.next_ids("members", members))
+    member_names = np.array([f"팀원{i:04d}" for i in range(members)], dtype=object)
+    backend.save(
+        "members",
+        pd.DataFrame({"id": member_ids, "이름": member_names, "활성": True}),
+    )
+
+    # 필요인원을 고르게 나누고 나머지는 앞 구역부터 한 명씩 더함
+    need = np.full(areas, members // areas)
+    need[: members % areas] += 1
+    area_ids = np.array(backend.next_ids("areas", areas))
+    area_names = np.array([f"구역{i:03d}" for i in range(areas)], dtype=object)
+    backend.save(
+        "areas",
+        pd.DataFrame({"id": area_ids, "구역명": area_names, "필요인원": need}),
+    )
+
+    batches = max(rows // members, 1)
+    slots = np.repeat(np.arange(areas), need)  # 자리마다 구역 위치
+    picks = rng.permuted(np.tile(np.arange(members), (batches, 1)), axis=1).ravel()
+    start = datetime.datetime(2000, 1, 1, 9)
+    dates = np.array(
+        [f"{start + datetime.timedelta(hours=i):%Y-%m-%d %H:%M:%S}" for i in range(batches)],
+        dtype=object,
+    )
+    area_pos = np.tile(slots, batches)
+    backend.save(
+        "assignments",
+        pd.DataFrame(
+            {
+                "날짜": np.repeat(dates, members),
+                "구역": area_names[area_pos],
+                "담당자": member_names[picks],
+                "구역_id": area_ids[area_pos],
+                "담당자_id": member_ids[picks],
+            }
+        ),
+    )
+
+    # 로그인 측정용 계정 (해시 계산은 한 번만 하고 모든 계정이 같이 씀)
+    hashed = auth.hash_password(PASSWORD)
+    backend.save(
+        "users",
+        pd.DataFrame(
+            {
+                "id": backend.next_ids("users", members),
+                "username": [f"user{i:04d}" for i in range(members)],
+                "password": hashed,
+                "is_admin": False,
+            }
+        ),
+    )
+    return batches * members
+
+
+def measure(func, runs, setup=None):
+    """func를 runs번 실행한 시간(ms) {"first", "median", "min"}
+
+    setup이 있으면 실행마다 먼저 호출하고 (시간에 넣지 않음) 그 반환값을 func에 넘긴다.
+    setup이 없으면 func를 인자 없이 호출한다.
+    """
+    samples = []
+    for _ in range(runs):
+        prepared = setup() if setup else None
+        started = time.perf_counter()
+        func(prepared) if setup else func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "first": round(samples[0], 2),
+        "median": round(statistics.median(samples), 2),
+        "min": round(min(samples), 2),
+    }
+
+
+def run_worker(scenario, runs):
+    """현재 프로세스에서 한 시나리오 측정 (환경 변수로 임시 데이터 폴더를 받음)"""
+    members, areas, rows = SCENARIOS[scenario]
+    started = time.perf_counter()
+    history_rows = build_data(members, areas, rows)
+    setup_seconds = time.perf_counter() - started
+
+    from core import auth, service, storage, templates
+    from core.backends import ParquetBackend, get_backend
+    from core.names import group_by_area
+
+    service.initialize_data()
+    results = {}
+
+    def clear_caches():
+        """저장소 캐시와 Parquet 월 파일/요약 캐시 비우기"""
+        storage.invalidate()
+        backend = get_backend()
+        if isinstance(backend, ParquetBackend):
+            backend.clear_cache()
+
+    # 불러오기는 캐시를 비운 뒤(파일을 다시 읽는 경우), 저장은 불러온 그대로 다시 저장
+    for table in ["members", "areas", "assignments", "users"]:
+        load = getattr(service, f"load_{table}")
+        save = getattr(service, f"save_{table}")
+
+        def cold_load(load=load):
+            clear_caches()
+            return load()
+
+        results[f"load_{table}"] = measure(
+            lambda _, load=load: load(), runs, setup=clear_caches
+        )
+        results[f"save_{table}"] = measure(
+            lambda df, save=save: save(df, expected_version=df.attrs.get("version")),
+            runs,
+            setup=cold_load,
+        )
+
+    # 기간 내보내기: 기록 화면 기본값처럼 최근 배치가 있는 달의 1일부터 그 날까지
+    # (배치 생성이 오늘 날짜 배치를 추가하기 전에 측정)
+    latest = datetime.date.fromisoformat(
+        str(service.load_batch_index()["날짜"].iloc[-1])[:10]
+    )
+
+    def export_history():
+        with tempfile.TemporaryFile() as f:
+            return service.export_history_to_excel(f, latest.replace(day=1), latest)
+
+    results["export_history_to_excel"] = measure(export_history, runs)
+
+    # 배치 생성 (실행마다 배치가 하나씩 추가됨 - 처음 실행은 담당 이력 계산 포함)
+    results["generate_assignment"] = measure(service.generate_assignment, runs)
+
+    def latest_batch():
+        dates = service.load_batch_index()["날짜"].astype(str)
+        return service.load_assignment_batch(dates.iloc[-1])
+
+    results["export_assignment_to_excel"] = measure(
+        service.export_assignment_to_excel, runs, setup=latest_batch
+    )
+
+    # 배치 기록 화면: 목록 한 페이지, 최신 배치 읽기, 구역별 묶기, 안내 메시지
+    def records():
+        page, _ = service.list_assignment_batches(limit=20)
+        date = page["날짜"].iloc[0]
+        grouped = group_by_area(service.load_assignment_batch(date))
+        return templates.render_template(date, grouped)
+
+    results["records_page"] = measure(records, runs)
+
+    # 로그인: 색인을 새로 만드는 조회, 색인이 있을 때 조회, 로그인 전체 (작업자 스레드)
+    username = f"user{members - 1:04d}"
+    results["login_lookup_cold"] = measure(
+        lambda _: auth.get_user(username), runs, setup=auth.invalidate
+    )
+    results["login_lookup"] = measure(lambda: auth.get_user(username), runs)
+    results["login_verify"] = measure(
+        lambda: auth.login_async(username, PASSWORD).result(), runs
+    )
+
+    return {
+        "members": members,
+        "areas": areas,
+        "history_rows": history_rows,
+        "setup_seconds": round(setup_seconds, 2),
+        "results": results,
+    }
+
+
+def run_scenario(scenario, backend, runs):
+    """새 임시 데이터 폴더와 새 프로세스에서 시나리오 측정"""
+    data_dir = tempfile.mkdtemp(prefix=f"bench-{scenario}-{backend}-")
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        CLEANING_DATA_DIR=data_dir,
+        CLEANING_STORAGE_BACKEND=backend,
+    )
+    for name in ["CLEANING_SQLITE_FILE", "CLEANING_PARQUET_DIR"]:
+        env.pop(name, None)
+    try:
+        completed = subprocess.run(
+            [sys.executable, __file__, "--worker", scenario, "--runs", str(runs)],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"{scenario}/{backend} 측정 실패\n{completed.stderr}")
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치/저장소/내보내기/로그인 성능 측정")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS) + ["all"],
+        help=f"측정할 시나리오 (여러 번 지정 가능, 기본값: {', '.join(DEFAULT_SCENARIOS)})",
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=["csv", "sqlite", "parquet"],
+        help="저장소 종류 (여러 번 지정 가능, 기본값: csv)",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="항목마다 측정 횟수")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="기준값 파일")
+    parser.add_argument("--history", default=HISTORY_FILE, help="측정 기록 파일")
+    parser.add_argument("--update", action="store_true", help="기준값 다시 저장")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.runs), ensure_ascii=False))
+        return 0
+
+    scenarios = args.scenario or DEFAULT_SCENARIOS
+    if "all" in scenarios:
+        scenarios = list(SCENARIOS)
+    backends = args.backend or ["csv"]
+
+    baseline = _load_json(args.baseline, {})
+    entry = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "runs": args.runs,
+        "scenarios": {},
+    }
+    failures = []
+    for backend in backends:
+        for scenario in scenarios:
+            key = f"{scenario}/{backend}"
+            measured = run_scenario(scenario, backend, args.runs)
+            entry["scenarios"][key] = measured
+            print(
+                f"{key}: 팀원 {measured['members']}, 구역 {measured['areas']}, "
+                f"기록 {measured['history_rows']}행 (준비 {measured['setup_seconds']}초)"
+            )
+
+            limits = baseline.get(key, {})
+            for name, timing in measured["results"].items():
+                median = timing["median"]
+                limit = limits.get(name)
+                note = ""
+                if limit:
+                    note = f"  기준 {limit:.2f} ms ({(median / limit - 1) * 100:+.0f}%)"
+                    if (
+                        not args.update
+                        and median > limit * (1 + TOLERANCE)
+                        and median - limit > MIN_DELTA_MS
+                    ):
+                        failures.append(f"{key} {name}: {median:.2f} ms > 기준 {limit:.2f} ms")
+                print(
+                    f"    {name:28s} {median:10.2f} ms  (처음 {timing['first']:.2f}, "
+                    f"최소 {timing['min']:.2f}){note}"
+                )
+
+    history = _load_json(args.history, [])
+    history.append(entry)
+    _save_json(args.history, history)
+    print(f"측정 기록 추가: {args.history}")
+
+    if args.update:
+        for key, measured in entry["scenarios"].items():
+            baseline[key] = {
+                name: timing["median"] for name, timing in measured["results"].items()
+            }
+        _save_json(args.baseline, baseline)
+        print(f"기준값 저장: {args.baseline}")
+
+    for failure in failures:
+        print(f"실패 - {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
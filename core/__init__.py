@@ -0,0 +1 @@
+# 청소 구역 배치 시스템 공용 모듈 (Streamlit UI와 분리된 데이터/도메인 로직)
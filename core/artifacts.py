@@ -0,0 +1,81 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from core import config, metrics
+
+
+class ArtifactCache:
+    """내보내기 결과(엑셀/텍스트) LRU 캐시 - 전체 크기를 max_bytes 이하로 유지"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        size = _size_of(value)
+        # 한도보다 큰 결과는 캐시하지 않음
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= _size_of(old)
+
+            self._items[key] = value
+            self.size += size
+
+            # 오래 안 쓴 것부터 제거
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= _size_of(evicted)
+
+    def get_or_build(self, key, build):
+        """캐시에 있으면 반환하고, 없으면 build()로 만들어서 저장 후 반환"""
+        value = self.get(key)
+        metrics.record_cache("artifact", value is not None)
+        if value is None:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+def _size_of(value):
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(value)
+
+
+# 배치 내용 해시 (같은 날짜라도 내용이 바뀌면 다른 키가 됨)
+def content_hash(df):
+    hashed = pd.util.hash_pandas_object(df.astype(str), index=False)
+    return hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()
+
+
+def text_hash(*texts):
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# 프로세스 전체에서 공유
+artifact_cache = ArtifactCache(config.ARTIFACT_CACHE_BYTES)
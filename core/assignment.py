@@ -0,0 +1,421 @@
+import calendar
+import datetime
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import config, search
+
+# 구역별 필요 인원만큼 자리(slot) 만들기
+def build_slots(area_names, required, num_members):
+    """자리마다 구역 번호를 담은 배열과 추가 자리 여부를 반환
+
+    필요 인원보다 팀원이 많으면 남는 인원이 들어갈 자리를 구역 순서대로
+    돌아가며 추가한다 (기존 배치 방식과 동일).
+    """
+    slot_areas = np.repeat(np.arange(len(area_names)), required)
+    num_extra = max(0, num_members - len(slot_areas))
+    extra_areas = np.arange(num_extra) % max(len(area_names), 1)
+
+    slot_areas = np.concatenate([slot_areas, extra_areas]).astype(int)
+    is_extra = np.zeros(len(slot_areas), dtype=bool)
+    is_extra[len(slot_areas) - num_extra :] = True
+    return slot_areas, is_extra
+
+
+# 팀원 x 구역 비용 (같은 구역을 자주/최근에 맡았을수록 비쌈)
+def history_cost(
+    counts,
+    batches_ago,
+    repeat_penalty=config.REPEAT_PENALTY,
+    recent_penalty=config.RECENT_PENALTY,
+    recent_decay=config.RECENT_DECAY,
+):
+    if 0 < recent_decay < 1:
+        # decay**ago를 exp로 계산 (담당한 적 없는 칸은 exp(-inf) = 0)
+        recency = np.exp(batches_ago * np.log(recent_decay))
+    else:
+        with np.errstate(over="ignore"):
+            recency = np.where(np.isinf(batches_ago), 0.0, recent_decay**batches_ago)
+    recency *= recent_penalty
+    recency += repeat_penalty * counts
+    return recency
+
+
+def min_cost_transport(cost, capacity):
+    """행(팀원)마다 열(칸) 하나씩, 칸마다 capacity 이하로 배정해서 비용 합이
+    최소가 되는 칸 번호 반환 (capacity 합은 행 수 이상)
+
+    최단 증가 경로 방식. 같은 칸에 들어간 팀원들을 노드 하나로 보고 칸 사이
+    이동 비용(swap)만 관리하므로, 자리마다 열을 만들어 정사각 행렬을 푸는 것보다
+    그래프가 훨씬 작다 (칸 수 B에 대해 팀원 한 명당 O(B^2)).
+
+    먼저 팀원마다 가장 싼 칸에 자리가 남는 만큼 한 번에 넣는다. 모두 자기 최소
+    비용 칸에 있으므로 이 상태가 그 팀원들끼리의 최적 배정이고 (swap이 음수가
+    아님), 증가 경로는 자리가 모자라서 남은 팀원에 대해서만 찾는다. 남은 자리가
+    적어져 탐색이 길어지면 남은 자리에서 거꾸로 거리를 구해 potential에 반영해서
+    다음 탐색이 남은 자리 쪽으로 바로 향하게 한다.
+    """
+    # 팀원 한 명의 비용(행)을 자주 읽으므로 행 우선 배열로 맞춤
+    cost = np.ascontiguousarray(cost)
+    n, b = cost.shape
+    bin_of = np.full(n, -1)
+    free = np.asarray(capacity, dtype=int).copy()
+    potential = np.zeros(b)
+    sink = 0.0  # 남는 자리가 있는 칸에서 끝나는 가상 노드의 potential
+
+    # 가장 싼 칸에 자리 수만큼 배정 (두 번째로 싼 칸과 차이가 큰 팀원 먼저)
+    first = cost.argmin(axis=1)
+    two = np.partition(cost, 1, axis=1)[:, :2] if b > 1 else np.zeros((n, 2))
+    by_first = np.lexsort((two[:, 0] - two[:, 1], first))
+    rank = np.arange(n) - np.searchsorted(first[by_first], first[by_first])
+    fits = np.zeros(n, dtype=bool)
+    fits[by_first] = rank < free[first[by_first]]
+    bin_of[fits] = first[fits]
+    free -= np.bincount(bin_of[fits], minlength=b)
+
+    # swap[u, v]: 칸 u의 팀원 한 명을 칸 v로 옮길 때 가장 작은 비용 변화
+    # 팀원이 바뀐 칸은 stale로 표시해 두고 탐색에서 쓸 때 다시 계산
+    members_in = [[] for _ in range(b)]
+    for i in np.flatnonzero(fits):
+        members_in[bin_of[i]].append(i)
+    swap = np.full((b, b), np.inf)
+    stale = np.ones(b, dtype=bool)
+
+    def refresh(u):
+        if members_in[u]:
+            rows = cost.take(members_in[u], axis=0)
+            rows -= rows[:, u, None]
+            rows.min(axis=0, out=swap[u])
+        stale[u] = False
+
+    # 탐색용 배열 (팀원마다 다시 채워서 씀)
+    # key: 아직 확정 안 된 칸까지의 거리 (확정되면 inf)
+    # shift: -potential (확정된 칸은 inf라서 더 짧은 경로로 바뀌지 않음)
+    key = np.empty(b)
+    shift = np.empty(b)
+    dist = np.empty(b)
+    reduced = np.empty(b)
+    better = np.empty(b, dtype=bool)
+    prev = np.empty(b, dtype=int)
+    searched = 0  # 직전 탐색에서 확정한 칸 수
+
+    for i in np.flatnonzero(~fits):
+        if searched > b // 8:
+            # 남는 자리가 있는 칸에서 거꾸로 모든 칸까지의 거리를 구해서
+            # potential에서 빼면 각 칸에서 남는 자리까지의 거리가 0이 된다
+            for u in np.flatnonzero(stale):
+                refresh(u)
+            key.fill(np.inf)
+            ends = free > 0
+            key[ends] = potential[ends] - sink
+            np.copyto(shift, potential)
+            while True:
+                v = int(key.argmin())
+                d = key[v]
+                if d == np.inf:
+                    break
+                dist[v] = d
+                key[v] = np.inf
+                shift[v] = np.inf
+                np.add(swap[:, v], d - potential[v], out=reduced)
+                reduced += shift
+                np.minimum(key, reduced, out=key)
+            reached = np.isinf(shift)
+            potential -= np.where(reached, dist, dist[reached].max())
+
+        np.subtract(cost[i], potential, out=key)
+        np.negative(potential, out=shift)
+        prev.fill(-1)
+        best, last = np.inf, -1
+        searched = 0
+        while True:
+            u = int(key.argmin())
+            d = key[u]
+            if d >= best:
+                break
+            searched += 1
+            dist[u] = d
+            key[u] = np.inf
+            shift[u] = np.inf
+            if free[u] > 0:
+                through = d + potential[u] - sink
+                if through < best:
+                    best, last = through, u
+            if members_in[u]:
+                if stale[u]:
+                    refresh(u)
+                np.add(swap[u], d + potential[u], out=reduced)
+                reduced += shift
+                np.less(reduced, key, out=better)
+                np.copyto(key, reduced, where=better)
+                prev[better] = u
+        open_bins = ~np.isinf(shift)
+        dist[open_bins] = key[open_bins]
+
+        potential += np.minimum(dist, best)
+        sink += best
+
+        # 증가 경로를 거꾸로 따라가며 칸마다 한 명씩 다음 칸으로 이동
+        v = last
+        free[v] -= 1
+        stale[v] = True
+        while prev[v] >= 0:
+            u = prev[v]
+            group = members_in[u]
+            moved = group.pop(int(np.argmin(cost[group, v] - cost[group, u])))
+            members_in[v].append(moved)
+            bin_of[moved] = v
+            stale[u] = True
+            v = u
+        members_in[v].append(i)
+        bin_of[i] = v
+
+    return bin_of
+
+
+# 기존 방식: 직전 배치에서 같은 구역을 맡지 않은 사람을 앞에서부터 선택
+def greedy_engine(members, areas_df, history, rng=None):
+    # 가장 최근 배치에서 각자 맡았던 구역
+    areas = areas_df["id"].tolist()
+    _, batches_ago = history.submatrix(members, areas)
+    member_idx, area_idx = np.nonzero(batches_ago == 0)
+    recent_assignments = {members[i]: areas[j] for i, j in zip(member_idx, area_idx)}
+
+    # 랜덤 배치를 위한 멤버 복사 및 섞기
+    available_members = list(members)
+    (rng or random).shuffle(available_members)
+
+    pairs = []
+    for area_id, num_needed in zip(areas_df["id"], areas_df["필요인원"]):
+        for _ in range(num_needed):
+            if not available_members:
+                break
+
+            # 이전에 같은 구역을 담당하지 않았던 사람을 우선적으로 선택
+            selected = next(
+                (m for m in available_members if recent_assignments.get(m) != area_id),
+                available_members[0],
+            )
+            pairs.append((area_id, selected))
+            available_members.remove(selected)
+
+    # 남은 인원이 있으면 구역 순서대로 돌아가며 배치
+    area_order = areas_df["id"].tolist()
+    for i, member in enumerate(available_members if area_order else []):
+        pairs.append((area_order[i % len(area_order)], member))
+
+    return pairs
+
+
+# 최소 비용 매칭: 전체 이력을 반영한 팀원 x 자리 비용의 합이 최소가 되도록 배치
+def matching_engine(members, areas_df, history, rng=None):
+    members = list(dict.fromkeys(members))
+    areas = areas_df["id"].tolist()
+    if not members or not areas:
+        return []
+
+    rng = rng or np.random.default_rng()
+    slot_areas, is_extra = build_slots(
+        areas, areas_df["필요인원"].to_numpy(dtype=int), len(members)
+    )
+
+    counts, batches_ago = history.submatrix(members, areas)
+    area_cost = history_cost(counts, batches_ago)
+
+    # 비용이 같을 때 매번 같은 배치가 나오지 않도록 작은 난수 추가
+    area_cost += config.RANDOM_JITTER * rng.random(area_cost.shape)
+
+    # 구역별 자리를 (구역, 추가 자리 여부) 칸으로 묶어서 칸 단위로 배정
+    # 남는 인원용 칸은 필요 인원이 모두 찬 뒤에만 쓰이도록 큰 비용 부여
+    bins, slot_bin = np.unique(
+        slot_areas + len(areas) * is_extra, return_inverse=True
+    )
+    bin_cost = area_cost.take(bins % len(areas), axis=1)
+    bin_cost[:, bins >= len(areas)] += area_cost.max() * len(members) + 1
+    bin_of_member = min_cost_transport(bin_cost, np.bincount(slot_bin))
+
+    # 칸 안에서 자리를 차례로 나눠 주고 기존 결과와 같은 순서(구역 순서,
+    # 그다음 남는 인원)로 정렬
+    slots_by_bin = np.argsort(slot_bin, kind="stable")
+    first_slot = np.searchsorted(slot_bin[slots_by_bin], np.arange(len(bins)))
+    by_bin = np.argsort(bin_of_member, kind="stable")
+    rank = np.arange(len(members)) - np.searchsorted(
+        bin_of_member[by_bin], bin_of_member[by_bin]
+    )
+    slot_of_member = np.empty(len(members), dtype=int)
+    slot_of_member[by_bin] = slots_by_bin[first_slot[bin_of_member[by_bin]] + rank]
+
+    order = np.argsort(slot_of_member)
+    return [(areas[slot_areas[slot_of_member[i]]], members[i]) for i in order]
+
+
+def _seed_sequence(rng):
+    """난수 생성기에서 하위 seed를 나눠 줄 SeedSequence
+
+    난수 생성기가 없으면 config.SEARCH_SEED (비어 있으면 매번 다른 seed) 사용.
+    """
+    if isinstance(rng, np.random.Generator):
+        return np.random.SeedSequence(int(rng.integers(2**63)))
+    if rng is not None:
+        return np.random.SeedSequence(rng.getrandbits(63))
+    if config.SEARCH_SEED is not None:
+        return np.random.SeedSequence(int(config.SEARCH_SEED))
+    return np.random.SeedSequence()
+
+
+# 최적화 탐색: 여러 작업자가 무작위 후보를 교환/이동으로 개선해서 가장 공정한 배치 선택
+# time_budget: 작업자당 최대 탐색 시간(초, 없으면 config.SEARCH_TIME_BUDGET)
+def search_engine(members, areas_df, history, rng=None, seed=None, time_budget=None):
+    members = list(dict.fromkeys(members))
+    areas = areas_df["id"].tolist()
+    if not members or not areas:
+        return []
+
+    need = areas_df["필요인원"].to_numpy(dtype=int)
+    slot_areas, _ = build_slots(areas, need, len(members))
+
+    counts, batches_ago = history.submatrix(members, areas)
+    cost = history_cost(counts, batches_ago)
+
+    # 구역 하나의 일을 필요인원이 나눠서 한다고 보고 1인 부담을 1/필요인원으로 계산
+    weight = 1.0 / np.maximum(need, 1)
+    base_load = counts @ weight
+
+    area_of, _ = search.search_assignment(
+        cost,
+        weight,
+        base_load,
+        need,
+        slot_areas,
+        seed=_seed_sequence(rng) if seed is None else seed,
+        workers=max(config.SEARCH_WORKERS, 1),
+        restarts=config.SEARCH_RESTARTS,
+        iterations=config.SEARCH_ITERATIONS_PER_MEMBER * len(members),
+        time_budget=config.SEARCH_TIME_BUDGET if time_budget is None else time_budget,
+        balance_penalty=config.BALANCE_PENALTY,
+        headcount_penalty=config.HEADCOUNT_PENALTY,
+    )
+
+    # 구역 순서대로 정렬
+    order = np.argsort(area_of, kind="stable")
+    return [(areas[area_of[i]], members[i]) for i in order]
+
+
+# 배치 엔진 목록 (config.ASSIGNMENT_ENGINE으로 선택)
+# 엔진은 (활성 팀원 id 목록, 구역 DataFrame, 담당 이력 행렬, 난수 생성기)를 받아
+# (구역 id, 담당자 id) 목록을 반환한다.
+ENGINES = {
+    "greedy": greedy_engine,
+    "matching": matching_engine,
+    "search": search_engine,
+}
+
+# 내부에서 여러 후보를 탐색해 가장 좋은 배치를 고르는 엔진
+# (기간 배치 생성 때 날짜마다 후보를 따로 만들지 않음)
+SEARCHING_ENGINES = {"search"}
+
+# 화면에 표시할 엔진 이름
+ENGINE_LABELS = {
+    "matching": "이력 기반 매칭",
+    "search": "최적화 탐색 (병렬)",
+    "greedy": "기존 방식",
+}
+
+
+def run_engine(name, members, areas_df, history, rng=None, **options):
+    if name not in ENGINES:
+        raise ValueError(f"알 수 없는 배치 엔진: {name}")
+    return ENGINES[name](members, areas_df, history, rng, **options)
+
+
+# 후보 배치 점수 (후보 x 인원 배열로 한 번에 계산, 낮을수록 좋음)
+def score_candidates(cost, member_idx, area_idx, valid):
+    return np.where(valid, cost[member_idx, area_idx], 0.0).sum(axis=1)
+
+
+# 여러 날짜의 배치를 한 번에 생성
+def plan_batches(dates, members, areas_df, history, engine, candidates=1, rng=None):
+    """날짜마다 배치를 만들고 담당 이력은 메모리에서 이어서 반영
+
+    날짜마다 candidates개의 후보를 만들어 이력 비용이 가장 낮은 후보를
+    고른다 (SEARCHING_ENGINES는 엔진이 직접 탐색하므로 후보 하나이고, 탐색
+    시간은 기간 전체에 config.SEARCH_TIME_BUDGET 하나를 남은 날짜에 나눠 쓴다).
+    후보마다 rng(없으면 config.SEARCH_SEED)에서 날짜별, 후보별로 나눈 난수
+    생성기를 쓰므로 같은 seed면 같은 결과가 나온다. 저장은 하지 않으며 전체
+    결과를 (날짜, 구역_id, 담당자_id) DataFrame 하나로 반환한다.
+    """
+    columns = ["날짜", "구역_id", "담당자_id"]
+    members = list(dict.fromkeys(members))
+    areas = areas_df["id"].tolist()
+    member_pos = {name: i for i, name in enumerate(members)}
+    area_pos = {name: i for i, name in enumerate(areas)}
+
+    history = history.copy()
+    searching = engine in SEARCHING_ENGINES
+    if searching:
+        candidates = 1
+        deadline = time.monotonic() + config.SEARCH_TIME_BUDGET
+    day_seeds = _seed_sequence(rng).spawn(len(dates))
+    frames = []
+
+    for day, (date, day_seed) in enumerate(zip(dates, day_seeds)):
+        counts, batches_ago = history.submatrix(members, areas)
+        cost = history_cost(counts, batches_ago)
+
+        engine_options = {}
+        if searching:
+            remaining = max(deadline - time.monotonic(), 0.0)
+            engine_options["time_budget"] = remaining / (len(dates) - day)
+
+        options = [
+            run_engine(
+                engine,
+                members,
+                areas_df,
+                history,
+                np.random.default_rng(seed),
+                **engine_options,
+            )
+            for seed in day_seed.spawn(max(candidates, 1))
+        ]
+        width = max(len(pairs) for pairs in options)
+        member_idx = np.zeros((len(options), width), dtype=int)
+        area_idx = np.zeros((len(options), width), dtype=int)
+        valid = np.zeros((len(options), width), dtype=bool)
+        for k, pairs in enumerate(options):
+            member_idx[k, : len(pairs)] = [member_pos[m] for _, m in pairs]
+            area_idx[k, : len(pairs)] = [area_pos[a] for a, _ in pairs]
+            valid[k, : len(pairs)] = True
+
+        best = options[int(np.argmin(score_candidates(cost, member_idx, area_idx, valid)))]
+        batch_df = pd.DataFrame(
+            [{"날짜": date, "구역_id": area, "담당자_id": member} for area, member in best],
+            columns=columns,
+        )
+
+        # 다음 날짜는 방금 만든 배치까지 반영한 이력으로 생성
+        history.add_batch(batch_df)
+        frames.append(batch_df)
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+# 기간 안의 근무일 (월~금)
+def working_days(start, end):
+    days = np.arange(
+        np.datetime64(start, "D"), np.datetime64(end, "D") + 1, dtype="datetime64[D]"
+    )
+    return days[np.is_busday(days)].astype(object).tolist()
+
+
+# 해당 월의 첫날과 마지막 날
+def month_range(year, month):
+    return (
+        datetime.date(year, month, 1),
+        datetime.date(year, month, calendar.monthrange(year, month)[1]),
+    )
@@ -0,0 +1,253 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core import config, metrics, storage
+from core.backends import get_backend
+from core.changes import RowChanges
+from core.ratelimit import SlidingWindowLimiter
+
+# 저장 형식: "pbkdf2_sha256$반복횟수$salt$해시" (salt/해시는 base64)
+# 예전 형식(salt 없는 SHA-256 hex)은 로그인에 성공할 때 새 형식으로 바꿔 저장한다.
+_ALGORITHM = "pbkdf2_sha256"
+
+# 해시 계산 전용 작업자 (동시에 계산하는 수를 config.PASSWORD_HASH_WORKERS로
+# 제한해서 로그인 요청이 몰려도 CPU를 모두 쓰지 않도록 함)
+# 화면에서는 *_async 함수로 Future를 받아 결과를 기다리지 않고 스크립트를 끝낸다.
+_executor = ThreadPoolExecutor(
+    max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+# 로그인 실패 횟수 제한 (아이디별, 접속 주소별)
+_limiters = {
+    "user": SlidingWindowLimiter(
+        config.LOGIN_MAX_FAILURES_PER_USER,
+        config.LOGIN_FAILURE_WINDOW,
+        config.LOGIN_LIMITER_MAX_KEYS,
+    ),
+    "client": SlidingWindowLimiter(
+        config.LOGIN_MAX_FAILURES_PER_CLIENT,
+        config.LOGIN_FAILURE_WINDOW,
+        config.LOGIN_LIMITER_MAX_KEYS,
+    ),
+}
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+def hash_password(password):
+    """새 salt로 비밀번호 해시 만들기"""
+    iterations = config.PASSWORD_HASH_ITERATIONS
+    salt = os.urandom(16)
+    digest = _pbkdf2(password, salt, iterations)
+    return "$".join(
+        [
+            _ALGORITHM,
+            str(iterations),
+            base64.b64encode(salt).decode(),
+            base64.b64encode(digest).decode(),
+        ]
+    )
+
+
+def new_password_hash(password):
+    """새 비밀번호 해시 (결과가 나올 때까지 기다림 - 초기 데이터, 명령줄 도구용)
+
+    화면에서는 new_password_hash_async를 사용한다.
+    """
+    return new_password_hash_async(password).result()
+
+
+def new_password_hash_async(password):
+    """새 비밀번호 해시를 작업자 스레드에서 계산 - Future 반환"""
+    return _executor.submit(hash_password, password)
+
+
+def _dummy_hash():
+    """없는 아이디 확인용 해시 - 실제 계정과 같은 반복 횟수로 계산하고 항상 불일치"""
+    return "$".join(
+        [
+            _ALGORITHM,
+            str(config.PASSWORD_HASH_ITERATIONS),
+            base64.b64encode(os.urandom(16)).decode(),
+            base64.b64encode(bytes(32)).decode(),
+        ]
+    )
+
+
+def _verify(password, stored):
+    """(일치 여부, 다시 해시해야 하는지) 반환"""
+    stored = str(stored)
+    if "$" not in stored:
+        # 예전 형식: salt 없는 SHA-256
+        digest = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(digest, stored), True
+
+    algorithm, iterations, salt, expected = stored.split("$")
+    if algorithm != _ALGORITHM:
+        return False, False
+    digest = _pbkdf2(password, base64.b64decode(salt), int(iterations))
+    matched = hmac.compare_digest(digest, base64.b64decode(expected))
+    return matched, int(iterations) < config.PASSWORD_HASH_ITERATIONS
+
+
+class _UserIndex:
+    """username -> 사용자 정보 색인 (프로세스 전체 공유)
+
+    사용자 테이블 버전이 바뀌었거나 invalidate()가 불리면 다음 조회 때
+    다시 만든다. 로그인마다 테이블 전체를 읽거나 훑지 않는다.
+    """
+
+    def __init__(self):
+        self._users = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._users = None
+
+    def get(self, username):
+        version = get_backend().version("users")
+        users = self._users
+        if users is None or self._version != version:
+            with self._lock:
+                df = get_backend().load("users")
+                users = {str(row["username"]): row for row in df.to_dict("records")}
+                self._users = users
+                self._version = df.attrs.get("version")
+        user = users.get(str(username))
+        return dict(user) if user is not None else None
+
+
+_index = _UserIndex()
+
+
+def invalidate():
+    """사용자 테이블을 저장한 뒤 호출 - 색인을 다시 만들게 함"""
+    _index.invalidate()
+
+
+def get_user(username):
+    """사용자 정보 (id, username, password, is_admin), 없으면 None"""
+    return _index.get(username)
+
+
+def _update_password(user, hashed):
+    """사용자 한 명의 비밀번호만 저장 (그 사이 다른 곳에서 바꿨으면 WriteConflictError)"""
+    previous = pd.DataFrame([user])
+    updated = previous.assign(password=hashed)
+    empty = previous.iloc[0:0]
+    try:
+        get_backend().apply_changes(
+            "users", RowChanges("id", empty, updated, previous, empty)
+        )
+    finally:
+        invalidate()
+
+
+def _check(user, password):
+    """작업자 스레드에서 실행 - user의 비밀번호가 맞는지 확인
+
+    user가 None(없는 아이디)이어도 가짜 해시로 같은 계산을 해서 응답 시간으로
+    아이디가 있는지 알 수 없게 한다. 예전 형식이거나 반복 횟수가 설정보다 적은
+    해시는 맞으면 새로 해시해서 저장한다.
+    """
+    stored = _dummy_hash() if user is None else user["password"]
+    matched, outdated = _verify(password, stored)
+    if user is None:
+        return False
+    if matched and outdated:
+        try:
+            _update_password(user, hash_password(password))
+        except storage.WriteConflictError:
+            pass  # 변환은 다음 로그인 때 다시 시도
+    return matched
+
+
+def _login(username, password):
+    user = get_user(username)
+    return user if _check(user, password) else None
+
+
+def login_async(username, password):
+    """아이디/비밀번호 확인을 작업자 스레드에서 실행 - Future 반환
+
+    결과는 맞으면 사용자 정보(get_user 결과), 아이디가 없거나 비밀번호가
+    틀리면 None (두 경우를 구분하지 않음).
+    """
+    return _executor.submit(_login, username, password)
+
+
+def _change_password(username, current, new):
+    if not _check(get_user(username), current):
+        return False
+    # 확인 중 예전 형식 해시가 바뀌었을 수 있으므로 다시 조회
+    _update_password(get_user(username), hash_password(new))
+    return True
+
+
+def change_password_async(username, current, new):
+    """현재 비밀번호 확인 후 새 비밀번호로 변경을 작업자 스레드에서 실행
+
+    Future 결과는 현재 비밀번호가 맞아서 바꿨는지 여부. 그 사이 다른 곳에서
+    계정을 바꿨으면 result()가 WriteConflictError를 발생시킨다.
+    """
+    return _executor.submit(_change_password, username, current, new)
+
+
+def _retry_after(username, client, counter):
+    for kind, key in (("user", str(username)), ("client", str(client))):
+        wait = _limiters[kind].retry_after(key)
+        if wait:
+            _limiters[kind].record_block()
+            counter.inc(result="blocked")
+            return wait
+    return 0
+
+
+def _record(username, client, success, counter):
+    counter.inc(result="success" if success else "failure")
+    if success:
+        _limiters["user"].reset(str(username))
+    else:
+        _limiters["user"].record_failure(str(username))
+        _limiters["client"].record_failure(str(client))
+
+
+def login_retry_after(username, client):
+    """실패가 많아 차단 중이면 다시 시도할 수 있을 때까지 남은 초, 아니면 0
+
+    사용자 조회나 해시 계산 전에 호출한다. 차단한 시도는 지표에 센다.
+    """
+    return _retry_after(username, client, metrics.LOGINS)
+
+
+def record_login(username, client, success):
+    """로그인 결과 기록 - 성공하면 그 아이디의 실패 기록을 지움"""
+    _record(username, client, success, metrics.LOGINS)
+
+
+def password_check_retry_after(username, client):
+    """비밀번호 변경 때 현재 비밀번호 확인용 login_retry_after
+
+    로그인과 같은 실패 횟수 제한을 쓰지만 지표는 로그인과 따로 센다.
+    """
+    return _retry_after(username, client, metrics.PASSWORD_CHECKS)
+
+
+def record_password_check(username, client, success):
+    """현재 비밀번호 확인 결과 기록 (로그인 지표에는 세지 않음)"""
+    _record(username, client, success, metrics.PASSWORD_CHECKS)
+
+
+def login_stats():
+    """로그인 제한 지표 {"user"|"client": {"blocked", "tracked", "locked"}}"""
+    return {kind: limiter.stats() for kind, limiter in _limiters.items()}
@@ -0,0 +1,966 @@
+import argparse
+import contextlib
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from core import config, metrics, names, storage
+from core.batch_index import BatchIndex
+
+# pyarrow는 parquet 저장소를 만들 때 불러옴 (다른 저장소에서는 필요 없음)
+pa = pq = None
+
+
+def _import_pyarrow():
+    global pa, pq
+    if pq is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise RuntimeError(
+                "parquet 저장소를 사용하려면 pyarrow가 필요합니다."
+            ) from error
+        pa, pq = pyarrow, pyarrow.parquet
+
+# 테이블 정의: 컬럼별 SQLite 타입, CSV 파일, 인덱스 컬럼,
+# 읽은 뒤 적용할 변환 (배치 기록의 구역/담당자는 공유 이름 사전의 범주형으로)
+# 팀원/구역/사용자는 한 번 정하면 바뀌지 않는 정수 id를 가지며, 배치 기록은
+# 구역_id/담당자_id로 팀원과 구역을 가리킨다 (구역/담당자는 기록 당시 이름).
+TABLES = {
+    "members": {
+        "file": config.MEMBERS_FILE,
+        "columns": {"id": "INTEGER", "이름": "TEXT", "활성": "BOOLEAN"},
+        "indexes": ["id"],
+    },
+    "areas": {
+        "file": config.AREAS_FILE,
+        "columns": {"id": "INTEGER", "구역명": "TEXT", "필요인원": "INTEGER"},
+        "indexes": ["id"],
+    },
+    "assignments": {
+        "file": config.ASSIGNMENTS_FILE,
+        "columns": {
+            "날짜": "TEXT",
+            "구역": "TEXT",
+            "담당자": "TEXT",
+            "구역_id": "INTEGER",
+            "담당자_id": "INTEGER",
+        },
+        "indexes": ["날짜", "구역_id", "담당자_id"],
+        "prepare": names.categorize,
+    },
+    "users": {
+        "file": config.USERS_FILE,
+        "columns": {
+            "id": "INTEGER",
+            "username": "TEXT",
+            "password": "TEXT",
+            "is_admin": "BOOLEAN",
+        },
+        "indexes": ["id", "username"],
+    },
+}
+
+
+class CsvBackend:
+    """테이블마다 CSV 파일 하나를 사용하는 기본 저장소
+
+    배치 기록은 배치별 위치 색인(BatchIndex)을 함께 유지해서 배치 목록과
+    배치 하나 읽기에 파일 전체를 파싱하지 않는다.
+    """
+
+    def __init__(self):
+        self.batch_index = BatchIndex(
+            TABLES["assignments"]["file"], config.ASSIGNMENT_INDEX_FILE
+        )
+
+    def exists(self, table):
+        return os.path.exists(TABLES[table]["file"])
+
+    def version(self, table):
+        return storage.file_version(TABLES[table]["file"])
+
+    def history_version(self):
+        """배치 기록의 보이는 내용이 바뀔 때마다 달라지는 값 (삭제 표시 포함)"""
+        return (
+            self.version("assignments"),
+            storage.file_version(config.ASSIGNMENT_TOMBSTONES_FILE),
+        )
+
+    def load(self, table):
+        """테이블 읽기 - 읽은 시점의 버전을 df.attrs["version"]에 기록"""
+        version, df = storage.read_csv_versioned(
+            TABLES[table]["file"], TABLES[table].get("prepare")
+        )
+
+        # 삭제 표시된 배치는 제외
+        if table == "assignments":
+            deleted_dates = self.deleted_batches()
+            if deleted_dates:
+                df = df[~df["날짜"].isin(deleted_dates)].reset_index(drop=True)
+
+        df.attrs["version"] = version
+        return df
+
+    def find(self, table, **conditions):
+        """컬럼 값이 모두 일치하는 행 조회"""
+        df = self.load(table)
+        mask = pd.Series(True, index=df.index)
+        for column, value in conditions.items():
+            mask &= df[column] == value
+        return df[mask].reset_index(drop=True)
+
+    def batches_with(self, dates, **conditions):
+        """dates 중 컬럼 값이 모두 일치하는 행이 있는 배치 날짜 (set)
+
+        색인으로 해당 배치들의 바이트 범위만 읽는다.
+        """
+        deleted_dates = self.deleted_batches()
+        df = self.batch_index.read_batches(
+            [date for date in dates if date not in deleted_dates]
+        )
+        mask = pd.Series(True, index=df.index)
+        for column, value in conditions.items():
+            mask &= df[column] == value
+        return set(df.loc[mask, "날짜"].astype(str))
+
+    def batch_summary(self):
+        """배치별 요약 (날짜, 인원, 구역 수) - 날짜 순"""
+        return self.batch_index.summary(self.deleted_batches())
+
+    def latest_batch(self):
+        """가장 최근 배치 날짜 (없으면 None)"""
+        return self.batch_index.latest(self.deleted_batches())
+
+    def load_batch(self, date):
+        """배치 하나 읽기 - 색인의 바이트 범위만 읽음"""
+        if date in self.deleted_batches():
+            df = pd.DataFrame(columns=list(TABLES["assignments"]["columns"]))
+        else:
+            df = self.batch_index.read_batch(date)
+        return names.categorize(df)
+
+    def iter_assignments(self, start=None, end=None, chunksize=10000):
+        """배치 기록을 나눠서 읽기 (start <= 날짜 < end, 문자열 비교)
+
+        파일 전체를 DataFrame 하나로 만들지 않고 chunksize행씩 돌려준다.
+        """
+        deleted_dates = self.deleted_batches()
+        chunks = pd.read_csv(
+            TABLES["assignments"]["file"], encoding="utf-8-sig", chunksize=chunksize
+        )
+        for chunk in chunks:
+            dates = chunk["날짜"].astype(str)
+            mask = ~dates.isin(deleted_dates)
+            if start is not None:
+                mask &= dates >= start
+            if end is not None:
+                mask &= dates < end
+            if mask.any():
+                yield names.categorize(chunk[mask])
+
+    def save(self, table, df, expected_version=None):
+        storage.write_csv(
+            TABLES[table]["file"],
+            df,
+            expected_version=expected_version,
+            prepare=TABLES[table].get("prepare"),
+        )
+        if table == "assignments":
+            self.batch_index.rebuild()
+
+    def apply_changes(self, table, changes):
+        """바뀐 행만 반영 (changes: core.changes.RowChanges, 팀원/구역/사용자)
+
+        수정/삭제할 행을 다른 사용자가 먼저 바꿨으면 WriteConflictError.
+        추가만 있으면 파일 끝에 붙이고, 아니면 바뀐 행을 반영해서 파일을
+        교체한다. 그 사이 다른 행이 바뀌었으면 다시 읽어서 반영한다.
+        """
+        path = TABLES[table]["file"]
+        columns = list(TABLES[table]["columns"])
+        while True:
+            version, df = storage.read_csv_versioned(path)
+            if not changes.matches(df):
+                raise storage.WriteConflictError(table)
+            if changes.updated.empty and changes.deleted.empty:
+                storage.append_csv(path, changes.inserted[columns])
+                return
+            try:
+                storage.write_csv(
+                    path, changes.apply_to(df[columns]), expected_version=version
+                )
+                return
+            except storage.WriteConflictError:
+                continue
+
+    def append(self, table, df):
+        # 삭제 표시된 날짜와 겹치면 새 배치까지 가려지므로 먼저 압축
+        if table == "assignments" and self.deleted_batches() & set(df["날짜"]):
+            self.compact()
+
+        before = storage.append_csv(TABLES[table]["file"], df)
+        if table == "assignments":
+            # 색인에는 새로 추가된 부분만 반영
+            self.batch_index.extend(before)
+
+    def delete_batch(self, date):
+        """배치 삭제 (삭제 표시만 추가하고 실제 제거는 압축 때 수행)"""
+        storage.append_csv(
+            config.ASSIGNMENT_TOMBSTONES_FILE, pd.DataFrame({"날짜": [date]})
+        )
+
+        if len(self.deleted_batches()) >= config.COMPACT_THRESHOLD:
+            self.compact()
+
+    def deleted_batches(self):
+        if not os.path.exists(config.ASSIGNMENT_TOMBSTONES_FILE):
+            return set()
+        return set(storage.read_csv(config.ASSIGNMENT_TOMBSTONES_FILE)["날짜"])
+
+    def next_ids(self, table, count=1):
+        """table에 새로 쓸 id count개 (한 번 준 id는 삭제된 뒤에도 다시 주지 않음)"""
+        path = config.ID_SEQUENCE_FILE
+        if not os.path.exists(path):
+            # 헤더만 있는 파일 만들기 (이미 있으면 아무것도 추가되지 않음)
+            storage.append_csv(path, pd.DataFrame(columns=["테이블", "마지막id"]))
+
+        # 읽은 뒤 다른 곳에서 먼저 id를 받아 갔으면 다시 읽어서 재시도
+        while True:
+            version, df = storage.read_csv_versioned(path)
+
+            used = df.loc[df["테이블"] == table, "마지막id"]
+            last = int(used.iloc[0]) if len(used) else 0
+            df = pd.concat(
+                [
+                    df[df["테이블"] != table],
+                    pd.DataFrame({"테이블": [table], "마지막id": [last + count]}),
+                ],
+                ignore_index=True,
+            )
+            try:
+                storage.write_csv(path, df, expected_version=version)
+                return list(range(last + 1, last + count + 1))
+            except storage.WriteConflictError:
+                continue
+
+    def compact(self):
+        """삭제 표시된 배치를 배치 기록 파일에서 실제로 제거"""
+        # 압축 중에 새 삭제 표시가 추가되어 함께 지워지지 않도록 잠금
+        with storage.write_lock(config.ASSIGNMENT_TOMBSTONES_FILE):
+            deleted_dates = self.deleted_batches()
+            if not deleted_dates:
+                return
+
+            # 읽는 사이에 새 배치가 추가되면 다시 읽어서 재시도
+            path = TABLES["assignments"]["file"]
+            while True:
+                version, df = storage.read_csv_versioned(path, names.categorize)
+                try:
+                    storage.write_csv(
+                        path,
+                        df[~df["날짜"].isin(deleted_dates)],
+                        expected_version=version,
+                        prepare=names.categorize,
+                    )
+                    break
+                except storage.WriteConflictError:
+                    continue
+            self.batch_index.rebuild()
+
+            os.remove(config.ASSIGNMENT_TOMBSTONES_FILE)
+            storage.invalidate(config.ASSIGNMENT_TOMBSTONES_FILE)
+
+
+class SqliteBackend:
+    """모든 테이블을 SQLite 파일 하나에 저장하는 저장소
+
+    날짜/구역/담당자/username 컬럼에 인덱스를 만들어 두므로
+    find()와 delete_batch()는 전체 스캔 없이 처리된다.
+    테이블별 버전 번호는 _versions 테이블에 저장한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._schema_lock = threading.Lock()
+        self._created = set()
+        self._wal = False
+
+    @contextlib.contextmanager
+    def _transaction(self, write=False):
+        """트랜잭션 하나 동안 사용할 연결 (정상 종료 시 커밋, 예외 시 롤백)
+
+        write=True이면 시작할 때 쓰기 잠금을 잡아서 버전 확인과 저장
+        사이에 다른 쓰기가 끼어들지 못하게 한다. WAL 모드이므로 읽기는
+        쓰기 중에도 막히지 않는다.
+        """
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        # 바이트 수는 알 수 없으므로 트랜잭션 수만 셈
+        if write:
+            metrics.record_write(self.path)
+        else:
+            metrics.record_read(self.path)
+        try:
+            self._enable_wal(conn)
+            conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _enable_wal(self, conn):
+        # WAL 모드는 데이터베이스 파일에 기록되므로 프로세스마다 처음 한 번만 설정
+        # (트랜잭션 안에서는 바꿀 수 없으므로 BEGIN 전에 실행)
+        if self._wal:
+            return
+        with self._schema_lock:
+            if not self._wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+                self._wal = True
+
+    def _create_table(self, conn, table):
+        with self._schema_lock:
+            if table in self._created:
+                return
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _versions "
+                "(table_name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            columns = ", ".join(
+                f'"{name}" {sql_type}'
+                for name, sql_type in TABLES[table]["columns"].items()
+            )
+            conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+
+            # 이전 버전에서 만든 테이블에는 새로 추가된 컬럼을 붙임
+            existing = {
+                row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')
+            }
+            for name, sql_type in TABLES[table]["columns"].items():
+                if name not in existing:
+                    conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {sql_type}')
+            for column in TABLES[table]["indexes"]:
+                conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{table}_{column}" '
+                    f'ON "{table}" ("{column}")'
+                )
+            self._created.add(table)
+
+    def _to_frame(self, table, df):
+        # SQLite에는 불리언 타입이 없으므로 0/1을 다시 bool로 변환
+        for name, sql_type in TABLES[table]["columns"].items():
+            if sql_type == "BOOLEAN":
+                df[name] = df[name].astype(bool)
+        prepare = TABLES[table].get("prepare")
+        return prepare(df) if prepare else df
+
+    def _rows(self, table, df):
+        # 예전 형식이라 없는 컬럼은 NULL로 넣고 migrations에서 채움
+        columns = list(TABLES[table]["columns"])
+        return df.reindex(columns=columns).astype(object).itertuples(
+            index=False, name=None
+        )
+
+    def _version(self, conn, table):
+        row = conn.execute(
+            "SELECT version FROM _versions WHERE table_name = ?", (table,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _bump_version(self, conn, table):
+        conn.execute(
+            "INSERT INTO _versions (table_name, version) VALUES (?, 1) "
+            "ON CONFLICT(table_name) DO UPDATE SET version = version + 1",
+            (table,),
+        )
+
+    def _select(self, table, where="", params=()):
+        columns = ", ".join(f'"{name}"' for name in TABLES[table]["columns"])
+        with self._transaction() as conn:
+            self._create_table(conn, table)
+            version = self._version(conn, table)
+            df = pd.read_sql_query(
+                f'SELECT {columns} FROM "{table}" {where} ORDER BY rowid',
+                conn,
+                params=params,
+            )
+        df = self._to_frame(table, df)
+        df.attrs["version"] = version
+        return df
+
+    def _insert(self, conn, table, df):
+        columns = TABLES[table]["columns"]
+        selected = ", ".join(f'"{name}"' for name in columns)
+        marks = ", ".join("?" for _ in columns)
+        conn.executemany(
+            f'INSERT INTO "{table}" ({selected}) VALUES ({marks})', self._rows(table, df)
+        )
+
+    def exists(self, table):
+        if not os.path.exists(self.path):
+            return False
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            ).fetchone()
+        return row is not None
+
+    def version(self, table):
+        with self._transaction() as conn:
+            self._create_table(conn, table)
+            return self._version(conn, table)
+
+    def history_version(self):
+        """배치 기록의 내용이 바뀔 때마다 달라지는 값"""
+        return self.version("assignments")
+
+    def load(self, table):
+        """테이블 읽기 - 읽은 시점의 버전을 df.attrs["version"]에 기록"""
+        return self._select(table)
+
+    def find(self, table, **conditions):
+        where = " AND ".join(f'"{column}" = ?' for column in conditions)
+        where = f"WHERE {where}" if conditions else ""
+        return self._select(table, where, tuple(conditions.values()))
+
+    def batches_with(self, dates, **conditions):
+        """dates 중 컬럼 값이 모두 일치하는 행이 있는 배치 날짜 (set)"""
+        dates = sorted(str(date) for date in dates)
+        if not dates:
+            return set()
+        where = " AND ".join(
+            ['"날짜" >= ?', '"날짜" <= ?'] + [f'"{column}" = ?' for column in conditions]
+        )
+        with self._transaction() as conn:
+            self._create_table(conn, "assignments")
+            found = conn.execute(
+                f'SELECT DISTINCT "날짜" FROM "assignments" WHERE {where}',
+                (dates[0], dates[-1], *conditions.values()),
+            ).fetchall()
+        return {date for (date,) in found} & set(dates)
+
+    def batch_summary(self):
+        """배치별 요약 (날짜, 인원, 구역 수) - 날짜 순"""
+        with self._transaction() as conn:
+            self._create_table(conn, "assignments")
+            return pd.read_sql_query(
+                'SELECT "날짜", COUNT(*) AS "인원", COUNT(DISTINCT "구역") AS "구역수" '
+                'FROM "assignments" GROUP BY "날짜" ORDER BY "날짜"',
+                conn,
+            )
+
+    def latest_batch(self):
+        """가장 최근 배치 날짜 (없으면 None)"""
+        with self._transaction() as conn:
+            self._create_table(conn, "assignments")
+            return conn.execute('SELECT MAX("날짜") FROM "assignments"').fetchone()[0]
+
+    def load_batch(self, date):
+        """배치 하나 읽기 (날짜 인덱스 사용)"""
+        return self.find("assignments", 날짜=date)
+
+    def iter_assignments(self, start=None, end=None, chunksize=10000):
+        """배치 기록을 날짜 순으로 나눠서 읽기 (start <= 날짜 < end)"""
+        conditions, params = [], []
+        if start is not None:
+            conditions.append('"날짜" >= ?')
+            params.append(start)
+        if end is not None:
+            conditions.append('"날짜" < ?')
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        columns = list(TABLES["assignments"]["columns"])
+        selected = ", ".join(f'"{name}"' for name in columns)
+        with self._transaction() as conn:
+            self._create_table(conn, "assignments")
+            cursor = conn.execute(
+                f'SELECT {selected} FROM "assignments" {where} ORDER BY "날짜", rowid',
+                params,
+            )
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield names.categorize(pd.DataFrame(rows, columns=columns))
+
+    def save(self, table, df, expected_version=None):
+        with self._transaction(write=True) as conn:
+            self._create_table(conn, table)
+            if (
+                expected_version is not None
+                and self._version(conn, table) != expected_version
+            ):
+                raise storage.WriteConflictError(table)
+            conn.execute(f'DELETE FROM "{table}"')
+            self._insert(conn, table, df)
+            self._bump_version(conn, table)
+
+    def append(self, table, df):
+        with self._transaction(write=True) as conn:
+            self._create_table(conn, table)
+            self._insert(conn, table, df)
+            self._bump_version(conn, table)
+
+    def _select_keys(self, conn, table, key, values):
+        """key 값이 values 중 하나인 행 (인덱스로 나눠서 조회)"""
+        columns = ", ".join(f'"{name}"' for name in TABLES[table]["columns"])
+        frames = [pd.DataFrame(columns=list(TABLES[table]["columns"]))]
+        for start in range(0, len(values), 500):
+            part = values[start : start + 500]
+            marks = ", ".join("?" for _ in part)
+            frames.append(
+                pd.read_sql_query(
+                    f'SELECT {columns} FROM "{table}" WHERE "{key}" IN ({marks})',
+                    conn,
+                    params=part,
+                )
+            )
+        return self._to_frame(table, pd.concat(frames, ignore_index=True))
+
+    def apply_changes(self, table, changes):
+        """바뀐 행만 INSERT/UPDATE/DELETE (changes: core.changes.RowChanges)
+
+        수정/삭제할 행을 다른 사용자가 먼저 바꿨으면 WriteConflictError.
+        """
+        key = changes.key
+        values = [
+            frame[key].tolist()
+            for frame in (changes.inserted, changes.updated, changes.deleted)
+        ]
+        others = [name for name in TABLES[table]["columns"] if name != key]
+        assignments = ", ".join(f'"{name}" = ?' for name in others)
+        with self._transaction(write=True) as conn:
+            self._create_table(conn, table)
+            current = self._select_keys(conn, table, key, sum(values, []))
+            if not changes.matches(current):
+                raise storage.WriteConflictError(table)
+
+            conn.executemany(
+                f'DELETE FROM "{table}" WHERE "{key}" = ?',
+                [(value,) for value in values[2]],
+            )
+            conn.executemany(
+                f'UPDATE "{table}" SET {assignments} WHERE "{key}" = ?',
+                changes.updated.reindex(columns=others + [key])
+                .astype(object)
+                .itertuples(index=False, name=None),
+            )
+            self._insert(conn, table, changes.inserted)
+            self._bump_version(conn, table)
+
+    def delete_batch(self, date):
+        with self._transaction(write=True) as conn:
+            self._create_table(conn, "assignments")
+            conn.execute('DELETE FROM "assignments" WHERE "날짜" = ?', (date,))
+            self._bump_version(conn, "assignments")
+
+    def next_ids(self, table, count=1):
+        """table에 새로 쓸 id count개 (한 번 준 id는 삭제된 뒤에도 다시 주지 않음)"""
+        with self._transaction(write=True) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _sequences "
+                "(table_name TEXT PRIMARY KEY, last_id INTEGER NOT NULL)"
+            )
+            row = conn.execute(
+                "SELECT last_id FROM _sequences WHERE table_name = ?", (table,)
+            ).fetchone()
+            last = row[0] if row else 0
+            conn.execute(
+                "INSERT INTO _sequences (table_name, last_id) VALUES (?, ?) "
+                "ON CONFLICT(table_name) DO UPDATE SET last_id = excluded.last_id",
+                (table, last + count),
+            )
+        return list(range(last + 1, last + count + 1))
+
+    def compact(self):
+        # 삭제가 바로 반영되므로 압축할 것이 없음
+        pass
+
+
+class ParquetBackend(CsvBackend):
+    """배치 기록만 월별 Parquet 파일로 저장하는 저장소 (나머지 테이블은 CSV)
+
+    배치 기록은 directory 아래에 "YYYY-MM.parquet" 파일 하나씩 나눠 저장한다.
+    구역/담당자는 사전(dictionary) 인코딩된 범주형으로 저장하고, 날짜 범위
+    조회는 해당 월 파일만 열어서 행 그룹 통계로 한 번 더 걸러 읽는다.
+    배치 추가/삭제는 해당 월 파일만 임시 파일에 다시 써서 교체한다.
+    """
+
+    def __init__(self, directory):
+        _import_pyarrow()
+        # 배치 기록을 CSV로 두지 않으므로 CsvBackend의 배치 위치 색인은 만들지 않음
+        self.batch_index = None
+        self.directory = directory
+        # 읽은 월 파일 LRU 캐시: {경로: (파일 버전, DataFrame, 크기)}
+        # 전체 크기를 config.PARQUET_CACHE_BYTES 이하로 유지
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        # 월 파일별 배치 요약: {경로: (파일 버전, 요약 DataFrame)}
+        self._summaries = {}
+        self._cache_lock = threading.Lock()
+
+    # 월 파일 관리
+    def _partitions(self):
+        """월 -> 파일 경로 (월 순서)"""
+        if not os.path.isdir(self.directory):
+            return {}
+        files = sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.endswith(".parquet") and not name.startswith(".")
+        )
+        return {name[: -len(".parquet")]: os.path.join(self.directory, name) for name in files}
+
+    def _partition_path(self, month):
+        return os.path.join(self.directory, f"{month}.parquet")
+
+    def _months(self, start=None, end=None):
+        """start <= 날짜 < end 범위에 걸치는 월 파일만 선택"""
+        return {
+            month: path
+            for month, path in self._partitions().items()
+            if (start is None or month >= start[:7]) and (end is None or month <= end[:7])
+        }
+
+    def _read_partition(self, path, filters=None):
+        if filters:
+            # 조건에 맞는 행 그룹만 읽으므로 바이트 수는 세지 않음
+            metrics.record_read(path)
+            table = pq.read_table(path, filters=filters)
+            return self._decode(table.to_pandas())
+
+        version = storage.file_version(path)
+        with self._cache_lock:
+            entry = self._cache.get(path)
+            if entry is not None:
+                self._cache.move_to_end(path)
+        hit = entry is not None and entry[0] == version
+        metrics.record_cache("parquet", hit)
+        if not hit:
+            metrics.record_read(path, version[1] if version else None)
+            df = self._decode(pq.read_table(path).to_pandas())
+            entry = (version, df, int(df.memory_usage(deep=True).sum()))
+            self._cache_put(path, entry)
+        return entry[1].copy()
+
+    def _cache_put(self, path, entry):
+        with self._cache_lock:
+            old = self._cache.pop(path, None)
+            if old is not None:
+                self._cache_bytes -= old[2]
+            # 한도보다 큰 월 파일은 캐시하지 않음
+            if entry[2] > config.PARQUET_CACHE_BYTES:
+                return
+            self._cache[path] = entry
+            self._cache_bytes += entry[2]
+
+            # 오래 안 쓴 것부터 제거
+            while self._cache_bytes > config.PARQUET_CACHE_BYTES:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted[2]
+
+    def clear_cache(self):
+        """읽은 월 파일과 배치 요약 캐시 비우기 (파일을 다시 읽는 경우 측정용)"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+            self._summaries.clear()
+
+    def _read(self, partitions, filters=None):
+        columns = list(TABLES["assignments"]["columns"])
+        frames = [self._read_partition(path, filters) for path in partitions.values()]
+        frames = [df for df in frames if not df.empty]
+        if not frames:
+            return names.categorize(pd.DataFrame(columns=columns))
+        # 이전 형식의 파일에 없는 컬럼은 빈 값으로 채움
+        df = pd.concat(frames, ignore_index=True).reindex(columns=columns)
+        return names.categorize(df)
+
+    def _decode(self, df):
+        # 파일마다 다른 범주 목록을 공유 이름 사전의 id로 맞춤
+        return names.categorize(df)
+
+    def _encode(self, df):
+        # 예전 형식이라 없는 컬럼은 빈 값으로 쓰고 migrations에서 채움
+        columns = list(TABLES["assignments"]["columns"])
+        df = names.categorize(df.reindex(columns=columns)).copy()
+        df["날짜"] = df["날짜"].astype(str)
+        # 파일의 사전에는 이 파일에서 쓰인 이름만 저장
+        for column in ("구역", "담당자"):
+            df[column] = df[column].cat.remove_unused_categories()
+        # 날짜 순으로 정렬해 두면 행 그룹 통계로 날짜 범위를 잘 걸러낼 수 있음
+        return df.sort_values("날짜", kind="stable")
+
+    def _write_partition(self, month, df):
+        """월 파일 하나를 임시 파일에 쓴 뒤 교체 (빈 DataFrame이면 삭제)"""
+        path = self._partition_path(month)
+        if df.empty:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        table = pa.Table.from_pandas(self._encode(df), preserve_index=False)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pq.write_table(table, f)
+                f.flush()
+                os.fsync(f.fileno())
+            storage.replace_file(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        metrics.record_write(path, os.path.getsize(path))
+
+    @staticmethod
+    def _by_month(df):
+        return df.groupby(df["날짜"].astype(str).str[:7], sort=True)
+
+    # 배치 기록 외의 테이블은 CSV 저장소와 같음
+    def exists(self, table):
+        if table != "assignments":
+            return super().exists(table)
+        return os.path.isdir(self.directory)
+
+    def version(self, table):
+        if table != "assignments":
+            return super().version(table)
+        return tuple(
+            (month, storage.file_version(path))
+            for month, path in self._partitions().items()
+        )
+
+    def history_version(self):
+        return self.version("assignments")
+
+    def load(self, table):
+        if table != "assignments":
+            return super().load(table)
+        version = self.version("assignments")
+        df = self._read(self._partitions())
+        df.attrs["version"] = version
+        return df
+
+    def find(self, table, **conditions):
+        if table != "assignments":
+            return super().find(table, **conditions)
+
+        # 날짜 조건이 있으면 해당 월 파일만 읽음
+        date = conditions.get("날짜")
+        partitions = self._months(str(date), str(date)) if date else self._partitions()
+        filters = [(column, "==", value) for column, value in conditions.items()]
+        return self._read(partitions, filters or None)
+
+    def batches_with(self, dates, **conditions):
+        # 날짜 범위에 걸치는 월 파일만 조건으로 걸러 읽음
+        dates = sorted(str(date) for date in dates)
+        if not dates:
+            return set()
+        filters = [("날짜", ">=", dates[0]), ("날짜", "<=", dates[-1])]
+        filters += [(column, "==", value) for column, value in conditions.items()]
+        df = self._read(self._months(dates[0], dates[-1]), filters)
+        return set(df["날짜"].astype(str)) & set(dates)
+
+    def batch_summary(self):
+        # 요약에 필요한 날짜/구역 컬럼만 월 파일마다 읽음 (배치는 한 월 파일 안에 있음)
+        # 월 파일별 요약은 파일 버전으로 캐시해서 바뀐 월만 다시 읽음
+        partitions = self._partitions()
+        frames = []
+        for path in partitions.values():
+            version = storage.file_version(path)
+            with self._cache_lock:
+                entry = self._summaries.get(path)
+            hit = entry is not None and entry[0] == version
+            metrics.record_cache("parquet_summary", hit)
+            if not hit:
+                metrics.record_read(path)
+                df = pq.read_table(path, columns=["날짜", "구역"]).to_pandas()
+                entry = (
+                    version,
+                    df.groupby(df["날짜"].astype(str)).agg(
+                        인원=("구역", "size"), 구역수=("구역", "nunique")
+                    ),
+                )
+                with self._cache_lock:
+                    self._summaries[path] = entry
+            frames.append(entry[1])
+
+        # 없어진 월 파일의 요약은 버림
+        with self._cache_lock:
+            for path in set(self._summaries) - set(partitions.values()):
+                del self._summaries[path]
+
+        if not frames:
+            return pd.DataFrame(columns=["날짜", "인원", "구역수"])
+        return pd.concat(frames).reset_index()
+
+    def latest_batch(self):
+        # 마지막 월 파일만 읽음
+        partitions = self._partitions()
+        if not partitions:
+            return None
+        return self._read_partition(list(partitions.values())[-1])["날짜"].max()
+
+    def load_batch(self, date):
+        return self.find("assignments", 날짜=date)
+
+    def iter_assignments(self, start=None, end=None, chunksize=10000):
+        """배치 기록을 날짜 순으로 나눠서 읽기 (start <= 날짜 < end)
+
+        범위에 걸치는 월 파일만 읽으며, 날짜 조건은 파일의 행 그룹
+        통계를 이용해 읽는 단계에서 걸러낸다.
+        """
+        filters = []
+        if start is not None:
+            filters.append(("날짜", ">=", start))
+        if end is not None:
+            filters.append(("날짜", "<", end))
+
+        for path in self._months(start, end).values():
+            df = self._read_partition(path, filters or None)
+            for begin in range(0, len(df), chunksize):
+                yield df.iloc[begin : begin + chunksize]
+
+    def save(self, table, df, expected_version=None):
+        if table != "assignments":
+            return super().save(table, df, expected_version)
+
+        with storage.write_lock(self.directory):
+            if expected_version is not None and self.version(table) != expected_version:
+                raise storage.WriteConflictError(table)
+
+            os.makedirs(self.directory, exist_ok=True)
+            months = {}
+            for month, rows in self._by_month(df):
+                months[month] = rows
+            for month in set(self._partitions()) - set(months):
+                self._write_partition(month, df.iloc[0:0])
+            for month, rows in months.items():
+                self._write_partition(month, rows)
+
+    def append(self, table, df):
+        if table != "assignments":
+            return super().append(table, df)
+
+        # 새 배치가 속한 월 파일만 다시 씀
+        with storage.write_lock(self.directory):
+            partitions = self._partitions()
+            for month, rows in self._by_month(df):
+                if month in partitions:
+                    rows = pd.concat(
+                        [self._read_partition(partitions[month]), rows],
+                        ignore_index=True,
+                    )
+                self._write_partition(month, rows)
+
+    def delete_batch(self, date):
+        with storage.write_lock(self.directory):
+            month = str(date)[:7]
+            path = self._partitions().get(month)
+            if path is None:
+                return
+            df = self._read_partition(path)
+            self._write_partition(month, df[df["날짜"].astype(str) != str(date)])
+
+    def deleted_batches(self):
+        return set()
+
+    def compact(self):
+        # 삭제가 바로 반영되므로 압축할 것이 없음
+        pass
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """설정(config.STORAGE_BACKEND)에 맞는 저장소 반환"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if config.STORAGE_BACKEND == "csv":
+                _backend = CsvBackend()
+            elif config.STORAGE_BACKEND == "sqlite":
+                _backend = SqliteBackend(config.SQLITE_FILE)
+            elif config.STORAGE_BACKEND == "parquet":
+                _backend = ParquetBackend(config.PARQUET_DIR)
+            else:
+                raise ValueError(f"알 수 없는 저장소 종류: {config.STORAGE_BACKEND}")
+        return _backend
+
+
+def _import_csv(target, tables=TABLES):
+    source = CsvBackend()
+    counts = {}
+    for table in tables:
+        if not source.exists(table):
+            continue
+        df = source.load(table)
+        target.save(table, df)
+        counts[table] = len(df)
+    return counts
+
+
+def import_csv_to_sqlite(sqlite_path=None):
+    """기존 CSV 데이터를 SQLite 파일로 한 번에 옮기기"""
+    return _import_csv(SqliteBackend(sqlite_path or config.SQLITE_FILE))
+
+
+def import_csv_to_parquet(directory=None):
+    """기존 배치 기록 CSV를 월별 Parquet 파일로 옮기기 (나머지 테이블은 CSV 그대로)"""
+    return _import_csv(
+        ParquetBackend(directory or config.PARQUET_DIR), ["assignments"]
+    )
+
+
+def export_assignments_csv(path, backend=None):
+    """현재 저장소의 배치 기록을 CSV 파일 하나로 내보내기 (나눠 읽으며 기록)"""
+    backend = backend or get_backend()
+    count = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        header = True
+        for chunk in backend.iter_assignments():
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+            count += len(chunk)
+        if header:
+            pd.DataFrame(columns=list(TABLES["assignments"]["columns"])).to_csv(
+                f, index=False
+            )
+    return count
+
+
+if __name__ == "__main__":
+    # 사용법:
+    #   python -m core.backends import-csv [--target sqlite|parquet]
+    #   python -m core.backends export-csv --output assignments.csv
+    parser = argparse.ArgumentParser(description="저장소 관리")
+    parser.add_argument("command", choices=["import-csv", "export-csv"])
+    parser.add_argument("--target", choices=["sqlite", "parquet"], default="sqlite")
+    parser.add_argument("--sqlite", default=config.SQLITE_FILE)
+    parser.add_argument("--parquet", default=config.PARQUET_DIR)
+    parser.add_argument("--output", default="assignments_export.csv")
+    args = parser.parse_args()
+
+    if args.command == "export-csv":
+        print(f"assignments: {export_assignments_csv(args.output)}행")
+    else:
+        if args.target == "parquet":
+            counts = import_csv_to_parquet(args.parquet)
+        else:
+            counts = import_csv_to_sqlite(args.sqlite)
+        for table, count in counts.items():
+            print(f"{table}: {count}행")
@@ -0,0 +1,363 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core import storage
+
+RUN_COLUMNS = ["날짜", "위치", "길이", "시작행", "행수", "구역수"]
+
+
+class _LineReader:
+    """바이트 위치를 추적하면서 한 줄씩 읽기 (csv.reader 입력용)
+
+    csv.reader는 레코드 하나에 필요한 줄만 읽으므로 next() 전후의
+    position이 레코드의 시작/끝 바이트 위치가 된다.
+    """
+
+    def __init__(self, f, start, stop):
+        self.f = f
+        self.position = start
+        self.stop = stop
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.f.readline()
+        # 쓰는 중인 마지막 줄은 읽지 않음
+        if not line or self.position + len(line) > self.stop:
+            raise StopIteration
+        encoding = "utf-8-sig" if self.position == 0 else "utf-8"
+        self.position += len(line)
+        return line.decode(encoding)
+
+
+def _scan(path, start, stop, first_row, columns=None):
+    """파일의 start~stop 바이트를 읽어 연속된 같은 날짜 행 묶음(run) 목록 반환
+
+    start가 0이면 첫 줄을 헤더로 읽는다. 반환값: (컬럼 목록, run 목록)
+    """
+    runs = []
+    current = None  # [날짜, 시작 위치, 끝 위치, 시작행, 행수, 구역 집합]
+    row = first_row
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        lines = _LineReader(f, start, stop)
+        reader = csv.reader(lines)
+        if columns is not None:
+            date_col, area_col = columns.index("날짜"), columns.index("구역")
+
+        while True:
+            offset = lines.position
+            try:
+                record = next(reader)
+            except StopIteration:
+                break
+            if not record:  # 빈 줄 (append 때 넣은 개행 보정 등)
+                continue
+            if columns is None:
+                columns = record
+                date_col, area_col = columns.index("날짜"), columns.index("구역")
+                continue
+
+            date, area = record[date_col], record[area_col]
+            if current is not None and current[0] == date:
+                current[2] = lines.position
+                current[4] += 1
+                current[5].add(area)
+            else:
+                if current is not None:
+                    runs.append(current)
+                current = [date, offset, lines.position, row, 1, {area}]
+            row += 1
+
+    if current is not None:
+        runs.append(current)
+
+    return columns, [
+        (date, begin, end - begin, first, count, len(areas))
+        for date, begin, end, first, count, areas in runs
+    ]
+
+
+class _Runs:
+    """run 목록과 날짜별 run 번호 (뒤에 추가만 하며 여러 버전의 _State가 공유)"""
+
+    def __init__(self, runs=()):
+        self.rows = []
+        self.positions = {}  # 날짜 -> run 번호 목록 (같은 날짜가 떨어져 추가되면 여러 개)
+        self.lock = threading.Lock()
+        self.add(runs)
+
+    def add(self, runs):
+        with self.lock:
+            for run in runs:
+                self.positions.setdefault(run[0], []).append(len(self.rows))
+                self.rows.append(tuple(run))
+
+
+class _State:
+    """특정 파일 버전에 대한 색인 내용
+
+    run 목록은 이후 버전과 공유하고, 이 버전에 해당하는 앞쪽 count개만 쓴다.
+    index_version은 이 내용을 쓰거나 읽었을 때의 색인 파일 버전.
+    """
+
+    def __init__(self, source_version, columns, store, index_version=None):
+        self.source_version = source_version
+        self.columns = columns
+        self.store = store
+        self.count = len(store.rows)
+        self.index_version = index_version
+        self._runs = None
+
+    @property
+    def runs(self):
+        """run 목록 DataFrame (요약용, 처음 쓸 때 만듦)"""
+        if self._runs is None:
+            self._runs = pd.DataFrame(self.store.rows[: self.count], columns=RUN_COLUMNS)
+        return self._runs
+
+    def dates(self):
+        with self.store.lock:
+            return [
+                date
+                for date, rows in self.store.positions.items()
+                if rows[0] < self.count
+            ]
+
+    def find(self, dates):
+        """날짜들에 해당하는 run 목록 (파일 위치 순서)"""
+        numbers = sorted(
+            i
+            for date in dates
+            for i in self.store.positions.get(str(date), ())
+            if i < self.count
+        )
+        return [self.store.rows[i] for i in numbers]
+
+    @property
+    def next_row(self):
+        if not self.count:
+            return 0
+        last = self.store.rows[self.count - 1]
+        return last[3] + last[4]
+
+
+class BatchIndex:
+    """배치 기록 CSV의 배치별 위치 색인 (별도 파일에 저장)
+
+    배치 날짜마다 파일 안의 바이트 위치와 길이, 시작 행 번호, 행 수,
+    구역 수를 기록해 두고 배치가 추가될 때는 새로 추가된 부분만 읽어서
+    갱신한다. 배치 목록, 최근 배치, 배치 하나 읽기는 파일 전체를 파싱하지
+    않고 색인과 해당 바이트 범위만 사용한다. 색인에는 만들 때의 배치 기록
+    파일 버전을 함께 저장하고, 파일이 바뀌었는데 색인이 따라오지 못했으면
+    (다른 도구로 수정한 경우 등) 전체를 다시 읽어서 만든다.
+
+    색인 파일은 JSON 줄 형식이다. 첫 줄에 컬럼, 버전, 전체 run 목록을 쓰고,
+    배치가 추가될 때마다 (추가 후 버전, 새 run 목록) 한 줄을 끝에 덧붙이므로
+    추가 비용이 기존 기록 크기와 상관없다. 메모리의 run 목록도 뒤에 추가만 한다.
+    """
+
+    def __init__(self, path, index_path):
+        self.path = path
+        self.index_path = index_path
+        self._state = None
+        self._lock = threading.Lock()
+
+    # 색인 파일 저장/불러오기
+    def _save(self, state):
+        """색인 파일 전체를 새로 씀 (처음 만들거나 다시 만든 경우)"""
+        header = {
+            "columns": state.columns,
+            "version": state.source_version,
+            "runs": state.store.rows[: state.count],
+        }
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.index_path)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            storage.replace_file(temp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        state.index_version = storage.file_version(self.index_path)
+
+    def _save_tail(self, state, runs):
+        """기존 색인 파일 끝에 새로 추가된 run만 한 줄로 덧붙임"""
+        line = {"version": state.source_version, "runs": runs}
+        data = (json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8")
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        state.index_version = storage.file_version(self.index_path)
+
+    def _load(self):
+        # 읽기 전에 버전을 먼저 확인 (읽는 도중 바뀌면 다음에 다시 읽게 됨)
+        index_version = storage.file_version(self.index_path)
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                store = _Runs(header["runs"])
+                version = header["version"]
+                # 쓰다가 중단된 마지막 줄 등 깨진 줄이 있으면 다시 만듦
+                for line in f:
+                    tail = json.loads(line)
+                    store.add(tail["runs"])
+                    version = tail["version"]
+            return _State(version, header["columns"], store, index_version)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _build(self, version):
+        """파일 전체를 처음부터 읽어서 색인 만들기"""
+        columns, runs = _scan(self.path, 0, version[1], 0)
+        return _State(list(version), columns or [], _Runs(runs))
+
+    def _build_tail(self, version, state):
+        """state가 가리키는 위치 이후만 읽어서 새 버전의 색인 만들기
+
+        반환값: (새 state, 새로 추가된 run 목록)
+        """
+        start = state.source_version[1]
+        _, runs = _scan(self.path, start, version[1], state.next_row, state.columns)
+        store = state.store
+        if len(store.rows) != state.count:
+            # 이 버전 뒤에 (저장에 실패한) 다른 run이 붙어 있으면 앞부분만 복사
+            store = _Runs(store.rows[: state.count])
+        store.add(runs)
+        return _State(list(version), state.columns, store), runs
+
+    def current(self):
+        """현재 배치 기록 파일에 맞는 색인 (필요하면 다시 만듦)"""
+        version = storage.file_version(self.path)
+        version = list(version) if version else None
+        state = self._state
+        if state is not None and state.source_version == version:
+            return state
+
+        with storage.write_lock(self.index_path):
+            version = storage.file_version(self.path)
+            version = list(version) if version else None
+            state = self._state
+            if state is None or state.source_version != version:
+                state = self._load()
+            if state is None or state.source_version != version:
+                if version is None:
+                    state = _State(None, [], _Runs())
+                else:
+                    state = self._build(version)
+                    self._save(state)
+            with self._lock:
+                self._state = state
+        return state
+
+    def extend(self, before):
+        """파일 끝에 행이 추가된 뒤 호출 (before: 추가 전 파일 버전)
+
+        색인이 추가 전 파일과 맞으면 새로 추가된 바이트만 읽어서 메모리의
+        run 목록과 색인 파일 끝에 덧붙인다.
+        """
+        before = list(before) if before else None
+        with storage.write_lock(self.index_path):
+            version = list(storage.file_version(self.path))
+            state = self._state
+            # 다른 프로세스가 색인 파일을 바꿨으면 파일 내용 기준으로 이어서 씀
+            if (
+                state is None
+                or state.source_version != before
+                or state.index_version != storage.file_version(self.index_path)
+            ):
+                state = self._load()
+
+            if (
+                state is not None
+                and state.columns
+                and before is not None
+                and state.source_version == before
+                and before[1] > 0
+                and version[2] == before[2]
+            ):
+                state, runs = self._build_tail(version, state)
+                self._save_tail(state, runs)
+            else:
+                state = self._build(version)
+                self._save(state)
+            with self._lock:
+                self._state = state
+
+    def rebuild(self):
+        """파일 전체를 다시 쓴 뒤 호출 - 처음부터 다시 만듦"""
+        with storage.write_lock(self.index_path):
+            version = list(storage.file_version(self.path))
+            state = self._build(version)
+            self._save(state)
+            with self._lock:
+                self._state = state
+
+    def summary(self, deleted_dates=()):
+        """배치별 요약 (날짜, 인원, 구역 수) - 날짜 순"""
+        state = self.current()
+        runs = state.runs[~state.runs["날짜"].isin(set(deleted_dates))]
+        summary = runs.groupby("날짜", sort=True).agg(
+            인원=("행수", "sum"), 구역수=("구역수", "first"), 조각=("행수", "size")
+        )
+
+        # 같은 날짜가 떨어져서 기록된 배치는 구역 수를 직접 다시 셈
+        for date in summary.index[summary["조각"] > 1]:
+            summary.loc[date, "구역수"] = self.read_batch(date)["구역"].nunique()
+
+        summary = summary.drop(columns="조각").reset_index()
+        return summary.astype({"인원": np.int64, "구역수": np.int64})
+
+    def latest(self, deleted_dates=()):
+        """가장 최근 배치 날짜 (없으면 None)"""
+        state = self.current()
+        dates = set(state.dates()) - set(deleted_dates)
+        return max(dates) if dates else None
+
+    def read_batch(self, date):
+        """배치 하나의 행만 파일에서 읽기"""
+        return self.read_batches([date])
+
+    def read_batches(self, dates):
+        """여러 배치의 행만 파일에서 읽기 (파일 위치 순서)"""
+        while True:
+            state = self.current()
+            runs = state.find(dates)
+            if not runs:
+                return pd.DataFrame(columns=state.columns)
+
+            with open(self.path, "rb") as f:
+                # 색인을 얻은 뒤 파일이 통째로 교체되었으면 다시 시도
+                # (끝에 추가만 되었다면 기존 위치는 그대로 유효함)
+                stat = os.fstat(f.fileno())
+                if (
+                    stat.st_ino != state.source_version[2]
+                    or stat.st_size < state.source_version[1]
+                ):
+                    continue
+                parts = []
+                for _, offset, length, *_ in runs:
+                    f.seek(offset)
+                    parts.append(f.read(length))
+            break
+
+        return pd.read_csv(
+            io.BytesIO(b"".join(parts)),
+            names=state.columns,
+            header=None,
+            encoding="utf-8",
+        )
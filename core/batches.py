@@ -0,0 +1,91 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.backends import get_backend
+
+# 배치 목록 캐시: (배치 기록 버전, 배치 요약 DataFrame)
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_batch_index():
+    """배치 목록 (배치 번호, 날짜, 인원, 구역 수) - 날짜 오름차순
+
+    배치 기록이 바뀌지 않았으면 다시 계산하지 않는다.
+    """
+    global _index
+    backend = get_backend()
+    version = backend.history_version()
+
+    cached = _index
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    index = backend.batch_summary()
+    index.insert(0, "배치", np.arange(1, len(index) + 1))
+    with _index_lock:
+        _index = (version, index)
+    return index
+
+
+def _date_range(dates, start=None, end=None, before=None):
+    """정렬된 배치 날짜에서 start <= 날짜 < end (before 이전) 범위의 (시작, 끝) 위치"""
+    low = np.searchsorted(dates, start, side="left") if start else 0
+    high = np.searchsorted(dates, end, side="left") if end else len(dates)
+    if before:
+        high = min(high, np.searchsorted(dates, before, side="left"))
+    return low, max(high, low)
+
+
+def count_batches(start=None, end=None):
+    """start <= 날짜 < end 범위의 배치 수 (배치 기록은 읽지 않음)"""
+    low, high = _date_range(get_batch_index()["날짜"].to_numpy(dtype=str), start, end)
+    return int(high - low)
+
+
+def list_batches(start=None, end=None, member=None, area=None, before=None, limit=20):
+    """최신 배치부터 한 페이지씩 조회 (키셋 페이지네이션)
+
+    start/end: 날짜 문자열 범위 (start <= 날짜 < end)
+    member/area: 해당 팀원 id가 (해당 구역 id를) 담당한 배치만
+    before: 이전 페이지의 마지막 날짜 (이 날짜보다 이전 배치부터 조회)
+    반환값: (페이지 DataFrame, 다음 페이지 커서 또는 None)
+    """
+    index = get_batch_index()
+    dates = index["날짜"].to_numpy(dtype=str)
+
+    # 날짜가 정렬되어 있으므로 범위는 이진 탐색으로 자름
+    low, high = _date_range(dates, start, end, before)
+    candidates = index.iloc[low:high]
+
+    candidates = candidates.iloc[::-1]
+
+    # 팀원/구역 조건은 최신 배치부터 묶음으로 확인하고, 다음 페이지가 있는지
+    # 알 수 있을 만큼(limit + 1개) 찾으면 멈춤 (배치 기록 전체를 읽지 않음)
+    conditions = {}
+    if member is not None:
+        conditions["담당자_id"] = member
+    if area is not None:
+        conditions["구역_id"] = area
+    if conditions:
+        backend = get_backend()
+        matched = []
+        found = 0
+        block = limit + 1
+        position = 0
+        while position < len(candidates) and found <= limit:
+            chunk = candidates.iloc[position : position + block]
+            hits = backend.batches_with(chunk["날짜"].tolist(), **conditions)
+            chunk = chunk[chunk["날짜"].isin(hits)]
+            matched.append(chunk)
+            found += len(chunk)
+            position += block
+            # 조건에 맞는 배치가 드물면 묶음을 키워서 조회 횟수를 줄임
+            block *= 2
+        candidates = pd.concat(matched) if matched else candidates.iloc[:0]
+
+    page = candidates.head(limit)
+    next_cursor = page["날짜"].iloc[-1] if len(candidates) > limit else None
+    return page.reset_index(drop=True), next_cursor
@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from core import auth, config, metrics, migrations
+from core.backends import TABLES, get_backend
+
+# 처음 실행할 때 만드는 기본 데이터
+DEFAULT_MEMBERS = [
+    "김택관",
+    "Debbie",
+    "권지민",
+    "김나희",
+    "김진산",
+    "박지현",
+    "서수현",
+    "위진희",
+    "이건",
+    "이서혁",
+    "이은비",
+    "정다은",
+    "정성우",
+    "조재웅",
+    "조재원",
+    "최용석",
+    "한세호",
+    "한유진",
+]
+DEFAULT_AREAS = [
+    {"구역명": "바닥쓸기(빗자루)", "필요인원": 4},
+    {"구역명": "바닥닦기(대걸래)", "필요인원": 4},
+    {"구역명": "분리수거(통 세척 및 정수기 물받이)", "필요인원": 2},
+    {"구역명": "휴지통 비우기", "필요인원": 2},
+    {
+        "구역명": "공용 테이블 닦기(탕비실,회의실) + 수납장 먼지털기",
+        "필요인원": 1,
+    },
+    {"구역명": "공용 휴지 및 탕비실, 냉장고 물건 채우기", "필요인원": 1},
+    {"구역명": "창문 닦기 및 바닥 부착물 제거", "필요인원": 4},
+]
+# 기본 관리자 계정 (ID: admin, PW: admin1234)
+DEFAULT_ADMIN = ("admin", "admin1234")
+
+# 준비 상태 (프로세스마다 한 번)
+_lock = threading.Lock()
+_ready = False
+_ready_seconds = None  # 준비에 걸린 시간(초)
+
+
+def initialize_data(backend):
+    """없는 테이블만 기본 데이터로 만들기"""
+    if not backend.exists("members"):
+        backend.save(
+            "members",
+            pd.DataFrame(
+                {
+                    "id": backend.next_ids("members", len(DEFAULT_MEMBERS)),
+                    "이름": DEFAULT_MEMBERS,
+                    "활성": [True] * len(DEFAULT_MEMBERS),
+                }
+            ),
+        )
+
+    if not backend.exists("areas"):
+        areas_df = pd.DataFrame(DEFAULT_AREAS)
+        areas_df.insert(0, "id", backend.next_ids("areas", len(areas_df)))
+        backend.save("areas", areas_df)
+
+    if not backend.exists("assignments"):
+        backend.save(
+            "assignments", pd.DataFrame(columns=list(TABLES["assignments"]["columns"]))
+        )
+
+    if not backend.exists("users"):
+        username, password = DEFAULT_ADMIN
+        backend.save(
+            "users",
+            pd.DataFrame(
+                {
+                    "id": backend.next_ids("users"),
+                    "username": [username],
+                    "password": [auth.new_password_hash(password)],
+                    "is_admin": [True],
+                }
+            ),
+        )
+
+
+def ensure_ready():
+    """데이터 폴더 준비, 기본 데이터 생성, 스키마 변환, 지표 내보내기 시작을
+    프로세스에서 한 번만 실행
+
+    준비가 끝난 뒤에는 플래그만 확인하므로 매 실행마다 불러도 된다.
+    실패하면 준비되지 않은 상태로 남고 다음 호출 때 다시 시도한다.
+    """
+    global _ready, _ready_seconds
+    if _ready:
+        return
+    with _lock:
+        if _ready:
+            return
+        started = time.perf_counter()
+        os.makedirs(config.DATA_DIR, exist_ok=True)
+        backend = get_backend()
+        initialize_data(backend)
+        # 이전 형식의 데이터가 있으면 새 형식으로 변환 (id 부여 등)
+        migrations.migrate(backend)
+        # 설정된 경우 운영 지표 HTTP 엔드포인트/파일 기록 시작
+        metrics.start_exporters()
+        _ready_seconds = time.perf_counter() - started
+        _ready = True
+
+
+def status():
+    """준비 상태 {"ready": bool, "seconds": 준비에 걸린 시간, "data_dir": 데이터 폴더}"""
+    return {"ready": _ready, "seconds": _ready_seconds, "data_dir": config.DATA_DIR}
+
+
+# 운영 지표 - 준비 여부(1/0)와 준비에 걸린 시간
+READY = metrics.Gauge(
+    "cleaning_ready", "데이터 준비 완료 여부 (1: 완료)", [], lambda: {(): int(_ready)}
+)
+BOOTSTRAP_SECONDS = metrics.Gauge(
+    "cleaning_bootstrap_seconds",
+    "데이터 준비(기본 데이터 생성, 스키마 변환)에 걸린 시간(초)",
+    [],
+    lambda: {} if _ready_seconds is None else {(): _ready_seconds},
+)
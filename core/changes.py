@@ -0,0 +1,95 @@
+import pandas as pd
+
+
+def _same_rows(left, right):
+    """같은 key(index)를 가진 두 표에서 행마다 모든 값이 같은지 (빈 값끼리는 같음)"""
+    left, right = left.astype(object), right.astype(object)
+    return ((left == right) | (left.isna() & right.isna())).all(axis=1)
+
+
+class RowChanges:
+    """편집 전후 표의 행 단위 차이 (key 컬럼으로 같은 행을 찾음)
+
+    inserted: 추가된 행 (key가 비어 있으면 저장할 때 새 id를 받음)
+    updated: 값이 바뀐 행의 바뀐 뒤 값, previous: 같은 행의 바뀌기 전 값
+    deleted: 삭제된 행의 삭제 전 값
+    저장할 때 previous/deleted가 저장소의 현재 값과 다르면 다른 사용자가
+    먼저 그 행을 바꾼 것이므로 충돌로 본다 (다른 행의 변경과는 충돌하지 않음).
+    """
+
+    def __init__(self, key, inserted, updated, previous, deleted):
+        self.key = key
+        self.inserted = inserted
+        self.updated = updated
+        self.previous = previous
+        self.deleted = deleted
+
+    @property
+    def empty(self):
+        return self.inserted.empty and self.updated.empty and self.deleted.empty
+
+    def summary(self):
+        """추가/수정/삭제 행 수"""
+        return {
+            "추가": len(self.inserted),
+            "수정": len(self.updated),
+            "삭제": len(self.deleted),
+        }
+
+    def matches(self, current):
+        """current(변경 대상 행이 포함된 현재 표)가 편집 전 값과 같은지"""
+        rows = current.set_index(self.key)
+        expected = pd.concat([self.previous, self.deleted]).set_index(self.key)
+        if not expected.index.isin(rows.index).all():
+            return False
+        if self.inserted[self.key].isin(rows.index).any():
+            return False
+        return bool(
+            _same_rows(rows.loc[expected.index, expected.columns], expected).all()
+        )
+
+    def apply_to(self, df):
+        """df에 변경 내용을 반영한 새 표 (컬럼 순서는 df와 같음)"""
+        rows = df.set_index(self.key).drop(index=self.deleted[self.key])
+        updated = self.updated.set_index(self.key)
+        rows.loc[updated.index, updated.columns] = updated
+        return pd.concat([rows.reset_index(), self.inserted], ignore_index=True)[
+            list(df.columns)
+        ]
+
+
+def diff_rows(original, edited, key="id"):
+    """original을 편집한 결과 edited와의 행 단위 차이 (RowChanges)
+
+    원본 행마다 Python 비교를 하지 않고 key로 맞춘 뒤 컬럼 단위로 비교한다.
+    """
+    columns = list(original.columns)
+    edited = edited.reindex(columns=columns)
+
+    new = edited[key].isna() | ~edited[key].isin(original[key])
+    inserted = edited[new].reset_index(drop=True)
+
+    before = original.set_index(key)
+    after = edited[~new].set_index(key)
+    kept = before.index.isin(after.index)
+    deleted = original[~kept].reset_index(drop=True)
+
+    before = before[kept]
+    after = after.loc[before.index]
+    changed = ~_same_rows(before, after).to_numpy()
+    return RowChanges(
+        key,
+        inserted,
+        after[changed].reset_index(),
+        before[changed].reset_index(),
+        deleted,
+    )
+
+
+def inserted_rows(df, key="id"):
+    """df의 행을 모두 새로 추가하는 RowChanges (key가 비어 있으면 저장할 때 id 부여)"""
+    df = df.reset_index(drop=True)
+    if key not in df.columns:
+        df.insert(0, key, None)
+    empty = df.iloc[0:0]
+    return RowChanges(key, df, empty, empty, empty)
@@ -0,0 +1,188 @@
+"""명령줄 도구 - Streamlit 없이 배치 생성, 내보내기, 안내 메시지 만들기
+
+    python -m core generate                         # 배치 하나 생성
+    python -m core generate --month 2025-03         # 한 달 근무일 배치 생성
+    python -m core list --limit 10                  # 최근 배치 목록
+    python -m core export-excel --output out.xlsx   # 최신 배치 엑셀
+    python -m core export-history --output h.xlsx --group-by month
+    python -m core render --start 2025-03-01 --end 2025-03-31 --output-dir msgs
+
+데이터 폴더와 저장소는 앱과 같은 설정(CLEANING_DATA_DIR,
+CLEANING_STORAGE_BACKEND 등 환경 변수)을 따른다.
+"""
+
+import argparse
+import datetime
+import os
+import sys
+
+from core import assignment, config, service, templates
+from core.names import group_by_area
+
+
+def _date(value):
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _month(value):
+    year, month = value.split("-")
+    return int(year), int(month)
+
+
+def _batch_file_name(prefix, date, extension):
+    """페이지의 다운로드 파일 이름과 같은 형식 (예: 청소구역배치_20250305_090000.xlsx)"""
+    stamp = str(date).replace("-", "").replace(" ", "_").replace(":", "")
+    return f"{prefix}_{stamp}.{extension}"
+
+
+def _read_text(path):
+    if path is None:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _batch_dates(selected=None, start=None, end=None):
+    """고른 배치 날짜 목록이나 start~end 기간의 배치 날짜, 둘 다 없으면 최신 배치"""
+    dates = service.load_batch_index()["날짜"].astype(str).tolist()
+    if selected:
+        existing = set(dates)
+        missing = [date for date in selected if date not in existing]
+        if missing:
+            raise SystemExit(f"배치 기록이 없습니다: {', '.join(missing)}")
+        return selected
+    if start or end:
+        page, _ = service.list_assignment_batches(start, end, limit=len(dates) or 1)
+        return page["날짜"].astype(str).tolist()[::-1]
+    if not dates:
+        raise SystemExit("배치 기록이 없습니다.")
+    return dates[-1:]
+
+
+def cmd_generate(args):
+    if args.month or args.start or args.end:
+        if args.month:
+            start, end = assignment.month_range(*_month(args.month))
+        elif args.start and args.end:
+            start, end = args.start, args.end
+        else:
+            raise SystemExit("--start와 --end를 함께 지정하세요.")
+        new_assignments = service.generate_assignments_for_dates(
+            assignment.working_days(start, end), args.engine
+        )
+    else:
+        new_assignments = service.generate_assignment(args.engine)
+
+    if new_assignments.empty:
+        print("새로 만든 배치가 없습니다. (이미 배치가 있는 날짜)")
+        return
+    for date, batch in new_assignments.groupby("날짜", sort=True, observed=True):
+        print(f"{date}: {batch['담당자'].nunique()}명, {batch['구역'].nunique()}개 구역")
+
+
+def cmd_list(args):
+    page, _ = service.list_assignment_batches(args.start, args.end, limit=args.limit)
+    if page.empty:
+        print("배치 기록이 없습니다.")
+        return
+    print(page.to_string(index=False))
+
+
+def cmd_export_excel(args):
+    date = _batch_dates([args.date] if args.date else None)[0]
+    batch = service.load_assignment_batch(date)
+    output = args.output or _batch_file_name("청소구역배치", date, "xlsx")
+    with open(output, "wb") as f:
+        f.write(service.export_assignment_to_excel(batch))
+    print(f"{output}: {date} 배치 {len(batch)}행")
+
+
+def cmd_export_history(args):
+    sheets, group_by = service.export_history_to_excel(
+        args.output, args.start, args.end, args.group_by
+    )
+    if group_by != args.group_by:
+        print(
+            f"배치가 {config.EXPORT_MAX_BATCH_SHEETS}개를 넘어 월별 시트로 내보냈습니다.",
+            file=sys.stderr,
+        )
+    print(f"{args.output}: 시트 {sheets}개")
+
+
+def cmd_render(args):
+    header = _read_text(args.header_file)
+    footer = _read_text(args.footer_file)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    for date in _batch_dates(args.date, args.start, args.end):
+        text = templates.render_template(
+            date, group_by_area(service.load_assignment_batch(date)), header, footer
+        )
+        if args.output_dir:
+            path = os.path.join(
+                args.output_dir, _batch_file_name("청소구역안내", date, "txt")
+            )
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            print(path)
+        else:
+            print(f"===== {date} =====")
+            print(text)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m core", description="청소 구역 배치 시스템 명령줄 도구"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="배치 생성")
+    generate.add_argument(
+        "--engine", choices=sorted(assignment.ENGINES), default=None, help="배치 방식"
+    )
+    generate.add_argument("--month", help="한 달 근무일 배치 생성 (YYYY-MM)")
+    generate.add_argument("--start", type=_date, help="기간 시작일 (YYYY-MM-DD)")
+    generate.add_argument("--end", type=_date, help="기간 종료일 (YYYY-MM-DD)")
+    generate.set_defaults(func=cmd_generate)
+
+    batch_list = commands.add_parser("list", help="배치 목록 (최신순)")
+    batch_list.add_argument("--start", type=_date)
+    batch_list.add_argument("--end", type=_date)
+    batch_list.add_argument("--limit", type=int, default=20)
+    batch_list.set_defaults(func=cmd_list)
+
+    excel = commands.add_parser("export-excel", help="배치 하나를 엑셀로 내보내기")
+    excel.add_argument("--date", help="배치 날짜 (기본값: 최신 배치)")
+    excel.add_argument("--output", help="저장할 파일 (기본값: 청소구역배치_날짜.xlsx)")
+    excel.set_defaults(func=cmd_export_excel)
+
+    history = commands.add_parser("export-history", help="기간 배치 기록을 엑셀로")
+    history.add_argument("--start", type=_date)
+    history.add_argument("--end", type=_date)
+    history.add_argument("--group-by", choices=["batch", "month"], default="batch")
+    history.add_argument("--output", required=True)
+    history.set_defaults(func=cmd_export_history)
+
+    render = commands.add_parser("render", help="배치 안내 메시지 만들기")
+    render.add_argument(
+        "--date", action="append", help="배치 날짜 (여러 번 지정 가능, 기본값: 최신 배치)"
+    )
+    render.add_argument("--start", type=_date, help="이 날짜부터의 배치 모두")
+    render.add_argument("--end", type=_date, help="이 날짜까지의 배치 모두")
+    render.add_argument("--header-file", help="머리말 템플릿 파일 (UTF-8)")
+    render.add_argument("--footer-file", help="맺음말 템플릿 파일 (UTF-8)")
+    render.add_argument("--output-dir", help="배치마다 텍스트 파일로 저장할 폴더")
+    render.set_defaults(func=cmd_render)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    service.initialize_data()
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
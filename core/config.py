@@ -0,0 +1,106 @@
+import os
+
+# 프로젝트 폴더 (core 폴더의 상위)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 데이터 폴더 - 실행한 위치와 상관없이 항상 같은 폴더 사용 (환경 변수로 변경 가능)
+DATA_DIR = os.path.abspath(
+    os.environ.get("CLEANING_DATA_DIR", os.path.join(BASE_DIR, "data"))
+)
+
+# 데이터 파일 경로
+MEMBERS_FILE = os.path.join(DATA_DIR, "members.csv")
+AREAS_FILE = os.path.join(DATA_DIR, "cleaning_areas.csv")
+ASSIGNMENTS_FILE = os.path.join(DATA_DIR, "assignments.csv")
+USERS_FILE = os.path.join(DATA_DIR, "users.csv")
+# 삭제된 배치 기록 (압축 전까지 유지되는 삭제 표시)
+ASSIGNMENT_TOMBSTONES_FILE = os.path.join(DATA_DIR, "assignment_tombstones.csv")
+# 팀원 x 구역 담당 이력 행렬 (배치 기록에서 계산해 둔 값)
+ROTATION_FILE = os.path.join(DATA_DIR, "rotation.npz")
+# 담당 이력 행렬이 칸(팀원 x 구역)마다 기억하는 최근 담당 배치 순번 수
+# 배치를 삭제해도 남은 순번으로 마지막 담당을 바로 찾으므로, 한 칸에서 이만큼
+# 연속으로 삭제되기 전에는 배치 기록을 다시 읽지 않는다.
+ROTATION_RECENT_BATCHES = 4
+# 배치 기록 파일의 배치별 위치 색인 (배치 추가 시 함께 갱신)
+ASSIGNMENT_INDEX_FILE = os.path.join(DATA_DIR, "assignment_index.jsonl")
+# 테이블별 마지막으로 준 id (삭제된 id를 다시 쓰지 않도록 따로 기록)
+ID_SEQUENCE_FILE = os.path.join(DATA_DIR, "id_sequences.csv")
+
+# 비밀번호 해시 (PBKDF2-SHA256) 반복 횟수
+# 반복 횟수를 올리면 이전 값으로 저장된 비밀번호는 다음 로그인 때 다시 해시됨
+PASSWORD_HASH_ITERATIONS = 600_000
+# 동시에 해시를 계산하는 작업자 수 (기본: CPU 코어 수의 절반, 최소 1)
+# 해시 하나가 계산하는 동안(수백 ms) 코어 하나를 다 쓰므로, 로그인이 몰려도
+# 나머지 코어는 화면 실행과 배치 생성에 남겨 둔다. 넘치는 요청은 작업자
+# 대기열에서 기다리며 화면 스크립트는 기다리지 않는다.
+PASSWORD_HASH_WORKERS = int(
+    os.environ.get("CLEANING_PASSWORD_HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+)
+
+# 로그인 시도 제한: LOGIN_FAILURE_WINDOW초 안에 아이디별/접속 주소별 실패가
+# 이 횟수에 이르면 그 뒤 시도는 파일을 읽거나 해시를 계산하지 않고 거절
+LOGIN_MAX_FAILURES_PER_USER = 5
+LOGIN_MAX_FAILURES_PER_CLIENT = 20
+LOGIN_FAILURE_WINDOW = 300
+LOGIN_LIMITER_MAX_KEYS = 10000  # 실패 기록을 보관하는 최대 아이디/주소 수
+
+# 삭제 표시가 이 개수 이상 쌓이면 배치 기록 파일을 압축
+COMPACT_THRESHOLD = 20
+
+# 저장소 종류: "csv", "sqlite" 또는 "parquet" (환경 변수로 변경 가능)
+# "parquet"는 배치 기록만 월별 Parquet 파일로 저장하고 나머지는 CSV 사용
+STORAGE_BACKEND = os.environ.get("CLEANING_STORAGE_BACKEND", "csv")
+SQLITE_FILE = os.path.abspath(
+    os.environ.get("CLEANING_SQLITE_FILE", os.path.join(DATA_DIR, "cleaning.db"))
+)
+PARQUET_DIR = os.path.abspath(
+    os.environ.get("CLEANING_PARQUET_DIR", os.path.join(DATA_DIR, "assignments"))
+)
+
+# 배치 엔진: "matching"(이력 기반 최소 비용 매칭), "search"(병렬 최적화 탐색)
+# 또는 "greedy"(기존 방식)
+ASSIGNMENT_ENGINE = os.environ.get("CLEANING_ASSIGNMENT_ENGINE", "matching")
+
+# 매칭 비용 가중치
+REPEAT_PENALTY = 1.0  # 같은 구역을 담당했던 횟수당 비용
+RECENT_PENALTY = 10.0  # 직전 배치에서 같은 구역을 담당한 경우의 비용
+RECENT_DECAY = 0.5  # 한 배치 이전으로 갈 때마다 RECENT_PENALTY에 곱하는 비율
+RANDOM_JITTER = 0.5  # 비용이 비슷할 때 배치가 고정되지 않도록 더하는 난수 크기
+
+# 기간 배치 생성 시 날짜마다 만들어 비교할 후보 수
+PLAN_CANDIDATES = 4
+# 기간 배치로 만든 배치의 시각 (배치 기록의 날짜 컬럼은 "YYYY-MM-DD HH:MM:SS")
+PLAN_BATCH_TIME = "09:00:00"
+
+# 최적화 탐색("search" 엔진) 설정
+SEARCH_WORKERS = int(os.environ.get("CLEANING_SEARCH_WORKERS", os.cpu_count() or 1))
+SEARCH_TIME_BUDGET = 2.0  # 작업자당 최대 탐색 시간(초)
+SEARCH_RESTARTS = 4  # 작업자당 무작위 시작점 수
+SEARCH_ITERATIONS_PER_MEMBER = 200  # 시작점당 교환/이동 시도 횟수 = 팀원 수 x 이 값
+# 같은 seed면 같은 결과 (비워 두면 매번 다른 seed 사용)
+SEARCH_SEED = os.environ.get("CLEANING_SEARCH_SEED")
+BALANCE_PENALTY = 1.0  # 누적 부담 편차 제곱합에 곱하는 비용
+HEADCOUNT_PENALTY = 100.0  # 필요인원과 1명 차이날 때마다의 비용
+
+# 팀원/구역이 이 수보다 많으면 관리 페이지를 표 하나로 편집하는 일괄 편집으로 시작
+BULK_EDIT_ROWS = 50
+
+# 배치 기록 페이지의 내보내기 결과(엑셀/텍스트) 캐시 최대 크기
+ARTIFACT_CACHE_BYTES = 32 * 1024 * 1024
+# parquet 저장소가 읽어 둔 월 파일 캐시 최대 크기 (오래 안 쓴 월부터 제거)
+PARQUET_CACHE_BYTES = 64 * 1024 * 1024
+# 배치 기록 엑셀을 배치별 시트로 내보낼 때 최대 시트 수
+# (시트마다 저장 전까지 임시 파일을 하나씩 열어 두므로, 넘으면 월별 시트로 내보냄)
+EXPORT_MAX_BATCH_SHEETS = 100
+
+# 실행 시간 기록: 항목(데이터 함수, 페이지)마다 최근 이 개수만 보관해서 p50/p95 계산
+TIMING_SAMPLES = 500
+# 관리자 페이지에서 요청한 프로파일 결과를 보관하는 개수
+PROFILE_KEEP = 5
+
+# 운영 지표(Prometheus 텍스트 형식) 내보내기 - 둘 다 비워 두면 수집만 함
+# METRICS_PORT: /metrics HTTP 엔드포인트 포트 (0이면 사용 안 함)
+# METRICS_FILE: METRICS_FLUSH_INTERVAL초마다 다시 쓰는 파일 (node_exporter textfile 등)
+METRICS_PORT = int(os.environ.get("CLEANING_METRICS_PORT", "0"))
+METRICS_HOST = os.environ.get("CLEANING_METRICS_HOST", "127.0.0.1")
+METRICS_FILE = os.environ.get("CLEANING_METRICS_FILE") or None
+METRICS_FLUSH_INTERVAL = 15
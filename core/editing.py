@@ -0,0 +1,148 @@
+import streamlit as st
+
+from core.changes import diff_rows, inserted_rows
+from core.importer import IMPORT_TABLES, preview, valid_rows
+from core.service import WriteConflictError, save_changes
+
+# 관리 페이지(팀원/구역)에서 함께 쓰는 일괄 편집, 파일 가져오기 화면
+# core의 다른 모듈과 달리 Streamlit을 사용하므로 페이지에서만 import한다.
+# 입력 검사와 값 정리(check_edit, normalize)는 화면과 상관없이 사용할 수 있다.
+
+# 다른 사용자가 먼저 저장해서 저장하지 못했을 때 안내
+CONFLICT_MESSAGE = "다른 사용자가 먼저 변경했습니다. 최신 내용을 확인한 뒤 다시 시도하세요."
+
+# 테이블별 화면 문구 (이름 컬럼과 선택 컬럼 기본값은 importer.IMPORT_TABLES)
+EDIT_TABLES = {
+    "members": {
+        "label": "팀원",
+        "unit": "명",
+        "saved": "팀원 정보가 저장되었습니다.",
+        "added": "팀원 {count}명이 추가되었습니다.",
+        "import_help": (
+            "첫 줄은 컬럼 이름입니다. '이름' 컬럼은 필수, "
+            "'활성' 컬럼(예/아니오)은 선택입니다."
+        ),
+    },
+    "areas": {
+        "label": "구역",
+        "unit": "개",
+        "saved": "청소 구역 정보가 저장되었습니다.",
+        "added": "구역 {count}개가 추가되었습니다.",
+        "import_help": (
+            "첫 줄은 컬럼 이름입니다. '구역명' 컬럼은 필수, "
+            "'필요인원' 컬럼(기본 1)은 선택입니다."
+        ),
+    },
+}
+
+
+def check_edit(table, edited):
+    """편집한 표의 이름 컬럼 검사 - 문제가 있으면 안내 문구, 없으면 None"""
+    name_column = IMPORT_TABLES[table]["name"]
+    names = edited[name_column].fillna("").astype(str).str.strip()
+    if (names == "").any():
+        return f"{name_column}을 입력하세요."
+    if names.duplicated().any():
+        duplicated = ", ".join(names[names.duplicated()].unique())
+        return f"이미 존재하는 {EDIT_TABLES[table]['label']}입니다: {duplicated}"
+    return None
+
+
+def normalize(table, changes):
+    """저장 전 값 정리 - 이름 앞뒤 공백 제거, 빈 선택 컬럼은 기본값
+
+    선택 컬럼은 기본값과 같은 타입(bool, int)으로 맞춘다.
+    """
+    spec = IMPORT_TABLES[table]
+    for frame in (changes.inserted, changes.updated):
+        frame[spec["name"]] = frame[spec["name"]].astype(str).str.strip()
+        for column, default in spec["optional"].items():
+            frame[column] = frame[column].fillna(default).astype(type(default))
+    return changes
+
+
+def _saved(table, message):
+    st.session_state.pop(f"original_{table}", None)
+    st.success(message)
+    st.rerun()
+
+
+def _save(table, changes):
+    try:
+        save_changes(table, changes)
+    except WriteConflictError:
+        st.error(CONFLICT_MESSAGE)
+        st.stop()
+
+
+# 표 하나로 여러 행을 한 번에 추가/수정/삭제 (바뀐 행만 저장)
+def bulk_edit(table, df, column_config):
+    texts = EDIT_TABLES[table]
+    st.caption("행을 추가하거나 선택해서 삭제할 수 있습니다. 저장하면 바뀐 행만 반영됩니다.")
+    # 다른 사용자가 저장해서 데이터가 바뀌면 편집기를 새로 시작
+    # (편집 내용은 행 위치로 기억되므로 바뀐 데이터에 덮어쓰지 않도록)
+    edited = st.data_editor(
+        df,
+        key=f"{table}_editor_{df.attrs.get('version')}",
+        num_rows="dynamic",
+        hide_index=True,
+        column_order=list(column_config),
+        column_config=column_config,
+        use_container_width=True,
+    )
+    changes = diff_rows(df, edited)
+
+    if not changes.empty:
+        st.write(
+            ", ".join(
+                f"{label} {count}{texts['unit']}"
+                for label, count in changes.summary().items()
+            )
+        )
+    if st.button("변경사항 저장", disabled=changes.empty, key=f"save_{table}_bulk"):
+        error = check_edit(table, edited)
+        if error:
+            st.error(error)
+            return
+        _save(table, normalize(table, changes))
+        _saved(table, texts["saved"])
+
+
+# CSV/엑셀 파일로 여러 행을 한 번에 추가 (미리보기 확인 후 한 번에 저장)
+def file_import(table, df):
+    texts = EDIT_TABLES[table]
+    with st.expander("파일에서 한 번에 추가"):
+        st.caption(texts["import_help"])
+        # 가져온 뒤에는 업로드 위젯을 비우기 위해 키를 바꿈
+        round_key = f"{table}_import_round"
+        uploaded = st.file_uploader(
+            "CSV 또는 엑셀 파일",
+            type=["csv", "xlsx"],
+            key=f"{table}_import_{st.session_state.get(round_key, 0)}",
+        )
+        if uploaded is None:
+            return
+
+        try:
+            preview_df = preview(
+                table, uploaded, uploaded.name, df[IMPORT_TABLES[table]["name"]]
+            )
+        except ValueError as error:
+            st.error(str(error))
+            return
+
+        rows = valid_rows(preview_df)
+        errors = preview_df[preview_df["오류"] != ""]
+        st.write(
+            f"추가할 {texts['label']} {len(rows)}{texts['unit']}, 오류 {len(errors)}행"
+        )
+        if not errors.empty:
+            st.caption("오류가 있는 행은 추가하지 않습니다.")
+        st.dataframe(preview_df, hide_index=True, use_container_width=True)
+
+        if st.button(
+            f"{len(rows)}{texts['unit']} 추가", disabled=rows.empty, key=f"import_{table}"
+        ):
+            _save(table, inserted_rows(rows))
+            st.session_state[round_key] = st.session_state.get(round_key, 0) + 1
+            _saved(table, texts["added"].format(count=len(rows)))
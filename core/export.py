@@ -0,0 +1,83 @@
+import io
+
+from core import names
+
+# 엑셀 시트 이름에 쓸 수 없는 문자
+_INVALID_SHEET_CHARS = str.maketrans({c: "" for c in "[]:*?/\\"})
+
+
+def _sheet_title(name):
+    return str(name).translate(_INVALID_SHEET_CHARS)[:31]
+
+
+# 배치 하나를 엑셀로 (구역별 담당자 요약 + 전체 목록)
+def write_assignment_workbook(assignment_df, output):
+    # 구역/담당자는 id로 정렬하고 묶은 뒤 셀에 쓸 때만 이름으로 바꿈
+    assignment_df = names.categorize(assignment_df)
+    assignment_df = assignment_df.iloc[names.name_order(assignment_df["구역"])]
+
+    # openpyxl은 import가 느리므로 엑셀 파일을 만들 때 불러옴
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+
+    summary = workbook.create_sheet("청소구역배치")
+    summary.append(["구역", "담당자"])
+    for area, members in names.group_by_area(assignment_df).itertuples(
+        index=False, name=None
+    ):
+        summary.append([area, ", ".join(members)])
+
+    detail = workbook.create_sheet("전체배치목록")
+    # id 컬럼은 파일에 쓰지 않음
+    detail_df = assignment_df[["날짜", "구역", "담당자"]]
+    detail.append(list(detail_df.columns))
+    for row in detail_df.itertuples(index=False, name=None):
+        detail.append(list(row))
+
+    workbook.save(output)
+
+
+def assignment_to_excel_bytes(assignment_df):
+    output = io.BytesIO()
+    write_assignment_workbook(assignment_df, output)
+    return output.getvalue()
+
+
+# 여러 배치를 시트별로 나눠서 엑셀로 (배치 기록을 나눠 읽으면서 바로 기록)
+def write_history_workbook(chunks, output, group_by="batch"):
+    """chunks: 배치 기록 DataFrame 조각들 (backend.iter_assignments())
+
+    group_by="batch"이면 배치마다, "month"이면 월마다 시트 하나를 만든다.
+    openpyxl write_only 모드로 행을 바로 흘려 쓰므로 기간이 길어도
+    전체 기록을 메모리에 모으지 않는다. 반환값은 만든 시트 수.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheets = {}
+    if group_by == "month":
+        columns = ["날짜", "구역", "담당자"]
+    else:
+        columns = ["구역", "담당자"]
+
+    for chunk in chunks:
+        dates = chunk["날짜"].astype(str)
+        keys = dates.str[:7] if group_by == "month" else dates
+
+        for key, rows in chunk.groupby(keys, sort=False):
+            sheet = sheets.get(key)
+            if sheet is None:
+                sheet = workbook.create_sheet(_sheet_title(key))
+                sheet.append(columns)
+                sheets[key] = sheet
+
+            for row in rows[columns].itertuples(index=False, name=None):
+                sheet.append(list(row))
+
+    # 빈 통합 문서는 저장할 수 없으므로 안내 시트 추가
+    if not sheets:
+        workbook.create_sheet("배치기록").append(["해당 기간의 배치 기록이 없습니다."])
+
+    workbook.save(output)
+    return len(sheets)
@@ -0,0 +1,166 @@
+import codecs
+import contextlib
+import csv
+import os
+
+import pandas as pd
+
+# 파일로 한 번에 추가할 수 있는 테이블: 이름 컬럼(필수, 중복 불가)과
+# 선택 컬럼(없거나 빈 칸이면 기본값)
+IMPORT_TABLES = {
+    "members": {"name": "이름", "optional": {"활성": True}},
+    "areas": {"name": "구역명", "optional": {"필요인원": 1}},
+}
+
+_TRUE = {"true", "1", "y", "yes", "o", "예", "활성"}
+_FALSE = {"false", "0", "n", "no", "x", "아니오", "비활성"}
+
+
+def _blank(value):
+    return value is None or str(value).strip() == ""
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"활성은 예/아니오(True/False)로 입력하세요: {value}")
+
+
+def _to_count(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is None or not number.is_integer() or number < 1:
+        raise ValueError(f"필요인원은 1 이상의 정수로 입력하세요: {value}")
+    return int(number)
+
+
+_PARSERS = {"활성": _to_bool, "필요인원": _to_count}
+
+
+def _decoded_lines(f):
+    try:
+        yield from codecs.iterdecode(f, "utf-8-sig")
+    except UnicodeDecodeError as error:
+        raise ValueError("CSV 파일은 UTF-8로 저장해 주세요.") from error
+
+
+def _numbered(reader):
+    """CSV 레코드마다 (시작 줄 번호, 값 목록)
+
+    따옴표 안에 줄바꿈이 있는 레코드는 여러 줄을 차지하므로 csv.reader가
+    읽은 줄 수(line_num)로 다음 레코드의 시작 줄을 센다.
+    """
+    while True:
+        start = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        yield start, row
+
+
+def _header(rows):
+    _, header = next(rows, (None, None))
+    return ["" if name is None else str(name).strip() for name in header or []]
+
+
+@contextlib.contextmanager
+def open_rows(f, filename):
+    """업로드 파일을 한 행씩 읽기 - (헤더 목록, (줄 번호, 행) 반복자)
+
+    CSV는 줄 단위로 디코딩하며 읽고, 엑셀(.xlsx)은 read_only 모드로 첫
+    시트의 행을 차례로 읽으므로 파일 전체를 표 하나로 만들지 않는다.
+    read_only 모드의 엑셀 파일은 with 블록이 끝날 때 닫는다.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".xlsx":
+        # openpyxl은 import가 느리므로 엑셀 파일을 올렸을 때만 불러옴
+        from openpyxl import load_workbook
+
+        try:
+            workbook = load_workbook(f, read_only=True, data_only=True)
+        except Exception as error:
+            raise ValueError("엑셀 파일을 읽을 수 없습니다.") from error
+        try:
+            rows = enumerate(workbook.worksheets[0].iter_rows(values_only=True), 1)
+            yield _header(rows), rows
+        finally:
+            workbook.close()
+    elif extension == ".csv":
+        rows = _numbered(csv.reader(_decoded_lines(f)))
+        yield _header(rows), rows
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {extension}")
+
+
+def preview(table, f, filename, existing_names):
+    """가져올 파일을 행마다 검사한 미리보기 표
+
+    컬럼: 행(파일의 줄 번호), 이름 컬럼, 선택 컬럼, 오류(문제가 없으면 빈 문자열).
+    이름 중복은 기존 이름과 파일에서 앞서 읽은 이름을 담은 집합으로 확인하므로
+    행마다 전체 목록을 훑지 않는다. 헤더가 잘못되었거나 파일을 읽을 수 없으면
+    ValueError.
+    """
+    spec = IMPORT_TABLES[table]
+    name_column = spec["name"]
+    existing = set(existing_names)
+    seen = set()
+    records = []
+
+    with open_rows(f, filename) as (header, rows):
+        if name_column not in header:
+            raise ValueError(f"'{name_column}' 컬럼이 없습니다.")
+        positions = {
+            column: header.index(column)
+            for column in [name_column, *spec["optional"]]
+            if column in header
+        }
+
+        for number, row in rows:
+            values = {
+                column: row[i] if i < len(row) else None
+                for column, i in positions.items()
+            }
+            if all(_blank(value) for value in values.values()):
+                continue  # 빈 줄
+
+            name = "" if _blank(values[name_column]) else str(values[name_column]).strip()
+            record = {"행": number, name_column: name}
+            errors = []
+            if not name:
+                errors.append(f"{name_column}이(가) 비어 있습니다.")
+            elif name in existing:
+                errors.append("이미 등록되어 있습니다.")
+            elif name in seen:
+                errors.append("파일 안에서 중복됩니다.")
+            # 오류가 있는 행의 이름도 기록 (같은 이름이 뒤에 또 나오면 중복으로 표시)
+            seen.add(name)
+
+            for column, default in spec["optional"].items():
+                value = values.get(column)
+                record[column] = default
+                if not _blank(value):
+                    try:
+                        record[column] = _PARSERS[column](value)
+                    except ValueError as error:
+                        errors.append(str(error))
+
+            record["오류"] = " ".join(errors)
+            records.append(record)
+
+    return pd.DataFrame(
+        records, columns=["행", name_column, *spec["optional"], "오류"]
+    )
+
+
+def valid_rows(preview_df):
+    """미리보기에서 오류가 없는 행만 (저장할 컬럼만 남김)"""
+    rows = preview_df[preview_df["오류"] == ""]
+    return rows.drop(columns=["행", "오류"]).reset_index(drop=True)
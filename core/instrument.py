@@ -0,0 +1,172 @@
+import datetime
+import importlib.util
+import io
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from core import config, metrics
+
+
+class _Timings:
+    """이름별 최근 실행 시간 기록 (프로세스 전체 공유)
+
+    이름마다 최근 size개만 deque로 보관하므로 오래 실행해도 메모리가 늘지 않는다.
+    p50/p95는 조회할 때 보관 중인 값으로 계산한다.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._samples = {}  # 이름 -> 최근 실행 시간(초) deque
+        self._counts = {}  # 이름 -> 전체 호출 수
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.size)
+                self._counts[name] = 0
+            samples.append(seconds)
+            self._counts[name] += 1
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def summary(self):
+        """이름순 [{"name", "count", "samples", "p50", "p95", "max"}] (시간은 초)"""
+        with self._lock:
+            items = [
+                (name, sorted(samples), self._counts[name])
+                for name, samples in self._samples.items()
+            ]
+        return [
+            {
+                "name": name,
+                "count": count,
+                "samples": len(samples),
+                "p50": _percentile(samples, 0.50),
+                "p95": _percentile(samples, 0.95),
+                "max": samples[-1],
+            }
+            for name, samples, count in sorted(items)
+        ]
+
+
+def _percentile(ordered, q):
+    """정렬된 목록의 q 분위수 (nearest-rank)"""
+    rank = max(int(q * len(ordered) + 0.999999) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+_timings = _Timings(config.TIMING_SAMPLES)
+# 최근 프로파일 결과 (관리자 페이지에서 확인)
+_profiles = deque(maxlen=config.PROFILE_KEEP)
+
+
+@contextmanager
+def span(name):
+    """블록 실행 시간을 name으로 기록 (예외로 끝나도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings.record(name, time.perf_counter() - started)
+
+
+def timed(name=None):
+    """함수 실행 시간을 기록하는 데코레이터 (name이 없으면 함수 이름 사용)
+
+    운영 지표(metrics.OPERATION_SECONDS)에도 같은 시간을 기록한다.
+    """
+
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                _timings.record(label, seconds)
+                metrics.OPERATION_SECONDS.observe(seconds, operation=label)
+
+        return wrapper
+
+    return decorator
+
+
+def summary():
+    return _timings.summary()
+
+
+def reset():
+    _timings.reset()
+
+
+def available_profilers():
+    """사용할 수 있는 프로파일러 (pyinstrument는 설치된 경우만)"""
+    profilers = ["cProfile"]
+    if importlib.util.find_spec("pyinstrument") is not None:
+        profilers.append("pyinstrument")
+    return profilers
+
+
+@contextmanager
+def profile(name, profiler="cProfile", limit=40):
+    """블록 실행을 프로파일해서 결과 텍스트를 recent_profiles()에 추가
+
+    다른 프로파일러가 이미 실행 중이면 프로파일 없이 실행한다.
+    """
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        active = Profiler()
+        active.start()
+    else:
+        import cProfile
+
+        active = cProfile.Profile()
+        try:
+            active.enable()
+        except ValueError:
+            active = None
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        if active is not None:
+            if profiler == "pyinstrument":
+                active.stop()
+                text = active.output_text(unicode=True)
+            else:
+                import pstats
+
+                active.disable()
+                output = io.StringIO()
+                pstats.Stats(active, stream=output).sort_stats("cumulative").print_stats(
+                    limit
+                )
+                text = output.getvalue()
+            _profiles.appendleft(
+                {
+                    "name": name,
+                    "profiler": profiler,
+                    "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "seconds": seconds,
+                    "text": text,
+                }
+            )
+
+
+def recent_profiles():
+    """최근 프로파일 결과 (최신순) [{"name", "profiler", "time", "seconds", "text"}]"""
+    return list(_profiles)
@@ -0,0 +1,358 @@
+import atexit
+import bisect
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core import config, storage
+
+# 운영 지표 (Prometheus 텍스트 형식)
+# 기록은 잠금 안에서 숫자만 더하므로 항상 켜 두어도 부담이 적다.
+# 내보내기는 config.METRICS_PORT(HTTP 엔드포인트)와 config.METRICS_FILE
+# (주기적으로 다시 쓰는 파일, node_exporter textfile 수집기 등)로 설정한다.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 실행 시간(초)과 크기(바이트) 구간
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}  # 레이블 값 tuple -> 값
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += self._sample_lines()
+        return lines
+
+
+class Counter(_Metric):
+    """계속 늘어나기만 하는 값 (호출 수, 바이트 수 등)"""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def items(self):
+        """[(레이블 값 tuple, 값)]"""
+        with self._lock:
+            return sorted(self._values.items())
+
+    def _sample_lines(self):
+        items = self.items()
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """내보낼 때 func()로 계산하는 값 - func는 {레이블 값 tuple: 값}을 반환"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labels, func):
+        super().__init__(name, help, labels)
+        self.func = func
+
+    def _sample_lines(self):
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.func().items())
+        ]
+
+
+class Histogram(_Metric):
+    """구간별 관측 수와 합계 (레이블 값마다 [구간별 수..., 합계, 전체 수])"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=SECONDS_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                counts[index] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def _sample_lines(self):
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        lines = []
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labels, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key, [("le", "+Inf")])
+            lines.append(f"{self.name}_bucket{labels} {counts[-1]}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-2])}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+# 지표 목록
+PAGE_RENDERS = Counter("cleaning_page_renders_total", "페이지 실행 수", ["page"])
+PAGE_RENDER_SECONDS = Histogram(
+    "cleaning_page_render_seconds", "페이지 실행 시간(초)", ["page"]
+)
+OPERATION_SECONDS = Histogram(
+    "cleaning_operation_seconds",
+    "데이터 함수(불러오기/저장/배치 생성/내보내기) 실행 시간(초)",
+    ["operation"],
+)
+FILE_READS = Counter("cleaning_file_reads_total", "데이터 파일 읽기 수", ["table"])
+FILE_READ_BYTES = Counter(
+    "cleaning_file_read_bytes_total", "데이터 파일에서 읽은 바이트 수", ["table"]
+)
+FILE_WRITES = Counter("cleaning_file_writes_total", "데이터 파일 쓰기 수", ["table"])
+FILE_WRITE_BYTES = Counter(
+    "cleaning_file_write_bytes_total", "데이터 파일에 쓴 바이트 수", ["table"]
+)
+CACHE_REQUESTS = Counter(
+    "cleaning_cache_requests_total", "캐시 조회 수", ["cache", "result"]
+)
+EXPORT_BYTES = Histogram(
+    "cleaning_export_bytes", "내보낸 파일 크기(바이트)", ["kind"], BYTES_BUCKETS
+)
+LOGINS = Counter(
+    "cleaning_logins_total", "로그인 시도 수 (success, failure, blocked)", ["result"]
+)
+PASSWORD_CHECKS = Counter(
+    "cleaning_password_checks_total",
+    "비밀번호 변경 때 현재 비밀번호 확인 수 (success, failure, blocked)",
+    ["result"],
+)
+
+
+def _cache_hit_ratio():
+    totals = {}
+    for (cache, result), count in CACHE_REQUESTS.items():
+        hits, total = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (count if result == "hit" else 0), total + count)
+    return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+CACHE_HIT_RATIO = Gauge(
+    "cleaning_cache_hit_ratio",
+    "캐시 적중률 (프로세스 시작 이후)",
+    ["cache"],
+    _cache_hit_ratio,
+)
+
+
+def table_label(path):
+    """지표 레이블로 쓸 테이블 이름
+
+    파일 경로를 그대로 쓰면 Parquet 월 파일처럼 레이블 값이 끝없이 늘어나므로
+    정해진 이름만 쓴다. Parquet 월 파일은 모두 assignments, SQLite 파일은
+    sqlite(모든 테이블), 그 밖의 파일은 other.
+    """
+    path = os.path.abspath(path)
+    if os.path.dirname(path) == config.PARQUET_DIR:
+        return "assignments"
+    return {
+        config.MEMBERS_FILE: "members",
+        config.AREAS_FILE: "areas",
+        config.ASSIGNMENTS_FILE: "assignments",
+        config.USERS_FILE: "users",
+        config.ASSIGNMENT_TOMBSTONES_FILE: "assignment_tombstones",
+        config.ID_SEQUENCE_FILE: "id_sequences",
+        config.SQLITE_FILE: "sqlite",
+    }.get(path, "other")
+
+
+def record_read(path, size=None):
+    label = table_label(path)
+    FILE_READS.inc(table=label)
+    if size:
+        FILE_READ_BYTES.inc(size, table=label)
+
+
+def record_write(path, size=None):
+    label = table_label(path)
+    FILE_WRITES.inc(table=label)
+    if size:
+        FILE_WRITE_BYTES.inc(size, table=label)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+@contextmanager
+def time_page(page):
+    """페이지 한 번 실행 (st.rerun/st.stop 예외로 끝나도 기록)"""
+    PAGE_RENDERS.inc(page=page)
+    with _timer(PAGE_RENDER_SECONDS, page=page):
+        yield
+
+
+@contextmanager
+def _timer(histogram, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+def exposition():
+    """모든 지표를 Prometheus 텍스트 형식으로"""
+    lines = []
+    for metric in _registry:
+        lines += metric.expose()
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    for metric in _registry:
+        metric.reset()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = exposition().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 수집 요청마다 로그를 남기지 않음
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """/metrics를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    ).start()
+    return server
+
+
+def write_file(path):
+    """지표를 파일에 쓰기 (임시 파일에 쓴 뒤 교체하므로 수집기가 반쯤 쓴 파일을 읽지 않음)"""
+    path = os.path.abspath(path)
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(exposition())
+        # 기존 파일 권한(새 파일이면 umask 기준)으로 맞춰서 교체
+        # (mkstemp의 0600 그대로면 다른 사용자로 실행되는 수집기가 읽지 못함)
+        storage.replace_file(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _flush_periodically(path, interval, stop):
+    while not stop.wait(interval):
+        try:
+            write_file(path)
+        except OSError as error:
+            print(f"지표 파일 기록 실패: {error}", file=sys.stderr)
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters():
+    """설정된 내보내기(HTTP 엔드포인트, 파일) 시작 - 프로세스에서 한 번만
+
+    포트를 이미 다른 프로세스가 쓰고 있으면 HTTP 엔드포인트 없이 계속 실행한다.
+    """
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+    if config.METRICS_PORT:
+        try:
+            start_http_server(config.METRICS_PORT, config.METRICS_HOST)
+        except OSError as error:
+            print(
+                f"지표 HTTP 엔드포인트를 시작하지 못했습니다 "
+                f"({config.METRICS_HOST}:{config.METRICS_PORT}): {error}",
+                file=sys.stderr,
+            )
+
+    if config.METRICS_FILE:
+        os.makedirs(os.path.dirname(os.path.abspath(config.METRICS_FILE)), exist_ok=True)
+        stop = threading.Event()
+        threading.Thread(
+            target=_flush_periodically,
+            args=(config.METRICS_FILE, config.METRICS_FLUSH_INTERVAL, stop),
+            name="metrics-file",
+            daemon=True,
+        ).start()
+        # 종료할 때 마지막 값을 한 번 더 기록 (명령줄 도구처럼 짧게 실행한 경우)
+        atexit.register(lambda: (stop.set(), write_file(config.METRICS_FILE)))
@@ -0,0 +1,86 @@
+import pandas as pd
+
+from core import storage
+from core.backends import TABLES
+
+
+# 저장소 스키마 변경
+# 변경마다 이미 반영되었는지 데이터로 확인하므로 여러 번 실행해도 안전하다.
+
+
+def _retry(step, backend):
+    """다른 프로세스가 먼저 저장해서 충돌하면 다시 읽어서 재시도"""
+    while True:
+        try:
+            return step(backend)
+        except storage.WriteConflictError:
+            continue
+
+
+def _needs(df, *columns):
+    """컬럼이 없거나 빈 칸이 있으면 True"""
+    return any(column not in df.columns or df[column].isna().any() for column in columns)
+
+
+def _add_row_ids(backend, table):
+    """팀원/구역/사용자 행마다 정수 id 부여"""
+    df = backend.load(table)
+    if not _needs(df, "id"):
+        return
+
+    version = df.attrs.get("version")
+    if "id" not in df.columns:
+        df.insert(0, "id", None)
+    missing = df["id"].isna()
+    df.loc[missing, "id"] = backend.next_ids(table, int(missing.sum()))
+    df["id"] = df["id"].astype("int64")
+    backend.save(table, df[list(TABLES[table]["columns"])], expected_version=version)
+
+
+def _ids_by_name(backend, table, values, ids_of):
+    """이름 컬럼을 id로 변환 - ids_of(이름 -> id)에 없는 이름은 새 id 부여
+
+    이미 삭제된 팀원/구역도 기록에서 같은 id로 묶이도록 이름마다 하나씩 준다.
+    """
+    values = values.astype(str)
+    mapping = ids_of.to_dict()
+    unknown = [name for name in pd.unique(values) if name not in mapping]
+    if unknown:
+        mapping.update(zip(unknown, backend.next_ids(table, len(unknown))))
+    return values.map(mapping)
+
+
+def _add_assignment_ids(backend):
+    """배치 기록이 팀원/구역을 이름 대신 id로 가리키도록 id 컬럼 추가"""
+    backend.compact()
+    df = backend.load("assignments")
+    if not _needs(df, "구역_id", "담당자_id"):
+        return
+
+    version = df.attrs.get("version")
+    members = backend.load("members")
+    areas = backend.load("areas")
+
+    # 이미 id가 있는 행은 그대로 두고 빈 칸만 이름으로 찾아서 채움
+    for column, name_column, table, ids_of in (
+        ("구역_id", "구역", "areas", areas.set_index("구역명")["id"]),
+        ("담당자_id", "담당자", "members", members.set_index("이름")["id"]),
+    ):
+        ids = _ids_by_name(backend, table, df[name_column], ids_of)
+        df[column] = df[column].fillna(ids) if column in df.columns else ids
+        df[column] = df[column].astype("int64")
+
+    backend.save(
+        "assignments",
+        df[list(TABLES["assignments"]["columns"])],
+        expected_version=version,
+    )
+
+
+def migrate(backend):
+    """모든 스키마 변경 적용 (이미 반영된 것은 건너뜀)"""
+    for table in ("members", "areas", "users"):
+        if backend.exists(table):
+            _retry(lambda b: _add_row_ids(b, table), backend)
+    if backend.exists("assignments"):
+        _retry(_add_assignment_ids, backend)
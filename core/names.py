@@ -0,0 +1,111 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class NameDictionary:
+    """이름 <-> 정수 id(범주 코드) 사전 (프로세스 전체 공유, 추가만 됨)
+
+    같은 사전으로 만든 범주형 컬럼은 범주 목록이 같으므로 합치기, 묶기,
+    비교가 문자열 대신 정수 코드로 처리된다. 한 번 정한 id는 바뀌지 않으므로
+    사전이 커져도 기존 코드는 그대로 유효하다.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self.dtype = pd.CategoricalDtype([])
+        self._lock = threading.Lock()
+
+    def add(self, names):
+        """처음 보는 이름에 id 부여 후 현재 범주 타입 반환"""
+        new = [name for name in names if name not in self.ids]
+        if new:
+            with self._lock:
+                for name in new:
+                    if name not in self.ids:
+                        self.ids[name] = len(self.names)
+                        self.names.append(name)
+                self.dtype = pd.CategoricalDtype(list(self.names))
+        return self.dtype
+
+    def encode(self, values):
+        """값을 이 사전의 범주형 Series로 변환 (문자열 비교는 고유값마다 한 번만)"""
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            if series.dtype == self.dtype:
+                return series
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+
+        uniques = [str(name) for name in uniques]
+        dtype = self.add(uniques)
+
+        # 원래 코드 -> 사전 id 변환표 (마지막 칸은 빈 값(-1)용)
+        table = np.array([self.ids[name] for name in uniques] + [-1], dtype=np.int64)
+        return pd.Series(
+            pd.Categorical.from_codes(table[codes], dtype=dtype),
+            index=series.index,
+            name=series.name,
+        )
+
+    def decode(self, ids):
+        """id 목록을 이름 목록으로"""
+        return [self.names[i] for i in ids]
+
+
+# 팀원/구역 이름 사전
+MEMBERS = NameDictionary()
+AREAS = NameDictionary()
+
+
+def categorize(assignment_df):
+    """배치 기록의 구역/담당자 컬럼을 공유 사전의 범주형으로 변환
+
+    이미 현재 사전의 범주형이면 입력을 그대로 반환한다.
+    """
+    area_column, member_column = assignment_df["구역"], assignment_df["담당자"]
+    areas = AREAS.encode(area_column)
+    members = MEMBERS.encode(member_column)
+    if areas is area_column and members is member_column:
+        return assignment_df
+
+    df = assignment_df.copy(deep=False)
+    df["구역"] = areas
+    df["담당자"] = members
+    return df
+
+
+def name_order(column):
+    """범주형 컬럼을 이름 순으로 정렬하는 행 순서 (같은 이름은 기존 순서 유지)
+
+    이름 비교는 범주마다 한 번만 하고 행은 정수 순위로 정렬한다.
+    """
+    categories = column.cat.categories.to_numpy(dtype=str)
+    rank = np.empty(len(categories) + 1, dtype=np.int64)
+    rank[np.argsort(categories, kind="stable")] = np.arange(len(categories))
+    rank[-1] = len(categories)  # 빈 값은 맨 뒤
+    return np.argsort(rank[column.cat.codes.to_numpy()], kind="stable")
+
+
+def group_by_area(assignment_df):
+    """구역별 담당자 목록 (구역 이름 순, 담당자는 기록 순)
+
+    구역/담당자 id로 묶은 뒤 화면이나 파일에 쓸 때만 이름으로 바꾼다.
+    """
+    df = categorize(assignment_df)
+    member_ids = df["담당자"].cat.codes
+    grouped = member_ids.groupby(df["구역"].cat.codes.to_numpy(), sort=False).agg(list)
+
+    areas = pd.Series(
+        pd.Categorical.from_codes(grouped.index.to_numpy(), dtype=AREAS.dtype)
+    )
+    order = name_order(areas)
+    return pd.DataFrame(
+        {
+            "구역": AREAS.decode(grouped.index[order]),
+            "담당자": [MEMBERS.decode(grouped.iloc[i]) for i in order],
+        }
+    )
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class SlidingWindowLimiter:
+    """키마다 최근 window초 동안의 실패 횟수를 세는 제한기 (프로세스 전체 공유)
+
+    키마다 실패 시각을 deque로 보관하고 마지막 실패가 window초보다 오래된
+    키는 정리한다. 보관하는 키는 최대 max_keys개이며 넘치면 가장 오래 전에
+    실패한 키부터 버리므로 여러 아이디/주소로 시도해도 메모리가 늘지 않는다.
+    """
+
+    def __init__(self, limit, window, max_keys):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._failures = OrderedDict()  # 키 -> 실패 시각 deque (마지막 실패 순)
+        self._lock = threading.Lock()
+        self.blocked = 0  # 차단한 시도 수
+
+    def _evict(self, now):
+        """마지막 실패가 window보다 오래된 키와 개수 제한을 넘은 키 제거"""
+        cutoff = now - self.window
+        while self._failures:
+            key, times = next(iter(self._failures.items()))
+            if times[-1] > cutoff and len(self._failures) <= self.max_keys:
+                break
+            del self._failures[key]
+
+    def _recent(self, key, now):
+        times = self._failures.get(key)
+        if times is None:
+            return None
+        cutoff = now - self.window
+        while times and times[0] <= cutoff:
+            times.popleft()
+        return times
+
+    def retry_after(self, key, now=None):
+        """차단 중이면 다시 시도할 수 있을 때까지 남은 초, 아니면 0"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._evict(now)
+            times = self._recent(key, now)
+            if not times or len(times) < self.limit:
+                return 0
+            return times[0] + self.window - now
+
+    def record_block(self):
+        with self._lock:
+            self.blocked += 1
+
+    def record_failure(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            times = self._recent(key, now)
+            if times is None:
+                times = self._failures[key] = deque(maxlen=self.limit)
+            times.append(now)
+            self._failures.move_to_end(key)
+            self._evict(now)
+
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def stats(self, now=None):
+        """지표: 차단한 시도 수, 추적 중인 키 수, 현재 차단 중인 키 수"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._evict(now)
+            locked = sum(
+                1
+                for key in list(self._failures)
+                if len(self._recent(key, now)) >= self.limit
+            )
+            return {
+                "blocked": self.blocked,
+                "tracked": len(self._failures),
+                "locked": locked,
+            }
@@ -0,0 +1,369 @@
+import bisect
+import contextlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core import config, storage
+from core.backends import get_backend
+
+
+class RotationMatrix:
+    """팀원 x 구역 담당 이력 (담당 횟수, 최근 담당한 배치 순번)
+
+    배치 기록 전체를 다시 읽지 않고 배치가 추가/삭제될 때마다 갱신한다.
+    팀원과 구역은 id(담당자_id, 구역_id)로 구분하므로 이름이 바뀌어도
+    이력이 이어진다. 배치 순번은 배치 날짜 순서대로 0부터 매기며, 중간에 추가/삭제되면
+    뒤의 순번을 밀거나 당겨서 항상 빈틈이 없도록 유지한다.
+    칸마다 최근 담당 배치 순번을 config.ROTATION_RECENT_BATCHES개까지 최신순으로
+    보관해서, 마지막 담당 배치가 삭제되면 그다음 순번을 바로 쓴다.
+    """
+
+    def __init__(self, members=(), areas=(), counts=None, recent=None, batches=()):
+        self.members = list(members)
+        self.areas = list(areas)
+        self.member_index = {name: i for i, name in enumerate(self.members)}
+        self.area_index = {name: i for i, name in enumerate(self.areas)}
+
+        shape = (len(self.members), len(self.areas))
+        self.counts = np.zeros(shape, dtype=np.int32) if counts is None else counts
+        # 최근 담당한 배치 순번 (최신순, -1 = 없음)
+        self.recent = (
+            np.full(shape + (config.ROTATION_RECENT_BATCHES,), -1, dtype=np.int64)
+            if recent is None
+            else recent
+        )
+        self.batches = list(batches)
+        self.source_version = None
+
+    @property
+    def last_batch(self):
+        """마지막으로 담당한 배치 순번 (-1 = 담당한 적 없음)"""
+        return self.recent[..., 0]
+
+    @classmethod
+    def from_assignments(cls, assignments_df):
+        """배치 기록 전체로부터 새로 계산"""
+        matrix = cls()
+        if assignments_df.empty:
+            return matrix
+
+        # 배치 날짜 순서대로 순번 부여
+        matrix.batches, batch_idx = np.unique(
+            assignments_df["날짜"].astype(str).to_numpy(), return_inverse=True
+        )
+        matrix.batches = matrix.batches.tolist()
+
+        cells, valid = matrix._cells(assignments_df)
+        np.add.at(matrix.counts, cells, 1)
+        matrix._fill_recent(cells, batch_idx[valid])
+        return matrix
+
+    def copy(self):
+        matrix = RotationMatrix(
+            self.members,
+            self.areas,
+            self.counts.copy(),
+            self.recent.copy(),
+            self.batches,
+        )
+        matrix.source_version = self.source_version
+        return matrix
+
+    def _grow(self, members, areas):
+        """처음 보는 팀원/구역이 있으면 행과 열 추가"""
+        new_members = [m for m in dict.fromkeys(members) if m not in self.member_index]
+        new_areas = [a for a in dict.fromkeys(areas) if a not in self.area_index]
+        if not new_members and not new_areas:
+            return
+
+        for name in new_members:
+            self.member_index[name] = len(self.members)
+            self.members.append(name)
+        for name in new_areas:
+            self.area_index[name] = len(self.areas)
+            self.areas.append(name)
+
+        pad = ((0, len(new_members)), (0, len(new_areas)))
+        self.counts = np.pad(self.counts, pad)
+        self.recent = np.pad(self.recent, pad + ((0, 0),), constant_values=-1)
+
+    def _cells(self, batch_df):
+        """(팀원 번호 배열, 구역 번호 배열)과 그 칸에 해당하는 행 표시
+
+        처음 보는 팀원/구역은 행렬에 추가하고, id가 비어 있는 행은 뺀다.
+        """
+        members, areas = batch_df["담당자_id"], batch_df["구역_id"]
+        self._grow(members.dropna().unique().tolist(), areas.dropna().unique().tolist())
+        member_idx = _positions(members, self.member_index)
+        area_idx = _positions(areas, self.area_index)
+        valid = (member_idx >= 0) & (area_idx >= 0)
+        return (member_idx[valid], area_idx[valid]), valid
+
+    def _distinct(self, cells):
+        """같은 칸이 여러 번 나와도 한 번씩만 남긴 칸 목록"""
+        flat = np.unique(np.ravel_multi_index(cells, self.counts.shape))
+        return np.unravel_index(flat, self.counts.shape)
+
+    def _fill_recent(self, cells, batch_idx):
+        """칸마다 (칸, 배치 순번) 목록에서 최근 순번들로 recent를 새로 채우기"""
+        if not len(batch_idx):
+            return
+        depth = self.recent.shape[-1]
+        width = len(self.batches)
+        keys = np.unique(np.ravel_multi_index(cells, self.counts.shape) * width + batch_idx)
+        # 칸 내림차순, 칸 안에서는 최신순
+        cell, batch = np.divmod(keys[::-1], width)
+        rank = np.arange(len(cell)) - np.searchsorted(-cell, -cell)
+        keep = rank < depth
+
+        self.recent[np.unravel_index(np.unique(cell), self.counts.shape)] = -1
+        rows, cols = np.unravel_index(cell[keep], self.counts.shape)
+        self.recent[rows, cols, rank[keep]] = batch[keep]
+
+    def _push(self, cells, position):
+        """칸마다 새 배치 순번 추가 (최신순 유지, 넘치면 가장 오래된 순번 버림)"""
+        stack = self.recent[cells]
+        tracked = (stack >= 0).sum(axis=1)
+        # 보관 중인 순번이 전체 담당 횟수보다 적으면(오래된 순번을 버린 칸)
+        # 가장 오래된 보관 순번보다 과거인 배치는 보관하지 않음
+        complete = tracked >= self.counts[cells]
+        oldest = stack[np.arange(len(stack)), np.maximum(tracked - 1, 0)]
+        keep = complete | ((tracked > 0) & (position > oldest))
+
+        merged = np.concatenate(
+            [stack[keep], np.full((keep.sum(), 1), position)], axis=1
+        )
+        merged = -np.sort(-merged, axis=1)[:, : stack.shape[1]]
+        self.recent[cells[0][keep], cells[1][keep]] = merged
+
+    def add_batch(self, batch_df):
+        """새 배치 반영 (보통은 가장 최근 배치로 끝에 추가됨)"""
+        if batch_df.empty:
+            return
+        for date, rows in batch_df.groupby("날짜", sort=True):
+            date = str(date)
+            position = bisect.bisect_left(self.batches, date)
+            if position == len(self.batches) or self.batches[position] != date:
+                # 과거 날짜 배치가 중간에 들어오면 뒤쪽 순번을 한 칸씩 밀기
+                if position < len(self.batches):
+                    self.recent[self.recent >= position] += 1
+                self.batches.insert(position, date)
+
+            cells, _ = self._cells(rows)
+            self._push(self._distinct(cells), position)
+            np.add.at(self.counts, cells, 1)
+
+    def remove_batch(self, date, batch_df, load_history):
+        """배치 삭제 반영
+
+        삭제된 배치 순번을 칸마다 보관 중인 최근 순번에서 빼므로 보통은 배치
+        기록을 다시 읽지 않는다. 담당 횟수가 남았는데 보관 중인 순번이 모두
+        삭제된 칸이 있을 때만 남은 기록(load_history())에서 그 칸들을 다시 채운다.
+        """
+        date = str(date)
+        removed = bisect.bisect_left(self.batches, date)
+        if removed == len(self.batches) or self.batches[removed] != date:
+            return
+
+        cells, _ = self._cells(batch_df)
+        np.subtract.at(self.counts, cells, 1)
+
+        cells = self._distinct(cells)
+        stack = self.recent[cells]
+        stack[stack == removed] = -1
+        self.recent[cells] = -np.sort(-stack, axis=1)
+
+        # 뒤쪽 배치 순번 당기기
+        del self.batches[removed]
+        self.recent[self.recent > removed] -= 1
+
+        lost = (self.recent[cells][:, 0] < 0) & (self.counts[cells] > 0)
+        if lost.any():
+            affected = np.zeros(self.counts.shape, dtype=bool)
+            affected[cells[0][lost], cells[1][lost]] = True
+
+            history_df = load_history()
+            history_cells, valid = self._cells(history_df)
+            batch_idx = (
+                history_df["날짜"][valid]
+                .astype(str)
+                .map({d: i for i, d in enumerate(self.batches)})
+                .fillna(-1)
+                .to_numpy(dtype=np.int64)
+            )
+            rows = affected[history_cells] & (batch_idx >= 0)
+            self._fill_recent(
+                (history_cells[0][rows], history_cells[1][rows]), batch_idx[rows]
+            )
+
+    # 조회 (칸 하나당 O(1))
+    def count(self, member, area):
+        i = self.member_index.get(member)
+        j = self.area_index.get(area)
+        if i is None or j is None:
+            return 0
+        return int(self.counts[i, j])
+
+    def batches_ago(self, member, area):
+        """몇 배치 전에 마지막으로 담당했는지 (0 = 가장 최근 배치, 없으면 None)"""
+        i = self.member_index.get(member)
+        j = self.area_index.get(area)
+        if i is None or j is None or self.last_batch[i, j] < 0:
+            return None
+        return len(self.batches) - 1 - int(self.last_batch[i, j])
+
+    def submatrix(self, members, areas):
+        """주어진 팀원/구역 순서의 (담당 횟수, 몇 배치 전 담당) 배열
+
+        담당한 적 없는 칸의 '몇 배치 전'은 inf.
+        """
+        member_idx = np.array([self.member_index.get(m, -1) for m in members], dtype=int)
+        area_idx = np.array([self.area_index.get(a, -1) for a in areas], dtype=int)
+        shape = (len(members), len(areas))
+        if not self.counts.size:
+            return np.zeros(shape), np.full(shape, np.inf)
+
+        # 행/열을 한 번에 골라 읽고, 없는 팀원/구역(-1 번째를 읽은 줄)은 지움
+        # (열 선택은 take로 해야 결과가 행 우선 배열이 되어 행 단위 계산이 빠름)
+        counts = self.counts[member_idx].take(area_idx, axis=1).astype(float)
+        last = self.last_batch[member_idx].take(area_idx, axis=1)
+        counts[member_idx < 0] = 0
+        counts[:, area_idx < 0] = 0
+        last[member_idx < 0] = -1
+        last[:, area_idx < 0] = -1
+
+        # 순번 -> 몇 배치 전 (순번 -1은 표의 마지막 칸 inf를 읽음)
+        ago = np.arange(len(self.batches) - 1, -2, -1, dtype=float)
+        ago[-1] = np.inf
+        return counts, ago[last]
+
+    def to_frame(self, members=None, areas=None):
+        """담당 횟수 표 (행: 팀원, 열: 구역)"""
+        members = self.members if members is None else list(members)
+        areas = self.areas if areas is None else list(areas)
+        counts, _ = self.submatrix(members, areas)
+        return pd.DataFrame(counts.astype(int), index=members, columns=areas)
+
+    # 파일 저장/불러오기
+    def save(self, path):
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    members=np.array(self.members, dtype=np.int64),
+                    areas=np.array(self.areas, dtype=np.int64),
+                    counts=self.counts,
+                    recent=self.recent,
+                    batches=np.array(self.batches, dtype=str),
+                    source_version=np.array(json.dumps(self.source_version)),
+                )
+            storage.replace_file(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            shape = (len(data["members"]), len(data["areas"]))
+            # 이름으로 구분하던 이전 형식이면 ValueError, 최근 순번이 없는 이전
+            # 형식이면 KeyError, 보관 순번 수 설정이 바뀌었으면 ValueError -> 다시 계산
+            matrix = cls(
+                data["members"].astype(np.int64).tolist(),
+                data["areas"].astype(np.int64).tolist(),
+                data["counts"].reshape(shape),
+                data["recent"].reshape(shape + (config.ROTATION_RECENT_BATCHES,)),
+                data["batches"].tolist(),
+            )
+            matrix.source_version = json.loads(str(data["source_version"]))
+        return matrix
+
+
+def _positions(column, index):
+    """id 컬럼의 각 행을 index(id -> 행렬 번호)로 변환, 없는 id는 -1
+
+    사전 조회는 고유한 id마다 한 번만 하고 행은 정수 배열로 변환한다.
+    """
+    codes, uniques = pd.factorize(column)
+    table = np.array(
+        [index.get(key, -1) for key in uniques.tolist()] + [-1], dtype=np.int64
+    )
+    return table[codes]
+
+
+# 프로세스 전체에서 공유하는 현재 행렬
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def _current_version():
+    # 파일 버전 튜플은 JSON으로 저장하면 리스트가 되므로 같은 형태로 맞춤
+    return json.loads(json.dumps(get_backend().history_version()))
+
+
+def _load_or_rebuild(version):
+    """저장된 행렬이 현재 배치 기록과 맞으면 불러오고, 아니면 새로 계산"""
+    if os.path.exists(config.ROTATION_FILE):
+        try:
+            matrix = RotationMatrix.load(config.ROTATION_FILE)
+            if matrix.source_version == version:
+                return matrix, False
+        except (OSError, ValueError, KeyError):
+            pass
+
+    matrix = RotationMatrix.from_assignments(get_backend().load("assignments"))
+    matrix.source_version = version
+    return matrix, True
+
+
+def get_matrix():
+    """현재 배치 기록에 맞는 담당 이력 행렬 (읽기 전용으로 사용)"""
+    global _matrix
+    version = _current_version()
+    matrix = _matrix
+    if matrix is not None and matrix.source_version == version:
+        return matrix
+
+    with storage.write_lock(config.ROTATION_FILE):
+        matrix, rebuilt = _load_or_rebuild(_current_version())
+        if rebuilt:
+            matrix.save(config.ROTATION_FILE)
+
+    with _matrix_lock:
+        _matrix = matrix
+    return matrix
+
+
+@contextlib.contextmanager
+def updating():
+    """배치 기록을 바꾸는 동안 행렬도 함께 갱신
+
+    with 블록 안에서 배치 기록을 바꾸고 넘겨받은 행렬에 같은 변경을
+    반영하면, 블록이 끝날 때 새 배치 기록 버전과 함께 저장된다.
+    잠금을 잡고 있으므로 다른 세션/프로세스의 갱신과 섞이지 않는다.
+    """
+    global _matrix
+    with storage.write_lock(config.ROTATION_FILE):
+        version = _current_version()
+        current = _matrix
+        if current is None or current.source_version != version:
+            current, _ = _load_or_rebuild(version)
+
+        # 읽는 쪽이 갱신 중인 배열을 보지 않도록 복사본을 고쳐서 교체
+        matrix = current.copy()
+        yield matrix
+
+        matrix.source_version = _current_version()
+        matrix.save(config.ROTATION_FILE)
+
+    with _matrix_lock:
+        _matrix = matrix
@@ -0,0 +1,225 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+
+# 배치 하나의 공정성 점수 (낮을수록 좋음)
+def objective(cost, weight, base_load, need, area_of, balance_penalty, headcount_penalty):
+    """반복 담당 비용 + 누적 부담 편차 + 필요인원과의 차이
+
+    - 반복 담당: 팀원 x 구역 이력 비용의 합
+    - 부담 편차: (이전 누적 부담 + 이번 부담)의 편차 제곱합
+    - 인원 차이: 구역별 배치 인원과 필요인원 차이의 합
+    """
+    members = np.arange(len(area_of))
+    repeat = cost[members, area_of].sum()
+
+    load = base_load + weight[area_of]
+    balance = ((load - load.mean()) ** 2).sum()
+
+    headcount = np.abs(np.bincount(area_of, minlength=len(need)) - need).sum()
+    return repeat + balance_penalty * balance + headcount_penalty * headcount
+
+
+def _initial(slot_areas, num_members, rng):
+    """자리를 무작위로 섞어서 앞에서부터 팀원에게 배정"""
+    return rng.permutation(slot_areas)[:num_members].copy()
+
+
+def _improve(area_of, cost, weight, base_load, need, iterations, rng, penalties, deadline):
+    """교환(두 팀원의 구역 맞바꾸기)과 이동(한 팀원을 다른 구역으로) 중
+    점수가 좋아지는 것만 받아들이는 지역 탐색"""
+    balance_penalty, headcount_penalty = penalties
+    n = len(area_of)
+    m = len(need)
+
+    load = base_load + weight[area_of]
+    total = load.sum()
+    squares = (load**2).sum()
+    counts = np.bincount(area_of, minlength=m)
+
+    # 이동 종류와 대상은 미리 한 번에 뽑아 둠
+    moves = rng.integers(0, 2, size=iterations)
+    first = rng.integers(0, n, size=iterations)
+    second = rng.integers(0, max(n, m), size=iterations)
+
+    for step in range(iterations):
+        # 시간 확인은 일정 횟수마다만
+        if step % 256 == 0 and time.monotonic() > deadline:
+            break
+
+        i = first[step]
+        a = area_of[i]
+
+        if moves[step] == 0:
+            # 교환: 전체 부담 합은 그대로이므로 제곱합 변화만 보면 됨
+            j = second[step] % n
+            b = area_of[j]
+            if a == b:
+                continue
+            delta = cost[i, b] + cost[j, a] - cost[i, a] - cost[j, b]
+            new_i = load[i] - weight[a] + weight[b]
+            new_j = load[j] - weight[b] + weight[a]
+            delta_squares = new_i**2 + new_j**2 - load[i] ** 2 - load[j] ** 2
+            delta += balance_penalty * delta_squares
+
+            if delta < -1e-12:
+                area_of[i], area_of[j] = b, a
+                load[i], load[j] = new_i, new_j
+                squares += delta_squares
+        else:
+            # 이동: 구역별 인원이 바뀌므로 인원 차이도 함께 계산
+            b = second[step] % m
+            if a == b:
+                continue
+            new_i = load[i] - weight[a] + weight[b]
+            new_total = total - weight[a] + weight[b]
+            new_squares = squares - load[i] ** 2 + new_i**2
+            balance_delta = (new_squares - new_total**2 / n) - (squares - total**2 / n)
+            headcount_delta = (
+                abs(counts[a] - 1 - need[a])
+                - abs(counts[a] - need[a])
+                + abs(counts[b] + 1 - need[b])
+                - abs(counts[b] - need[b])
+            )
+            delta = (
+                cost[i, b]
+                - cost[i, a]
+                + balance_penalty * balance_delta
+                + headcount_penalty * headcount_delta
+            )
+
+            if delta < -1e-12:
+                area_of[i] = b
+                load[i] = new_i
+                total, squares = new_total, new_squares
+                counts[a] -= 1
+                counts[b] += 1
+
+    return area_of
+
+
+def _search_worker(task):
+    """작업자 하나: 무작위 시작점 여러 개에서 지역 탐색 후 가장 좋은 결과 반환"""
+    (
+        cost,
+        weight,
+        base_load,
+        need,
+        slot_areas,
+        seed_sequence,
+        restarts,
+        iterations,
+        time_budget,
+        penalties,
+    ) = task
+    rng = np.random.default_rng(seed_sequence)
+    deadline = time.monotonic() + time_budget
+
+    best_score, best = np.inf, None
+    for _ in range(restarts):
+        area_of = _initial(slot_areas, len(cost), rng)
+        area_of = _improve(
+            area_of, cost, weight, base_load, need, iterations, rng, penalties, deadline
+        )
+        score = objective(cost, weight, base_load, need, area_of, *penalties)
+        if score < best_score:
+            best_score, best = score, area_of
+        if time.monotonic() > deadline:
+            break
+
+    return best_score, best
+
+
+# 작업자 프로세스 풀 (처음 탐색할 때 만들고 같은 작업자 수면 계속 재사용)
+# 앱은 여러 스레드(세션, 지표 기록 등)가 도는 프로세스라서 fork하면 다른
+# 스레드가 잡고 있던 잠금이 복사되어 작업자가 멈출 수 있으므로 spawn으로 시작
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    """작업자 프로세스 풀 종료 (다음 탐색 때 새로 만듦)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def search_assignment(
+    cost,
+    weight,
+    base_load,
+    need,
+    slot_areas,
+    seed,
+    workers,
+    restarts,
+    iterations,
+    time_budget,
+    balance_penalty,
+    headcount_penalty,
+):
+    """여러 작업자 프로세스에서 후보를 찾아 가장 좋은 배치 반환
+
+    seed는 정수나 np.random.SeedSequence. 작업자마다 seed에서 나눈 독립
+    난수열을 사용하므로, 시간 제한에 걸리지 않으면 같은 seed와 작업자 수에
+    대해 항상 같은 결과가 나온다.
+    반환값: (팀원별 구역 번호 배열, 점수)
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(workers)
+    penalties = (balance_penalty, headcount_penalty)
+    tasks = [
+        (
+            cost,
+            weight,
+            base_load,
+            need,
+            slot_areas,
+            seed_sequence,
+            restarts,
+            iterations,
+            time_budget,
+            penalties,
+        )
+        for seed_sequence in seeds
+    ]
+
+    if workers == 1:
+        results = [_search_worker(task) for task in tasks]
+    else:
+        try:
+            results = list(_get_pool(workers).map(_search_worker, tasks))
+        except BrokenProcessPool:
+            # 작업자 프로세스가 비정상 종료된 풀은 버리고 한 번 더 시도
+            shutdown_pool()
+            results = list(_get_pool(workers).map(_search_worker, tasks))
+
+    # 점수가 같으면 앞 작업자의 결과를 사용 (결과 재현용)
+    best_score, best = min(results, key=lambda result: result[0])
+    return best, best_score
@@ -0,0 +1,257 @@
+import datetime
+import os
+
+import pandas as pd
+
+from core import (
+    assignment,
+    auth,
+    batches,
+    bootstrap,
+    config,
+    export,
+    metrics,
+    names,
+    rotation,
+)
+from core.backends import get_backend
+from core.instrument import timed
+from core.storage import WriteConflictError
+
+# 화면(Streamlit)과 상관없이 쓰는 데이터/배치 함수 모음
+# 앱 페이지와 명령줄 도구가 함께 사용하며, import해도 Streamlit을 불러오거나
+# 파일을 만드는 등의 부수 효과가 없다.
+# 불러오기/저장/생성/내보내기 함수는 실행 시간을 core.instrument에 기록한다.
+
+
+# 배치 기록 컬럼 (구역/담당자는 기록 당시 이름, 팀원/구역은 id로 구분)
+ASSIGNMENT_COLUMNS = ["날짜", "구역", "담당자", "구역_id", "담당자_id"]
+
+
+# 데이터 초기화 (데이터 폴더, 기본 데이터, 스키마 변환 - 프로세스마다 한 번만 실행)
+def initialize_data():
+    bootstrap.ensure_ready()
+
+
+# 데이터 로드 (설정된 저장소 사용)
+@timed()
+def load_members():
+    return get_backend().load("members")
+
+
+@timed()
+def load_areas():
+    return get_backend().load("areas")
+
+
+@timed()
+def load_assignments():
+    return get_backend().load("assignments")
+
+
+@timed()
+def load_assignment_batch(date):
+    return get_backend().load_batch(date)
+
+
+# 배치 목록 (배치 번호, 날짜, 인원, 구역 수)
+def load_batch_index():
+    return batches.get_batch_index()
+
+
+# 배치 목록 한 페이지 (최신순, before 커서 이전부터)
+@timed()
+def list_assignment_batches(
+    start=None, end=None, member=None, area=None, before=None, limit=20
+):
+    # 날짜 컬럼은 "YYYY-MM-DD HH:MM:SS" 문자열이므로 문자열 범위로 비교
+    start_key = f"{start:%Y-%m-%d}" if start else None
+    end_key = f"{end + datetime.timedelta(days=1):%Y-%m-%d}" if end else None
+    return batches.list_batches(start_key, end_key, member, area, before, limit)
+
+
+@timed()
+def load_users():
+    return get_backend().load("users")
+
+
+# 데이터 저장
+# expected_version(불러올 때의 df.attrs["version"])을 주면 그 사이 다른 사용자가
+# 먼저 저장한 경우 덮어쓰지 않고 WriteConflictError를 발생시킴
+@timed()
+def save_members(members_df, expected_version=None):
+    get_backend().save("members", members_df, expected_version)
+
+
+@timed()
+def save_areas(areas_df, expected_version=None):
+    get_backend().save("areas", areas_df, expected_version)
+
+
+@timed()
+def save_assignments(assignments_df, expected_version=None):
+    get_backend().save("assignments", assignments_df, expected_version)
+
+
+@timed()
+def save_users(users_df, expected_version=None):
+    get_backend().save("users", users_df, expected_version)
+    # 로그인용 username 색인 다시 만들기
+    auth.invalidate()
+
+
+# 편집 결과에서 바뀐 행만 저장 (changes: core.changes.diff_rows 결과)
+# 새 행에는 id를 주고, 편집하는 동안 다른 사용자가 같은 행을 바꿨으면
+# WriteConflictError
+@timed()
+def save_changes(table, changes):
+    inserted = changes.inserted
+    missing = inserted["id"].isna()
+    if missing.any():
+        inserted.loc[missing, "id"] = next_ids(table, int(missing.sum()))
+    inserted["id"] = inserted["id"].astype("int64")
+    get_backend().apply_changes(table, changes)
+    if table == "users":
+        # 로그인용 username 색인 다시 만들기
+        auth.invalidate()
+
+
+# 새 행에 줄 id (삭제된 id는 다시 쓰지 않음)
+def next_ids(table, count=1):
+    return get_backend().next_ids(table, count)
+
+
+# 배치 기록 추가 (기존 기록은 다시 쓰지 않고 끝에 추가)
+@timed()
+def append_assignments(new_assignments_df):
+    with rotation.updating() as matrix:
+        get_backend().append("assignments", new_assignments_df)
+        matrix.add_batch(new_assignments_df)
+
+
+# 배치 기록 삭제
+@timed()
+def delete_assignment_batch(date):
+    with rotation.updating() as matrix:
+        batch_df = load_assignment_batch(date)
+        get_backend().delete_batch(date)
+        matrix.remove_batch(date, batch_df, load_assignments)
+
+
+# 팀원 x 구역 담당 이력 (횟수, 최근 담당 배치)
+def load_rotation_matrix():
+    return rotation.get_matrix()
+
+
+# id로 만든 배치에 현재 팀원/구역 이름 붙이기 (id로 색인한 표에서 조회)
+def attach_names(batch_df, members_df, areas_df):
+    member_names = members_df.set_index("id")["이름"]
+    area_names = areas_df.set_index("id")["구역명"]
+    named = batch_df.assign(
+        구역=batch_df["구역_id"].map(area_names),
+        담당자=batch_df["담당자_id"].map(member_names),
+    )
+    return names.categorize(named[ASSIGNMENT_COLUMNS])
+
+
+# 자동 배치 생성
+@timed()
+def generate_assignment(engine=None):
+    members_df = load_members()
+    areas_df = load_areas()
+
+    # 활성 상태인 멤버만 선택
+    active_members = members_df[members_df["활성"] == True]["id"].tolist()
+
+    # 담당 이력을 반영해서 같은 일을 반복하지 않도록 배치
+    pairs = assignment.run_engine(
+        engine or config.ASSIGNMENT_ENGINE,
+        active_members,
+        areas_df,
+        load_rotation_matrix(),
+    )
+
+    current_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    new_assignments_df = attach_names(
+        pd.DataFrame(
+            [
+                {"날짜": current_date, "구역_id": area, "담당자_id": member}
+                for area, member in pairs
+            ],
+            columns=["날짜", "구역_id", "담당자_id"],
+        ),
+        members_df,
+        areas_df,
+    )
+
+    # 새 배치 저장
+    append_assignments(new_assignments_df)
+
+    return new_assignments_df
+
+
+# 기간 배치 생성 (여러 날짜를 한 번에 생성해서 한 번에 저장)
+@timed()
+def generate_assignments_for_dates(dates, engine=None):
+    members_df = load_members()
+    areas_df = load_areas()
+    active_members = members_df[members_df["활성"] == True]["id"].tolist()
+
+    # 이미 배치가 있는 날짜는 건너뜀
+    history = load_rotation_matrix()
+    existing = set(history.batches)
+    batch_dates = [
+        f"{day:%Y-%m-%d} {config.PLAN_BATCH_TIME}"
+        for day in dates
+        if f"{day:%Y-%m-%d} {config.PLAN_BATCH_TIME}" not in existing
+    ]
+
+    new_assignments_df = attach_names(
+        assignment.plan_batches(
+            batch_dates,
+            active_members,
+            areas_df,
+            history,
+            engine or config.ASSIGNMENT_ENGINE,
+            candidates=config.PLAN_CANDIDATES,
+        ),
+        members_df,
+        areas_df,
+    )
+
+    # 새 배치 저장
+    if not new_assignments_df.empty:
+        append_assignments(new_assignments_df)
+
+    return new_assignments_df
+
+
+# 배치표 내보내기
+@timed()
+def export_assignment_to_excel(assignment_df):
+    data = export.assignment_to_excel_bytes(assignment_df)
+    metrics.EXPORT_BYTES.observe(len(data), kind="batch")
+    return data
+
+
+# 기간 배치 기록 내보내기 (배치별 또는 월별 시트, 기록을 나눠 읽으며 기록)
+# 배치별 시트가 config.EXPORT_MAX_BATCH_SHEETS개를 넘으면 월별 시트로 내보냄
+# 반환값: (시트 수, 실제 시트 구분)
+@timed()
+def export_history_to_excel(output, start=None, end=None, group_by="batch"):
+    # 날짜 컬럼은 "YYYY-MM-DD HH:MM:SS" 문자열이므로 문자열 범위로 비교
+    start_key = f"{start:%Y-%m-%d}" if start else None
+    end_key = f"{end + datetime.timedelta(days=1):%Y-%m-%d}" if end else None
+
+    if (
+        group_by == "batch"
+        and batches.count_batches(start_key, end_key) > config.EXPORT_MAX_BATCH_SHEETS
+    ):
+        group_by = "month"
+
+    chunks = get_backend().iter_assignments(start_key, end_key)
+    sheets = export.write_history_workbook(chunks, output, group_by)
+    # output은 파일 경로나 쓰기용 파일 객체
+    size = os.path.getsize(output) if isinstance(output, str) else output.tell()
+    metrics.EXPORT_BYTES.observe(size, kind="history")
+    return sheets, group_by
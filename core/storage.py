@@ -0,0 +1,228 @@
+import contextlib
+import os
+import stat
+import tempfile
+import threading
+
+import pandas as pd
+
+from core import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 프로세스 내부 잠금만 사용
+    fcntl = None
+
+# 파싱된 CSV 캐시 (프로세스 전체 공유)
+# {절대 경로: (파일 버전, DataFrame, 아직 붙이지 않은 추가 행 DataFrame 튜플)}
+_cache = {}
+_cache_lock = threading.Lock()
+
+# 파일별 쓰기 잠금 (같은 프로세스의 여러 세션 간)
+_write_locks = {}
+
+# 새 파일 권한에 적용할 umask (읽으려면 잠시 바꿔야 하므로 스레드가 생기기 전인
+# import 때 한 번만 읽음)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class WriteConflictError(Exception):
+    """불러온 뒤 다른 사용자가 먼저 파일을 바꿔서 저장하지 않았음"""
+
+
+def file_version(path):
+    """파일 변경 감지용 버전 (수정 시각, 크기, inode). 파일이 없으면 None"""
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+
+def replace_file(temp_path, path):
+    """임시 파일로 path를 한 번에 교체
+
+    mkstemp로 만든 임시 파일은 권한이 0600이므로, 교체 전에 기존 파일의 권한
+    (새 파일이면 umask를 적용한 0666)으로 맞춰서 다른 계정/프로세스(백업 등)가
+    계속 읽을 수 있게 한다.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(temp_path, mode)
+    os.replace(temp_path, path)
+
+
+@contextlib.contextmanager
+def write_lock(path):
+    """쓰기 잠금 - 프로세스 내부는 threading.Lock, 프로세스 간은 flock
+
+    읽기는 잠금을 잡지 않는다. 쓰기는 항상 임시 파일 교체나 한 번의
+    append로 이뤄지므로 읽는 쪽이 반쯤 쓰인 파일을 보지 않는다.
+    """
+    key = os.path.abspath(path)
+    with _cache_lock:
+        lock = _write_locks.setdefault(key, threading.Lock())
+
+    with lock:
+        if fcntl is None:
+            yield
+            return
+
+        with open(key + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_csv_versioned(path, prepare=None):
+    """CSV 읽기 - (파일 버전, DataFrame) 반환
+
+    파일이 바뀌지 않았으면 캐시된 결과를 사용한다. prepare(df)를 주면
+    파싱 직후 한 번 적용한 결과를 캐시한다 (범주형 변환 등). append_csv로
+    추가된 행은 다음에 읽을 때 한 번에 붙인다.
+
+    반환하는 DataFrame은 캐시와 데이터를 공유하는 얕은 복사본이다. pandas의
+    copy-on-write로 값을 바꾸는 순간 따로 복사되므로 캐시는 바뀌지 않지만,
+    .values/.to_numpy()로 얻은 배열을 직접 고치면 캐시까지 바뀌므로 그렇게
+    쓰지 말아야 한다.
+    """
+    key = os.path.abspath(path)
+
+    # 파싱 전에 버전을 먼저 확인해야 파싱 도중 파일이 바뀌어도
+    # 다음 호출에서 다시 읽게 됨
+    version = file_version(key)
+    with _cache_lock:
+        entry = _cache.get(key)
+
+    hit = entry is not None and entry[0] == version
+    metrics.record_cache("csv", hit)
+    if not hit:
+        df = pd.read_csv(key, encoding="utf-8-sig")
+        metrics.record_read(key, version[1] if version else None)
+        entry = (version, prepare(df) if prepare else df, ())
+        with _cache_lock:
+            _cache[key] = entry
+    elif entry[2] or prepare:
+        # append_csv로 추가된 행은 여기서 한 번에 붙이고, 캐시한 뒤 prepare
+        # 결과가 달라졌으면 (이름 사전 확장 등) 캐시도 갱신
+        df = _merge(entry[1], entry[2], prepare)
+        if df is not entry[1]:
+            merged = (version, df, ())
+            with _cache_lock:
+                if _cache.get(key) is entry:
+                    _cache[key] = merged
+            entry = merged
+
+    # 행/열 추가나 attrs 변경이 캐시에 남지 않도록 얕은 복사본 반환
+    # (데이터는 copy-on-write로 바꿀 때만 복사됨)
+    return entry[0], entry[1].copy(deep=False)
+
+
+def _merge(df, appended, prepare=None):
+    """캐시된 DataFrame 뒤에 append_csv로 추가된 행들을 붙이기"""
+    if prepare:
+        # 같은 범주 타입끼리 합쳐야 범주형이 유지됨
+        # (새 행에서 사전이 커질 수 있으므로 새 행 먼저 변환)
+        appended = [prepare(part) for part in appended]
+        df = prepare(df)
+    if not appended:
+        return df
+
+    parts = list(appended) if df.empty else [df, *appended]
+    if len(parts) == 1:
+        return parts[0].reset_index(drop=True)
+    return pd.concat(parts, ignore_index=True)
+
+
+def read_csv(path, prepare=None):
+    """CSV 읽기 - 파일이 바뀌지 않았으면 캐시된 결과의 얕은 복사본을 반환"""
+    return read_csv_versioned(path, prepare)[1]
+
+
+def write_csv(path, df, expected_version=None, prepare=None):
+    """CSV 저장 후 캐시를 새 내용으로 갱신
+
+    임시 파일에 쓴 뒤 rename으로 교체하므로 읽는 쪽은 항상 이전 파일이나
+    새 파일 중 하나를 온전히 보게 된다. expected_version을 주면 현재 파일
+    버전이 같을 때만 저장하고, 다르면 WriteConflictError를 발생시킨다.
+    """
+    key = os.path.abspath(path)
+
+    with write_lock(key):
+        if expected_version is not None and file_version(key) != expected_version:
+            raise WriteConflictError(path)
+
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(key), prefix=f".{os.path.basename(key)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8-sig", newline="") as f:
+                df.to_csv(f, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+            replace_file(temp_path, key)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        # 다시 읽었을 때와 같은 모양이 되도록 인덱스 정리
+        cached = df.reset_index(drop=True)
+        version = file_version(key)
+        metrics.record_write(key, version[1])
+        with _cache_lock:
+            _cache[key] = (version, prepare(cached) if prepare else cached, ())
+
+
+def invalidate(path=None):
+    """캐시 무효화 (path가 없으면 전체)"""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
+
+
+def append_csv(path, df):
+    """CSV 끝에 행 추가 (파일 전체를 다시 쓰지 않음)
+
+    새 파일이거나 비어 있으면 헤더를 먼저 쓰고, 한 번의 write 호출로
+    추가한 뒤 fsync까지 마친다. 캐시는 다음에 읽을 때 갱신한다.
+    추가 전 파일 버전을 반환한다.
+    """
+    key = os.path.abspath(path)
+
+    with write_lock(key):
+        before = file_version(key)
+        need_header = before is None or before[1] == 0
+
+        text = df.to_csv(index=False, header=need_header)
+        data = text.encode("utf-8-sig" if need_header else "utf-8")
+
+        fd = os.open(key, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # 마지막 줄이 개행 없이 끝났으면 행이 붙어버리지 않도록 보정
+            if not need_header and os.pread(fd, 1, before[1] - 1) != b"\n":
+                data = b"\n" + data
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        metrics.record_write(key, len(data))
+
+        # 추가 전 상태를 캐시하고 있었다면 새 행은 기록만 해 두고 다음에
+        # 읽을 때 붙임 (추가할 때마다 기존 기록 전체를 복사하지 않음)
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[0] == before:
+                appended = entry[2] + (df.copy(deep=False),)
+                _cache[key] = (file_version(key), entry[1], appended)
+            else:
+                _cache.pop(key, None)
+
+    return before
@@ -0,0 +1,56 @@
+import calendar
+import datetime
+
+# 안내 메시지 템플릿 기본값
+# {month}: 월, {year}: 연도 뒤 두 자리, {period}: "YY.MM.01~YY.MM.말일"
+DEFAULT_HEADER = """안녕하세요. 한세호대리입니다.
+
+{month}월 청소구역 공유드립니다.
+
+기간 : {period}
+
+"""
+
+DEFAULT_FOOTER = """
+자신의 청소구역을 숙지해주시고 내일 뵙겠습니다.
+안녕히주무세요:)
+
+감사합니다."""
+
+
+def parse_batch_date(date):
+    """배치 날짜("YYYY-MM-DD" 또는 "YYYY-MM-DD HH:MM:SS", date 객체)를 date로
+
+    인식할 수 없으면 ValueError.
+    """
+    if isinstance(date, datetime.datetime):
+        return date.date()
+    if isinstance(date, datetime.date):
+        return date
+    return datetime.datetime.strptime(str(date)[:10], "%Y-%m-%d").date()
+
+
+def render_template(date, grouped_data, header_template=None, footer_template=None):
+    """구역별 담당자 목록(names.group_by_area 결과)으로 안내 메시지 만들기
+
+    date는 배치 날짜 (parse_batch_date가 인식하는 형식).
+    """
+    if header_template is None:
+        header_template = DEFAULT_HEADER
+    if footer_template is None:
+        footer_template = DEFAULT_FOOTER
+
+    day = parse_batch_date(date)
+    month = day.month
+    year = day.year % 100  # 년도의 마지막 두 자리만 사용
+    last_day = calendar.monthrange(day.year, day.month)[1]
+    period = f"{year}.{month:02d}.01~{year}.{month:02d}.{last_day}"
+
+    # 템플릿 헤더, 구역별 담당자 목록, 푸터
+    parts = [header_template.format(month=month, period=period, year=year)]
+    for i, (area, members) in enumerate(
+        grouped_data[["구역", "담당자"]].itertuples(index=False, name=None)
+    ):
+        parts.append(f"{i+1}. {area} - {'. '.join(members)}\n")
+    parts.append(footer_template.format(month=month, period=period, year=year))
+    return "".join(parts)
@@ -1,259 +1,131 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import os
-import datetime
-import random
-from PIL import Image
-import io
-import hashlib
-import webbrowser
-
-# 데이터 폴더 생성
-if not os.path.exists("data"):
-    os.makedirs("data")
-
-# 사용자 데이터 파일 경로
-MEMBERS_FILE = "data/members.csv"
-AREAS_FILE = "data/cleaning_areas.csv"
-ASSIGNMENTS_FILE = "data/assignments.csv"
-USERS_FILE = "data/users.csv"
-
-
-# 데이터 초기화
-def initialize_data():
-    # 멤버 데이터 초기화
-    if not os.path.exists(MEMBERS_FILE):
-        members = [
-            "김택관",
-            "Debbie",
-            "권지민",
-            "김나희",
-            "김진산",
-            "박지현",
-            "서수현",
-            "위진희",
-            "이건",
-            "이서혁",
-            "이은비",
-            "정다은",
-            "정성우",
-            "조재웅",
-            "조재원",
-            "최용석",
-            "한세호",
-            "한유진",
-        ]
-        members_df = pd.DataFrame({"이름": members, "활성": [True] * len(members)})
-        members_df.to_csv(MEMBERS_FILE, index=False, encoding="utf-8-sig")
-
-    # 청소 구역 데이터 초기화
-    if not os.path.exists(AREAS_FILE):
-        areas = [
-            {"구역명": "바닥쓸기(빗자루)", "필요인원": 4},
-            {"구역명": "바닥닦기(대걸래)", "필요인원": 4},
-            {"구역명": "분리수거(통 세척 및 정수기 물받이)", "필요인원": 2},
-            {"구역명": "휴지통 비우기", "필요인원": 2},
-            {
-                "구역명": "공용 테이블 닦기(탕비실,회의실) + 수납장 먼지털기",
-                "필요인원": 1,
-            },
-            {"구역명": "공용 휴지 및 탕비실, 냉장고 물건 채우기", "필요인원": 1},
-            {"구역명": "창문 닦기 및 바닥 부착물 제거", "필요인원": 4},
-        ]
-        areas_df = pd.DataFrame(areas)
-        areas_df.to_csv(AREAS_FILE, index=False, encoding="utf-8-sig")
-
-    # 배치 기록 초기화
-    if not os.path.exists(ASSIGNMENTS_FILE):
-        assignments_df = pd.DataFrame(columns=["날짜", "구역", "담당자"])
-        assignments_df.to_csv(ASSIGNMENTS_FILE, index=False, encoding="utf-8-sig")
-
-    # 사용자 계정 초기화
-    if not os.path.exists(USERS_FILE):
-        # 기본 관리자 계정 생성 (ID: admin, PW: admin1234)
-        admin_password = hashlib.sha256("admin1234".encode()).hexdigest()
-        users_df = pd.DataFrame(
-            {"username": ["admin"], "password": [admin_password], "is_admin": [True]}
-        )
-        users_df.to_csv(USERS_FILE, index=False, encoding="utf-8-sig")
-
-
-# 데이터 로드
-def load_members():
-    return pd.read_csv(MEMBERS_FILE, encoding="utf-8-sig")
-
-
-def load_areas():
-    return pd.read_csv(AREAS_FILE, encoding="utf-8-sig")
-
-
-def load_assignments():
-    return pd.read_csv(ASSIGNMENTS_FILE, encoding="utf-8-sig")
-
-
-def load_users():
-    return pd.read_csv(USERS_FILE, encoding="utf-8-sig")
-
-
-# 데이터 저장
-def save_members(members_df):
-    members_df.to_csv(MEMBERS_FILE, index=False, encoding="utf-8-sig")
-
-
-def save_areas(areas_df):
-    areas_df.to_csv(AREAS_FILE, index=False, encoding="utf-8-sig")
-
-
-def save_assignments(assignments_df):
-    assignments_df.to_csv(ASSIGNMENTS_FILE, index=False, encoding="utf-8-sig")
-
-
-def save_users(users_df):
-    users_df.to_csv(USERS_FILE, index=False, encoding="utf-8-sig")
-
-
-# 자동 배치 생성
-def generate_assignment():
-    members_df = load_members()
-    areas_df = load_areas()
-
-    # 활성 상태인 멤버만 선택
-    active_members = members_df[members_df["활성"] == True]["이름"].tolist()
-
-    # 이전 배치 기록 확인해서 최근에 같은 일을 하지 않도록 하기
-    assignments_df = load_assignments()
-    recent_assignments = {}
-
-    if not assignments_df.empty:
-        # 최근 날짜의 배치만 가져오기
-        latest_date = assignments_df["날짜"].max()
-        recent_df = assignments_df[assignments_df["날짜"] == latest_date]
+import math
+import uuid
 
-        for _, row in recent_df.iterrows():
-            recent_assignments[row["담당자"]] = row["구역"]
+from core import auth, instrument, metrics
+from core.service import initialize_data, load_members, load_areas
 
-    # 랜덤 배치를 위한 멤버 복사 및 섞기
-    available_members = active_members.copy()
-    random.shuffle(available_members)
 
-    # 이전에 같은 구역을 담당했던 사람은 가능하면 다른 구역으로 배치
-    def get_best_member(area_name, num_needed):
-        best_members = []
-        for _ in range(num_needed):
-            if not available_members:
-                break
-
-            # 이전에 같은 구역을 담당하지 않았던 사람을 우선적으로 선택
-            not_assigned_before = [
-                m for m in available_members if recent_assignments.get(m) != area_name
-            ]
-
-            if not_assigned_before:
-                selected = not_assigned_before[0]
-            else:
-                selected = available_members[0]
-
-            best_members.append(selected)
-            available_members.remove(selected)
+# 로그인 확인
+def check_login():
+    # 페이지를 바로 열어도 데이터가 준비되도록 (준비된 뒤에는 플래그만 확인)
+    initialize_data()
 
-        return best_members
+    if "user" not in st.session_state:
+        st.session_state.user = None
 
-    # 각 구역에 인원 배치
-    new_assignments = []
-    current_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if st.session_state.user is None:
+        login()
+        return False
+    return True
 
-    for _, area in areas_df.iterrows():
-        area_name = area["구역명"]
-        num_needed = area["필요인원"]
 
-        assigned_members = get_best_member(area_name, num_needed)
+# 페이지 실행 - 실행 시간을 기록하고, 관리자가 요청했으면 이번 실행을 프로파일
+def run_page(name, page_main):
+    profiler = st.session_state.pop("profile_next_run", None)
+    with metrics.time_page(name), instrument.span(f"page:{name}"):
+        if profiler:
+            with instrument.profile(name, profiler):
+                page_main()
+        else:
+            page_main()
 
-        for member in assigned_members:
-            new_assignments.append(
-                {"날짜": current_date, "구역": area_name, "담당자": member}
-            )
 
-    # 남은 인원이 있으면 무작위로 배치
-    if available_members:
-        area_order = areas_df["구역명"].tolist()
-        area_index = 0
-
-        for member in available_members:
-            new_assignments.append(
-                {
-                    "날짜": current_date,
-                    "구역": area_order[area_index % len(area_order)],
-                    "담당자": member,
-                }
-            )
-            area_index += 1
+# 로그인 시도 제한에 쓰는 접속 주소
+# 주소를 알 수 없으면(프록시 뒤 등) 모든 사용자가 한 키를 같이 써서 함께 차단되지
+# 않도록 세션마다 다른 키를 사용
+def client_key():
+    address = st.context.ip_address
+    if address:
+        return address
+    if "client_key" not in st.session_state:
+        st.session_state.client_key = f"session:{uuid.uuid4().hex}"
+    return st.session_state.client_key
 
-    # 새 배치 저장
-    new_assignments_df = pd.DataFrame(new_assignments)
-    all_assignments = pd.concat([assignments_df, new_assignments_df], ignore_index=True)
-    save_assignments(all_assignments)
 
-    return new_assignments_df
+# 작업자 스레드에 맡긴 작업 (비밀번호 해시 등)
+# 화면 스크립트는 결과를 기다리지 않고 끝나고, 결과가 나올 때까지 안내 부분만
+# 주기적으로 다시 실행해서 확인한다. 작업이 끝나면 화면 전체를 다시 실행한다.
+TASK_POLL_SECONDS = 0.2
 
 
-# 배치표 내보내기
-def export_assignment_to_excel(assignment_df):
-    # 결과를 보기 좋게 정렬
-    assignment_df = assignment_df.sort_values("구역")
+def start_task(key, future, **info):
+    """작업 시작 - info는 결과를 처리할 때 함께 돌려받을 값"""
+    st.session_state[key] = dict(info, future=future)
+    st.rerun()
 
-    # 피벗 테이블 생성
-    pivot_df = pd.pivot_table(
-        assignment_df, index=["구역"], values=["담당자"], aggfunc=lambda x: ", ".join(x)
-    )
-
-    # 엑셀 파일 생성
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        pivot_df.to_excel(writer, sheet_name="청소구역배치")
-        assignment_df.to_excel(writer, sheet_name="전체배치목록", index=False)
-
-    return output.getvalue()
 
+@st.fragment(run_every=TASK_POLL_SECONDS)
+def _wait_for_task(key, message):
+    task = st.session_state.get(key)
+    if task is None or task["future"].done():
+        st.rerun()
+    st.info(message)
 
-# 로그인 확인
-def check_login():
-    if "user" not in st.session_state:
-        st.session_state.user = None
 
-    if st.session_state.user is None:
-        login()
+def task_pending(key, message):
+    """작업이 진행 중이면 안내 문구를 보여 주고 True"""
+    task = st.session_state.get(key)
+    if task is None or task["future"].done():
         return False
+    _wait_for_task(key, message)
     return True
 
 
+def task_result(key):
+    """끝난 작업의 (info, future) - 없으면 None (한 번만 돌려줌)"""
+    task = st.session_state.get(key)
+    if task is None or not task["future"].done():
+        return None
+    del st.session_state[key]
+    return task, task["future"]
+
+
 # 로그인 페이지
 def login():
     st.title("청소 구역 배치 시스템 - 로그인")
 
+    # 비밀번호 확인 중이면 기다렸다가 결과 처리
+    if task_pending("login_check", "로그인 확인 중입니다..."):
+        return
+    done = task_result("login_check")
+    if done is not None:
+        task, future = done
+        user = future.result()
+        auth.record_login(task["username"], task["client"], user is not None)
+        if user is not None:
+            st.session_state.user = {
+                "username": task["username"],
+                "is_admin": user["is_admin"],
+            }
+            st.rerun()
+        # 아이디가 없는 경우와 비밀번호가 틀린 경우를 구분하지 않음
+        st.error("아이디 또는 비밀번호가 일치하지 않습니다.")
+
     with st.form("login_form"):
         username = st.text_input("아이디")
         password = st.text_input("비밀번호", type="password")
         submit = st.form_submit_button("로그인")
 
         if submit:
-            # 사용자 확인
-            users_df = load_users()
-            user_row = users_df[users_df["username"] == username]
-
-            if not user_row.empty:
-                hashed_password = hashlib.sha256(password.encode()).hexdigest()
-                if user_row.iloc[0]["password"] == hashed_password:
-                    st.session_state.user = {
-                        "username": username,
-                        "is_admin": user_row.iloc[0]["is_admin"],
-                    }
-                    st.success("로그인 성공!")
-                    st.rerun()
-                else:
-                    st.error("비밀번호가 일치하지 않습니다.")
-            else:
-                st.error("존재하지 않는 아이디입니다.")
+            # 실패가 많은 아이디/접속 주소는 조회나 해시 계산 없이 거절
+            client = client_key()
+            wait = auth.login_retry_after(username, client)
+            if wait:
+                st.error(
+                    f"로그인 실패가 많아 잠시 제한되었습니다. "
+                    f"{math.ceil(wait)}초 후 다시 시도하세요."
+                )
+                return
+
+            # 사용자 조회와 해시 계산은 작업자 스레드에서
+            # (없는 아이디도 같은 계산을 함)
+            start_task(
+                "login_check",
+                auth.login_async(username, password),
+                username=username,
+                client=client,
+            )
 
     # 계정 생성 안내
     # st.info("기본 관리자 계정: admin / admin1234")
@@ -298,7 +170,7 @@ def main():
         st.subheader("현재 등록된 청소 구역")
         areas_df = load_areas()
         st.write(f"청소 구역 수: {len(areas_df)}")
-        st.dataframe(areas_df)
+        st.dataframe(areas_df[["구역명", "필요인원"]])
 
     # 시스템 사용 안내
     st.markdown(
@@ -314,4 +186,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_page("홈", main)
@@ -6,8 +6,18 @@ import os
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 메인 앱에서 함수 가져오기
-from main import load_members, save_members, check_login
+# 로그인 확인은 메인 앱에서, 데이터 함수는 공용 모듈에서 가져오기
+from main import check_login, run_page
+from core.service import (
+    load_members,
+    save_members,
+    save_changes,
+    next_ids,
+    WriteConflictError,
+)
+from core.changes import diff_rows
+from core.config import BULK_EDIT_ROWS
+from core.editing import CONFLICT_MESSAGE, bulk_edit, file_import
 
 # 페이지 설정
 st.set_page_config(
@@ -24,11 +34,27 @@ def main():
         return
 
     members_df = load_members()
+    # 저장 시 충돌 확인용 버전 (불러온 뒤 다른 사용자가 저장했는지)
+    loaded_version = members_df.attrs.get("version")
 
     # 원본 데이터 복사본 만들기 (비교용)
     if "original_members" not in st.session_state:
         st.session_state.original_members = members_df.copy()
 
+    # 팀원이 많으면 행마다 위젯을 만들지 않고 표 하나로 편집
+    file_import("members", members_df)
+
+    if st.toggle("일괄 편집", value=len(members_df) > BULK_EDIT_ROWS):
+        bulk_edit(
+            "members",
+            members_df,
+            {
+                "이름": st.column_config.TextColumn("이름", required=True),
+                "활성": st.column_config.CheckboxColumn("활성 상태", default=True),
+            },
+        )
+        return
+
     # 팀원 상태 변경
     st.subheader("팀원 상태 관리")
 
@@ -44,60 +70,79 @@ def main():
     st.divider()  # 구분선 추가
 
     for i, row in members_df.iterrows():
+        row_id = row["id"]  # 위젯 키는 행 순서가 바뀌어도 같은 행을 가리키도록 id 사용
         col1, col2, col3 = st.columns([3, 1, 1])
         with col1:
             st.write(row["이름"])
         with col2:
             members_df.at[i, "활성"] = st.checkbox(
-                "활성", value=row["활성"], key=f"member_{i}"
+                "활성", value=row["활성"], key=f"member_{row_id}"
             )
         with col3:
             # 삭제 확인 상태 추적을 위한 세션 상태 변수
-            if f"confirm_delete_{i}" not in st.session_state:
-                st.session_state[f"confirm_delete_{i}"] = False
+            if f"confirm_delete_{row_id}" not in st.session_state:
+                st.session_state[f"confirm_delete_{row_id}"] = False
 
             # 삭제 버튼 또는 확인 버튼 표시
-            if not st.session_state[f"confirm_delete_{i}"]:
-                if st.button("삭제", key=f"delete_{i}"):
-                    st.session_state[f"confirm_delete_{i}"] = True
+            if not st.session_state[f"confirm_delete_{row_id}"]:
+                if st.button("삭제", key=f"delete_{row_id}"):
+                    st.session_state[f"confirm_delete_{row_id}"] = True
                     st.rerun()
             else:
                 confirm_col1, confirm_col2 = st.columns(2)
                 with confirm_col1:
                     if st.button(
                         "확인",
-                        key=f"confirm_{i}",
+                        key=f"confirm_{row_id}",
                         type="primary",
                         use_container_width=True,
                     ):
-                        members_df = members_df.drop(i)
-                        save_members(members_df)
+                        members_df = members_df[members_df["id"] != row_id]
+                        try:
+                            save_members(members_df, loaded_version)
+                        except WriteConflictError:
+                            st.error(CONFLICT_MESSAGE)
+                            st.stop()
+                        st.session_state.pop("original_members", None)
                         st.success(f"{row['이름']}님이 삭제되었습니다.")
-                        st.session_state[f"confirm_delete_{i}"] = False
+                        st.session_state[f"confirm_delete_{row_id}"] = False
                         st.rerun()
                 with confirm_col2:
-                    if st.button("취소", key=f"cancel_{i}", use_container_width=True):
-                        st.session_state[f"confirm_delete_{i}"] = False
+                    if st.button("취소", key=f"cancel_{row_id}", use_container_width=True):
+                        st.session_state[f"confirm_delete_{row_id}"] = False
                         st.rerun()
 
-    # 변경사항 감지
-    has_changes = not members_df.equals(st.session_state.original_members)
+    # 변경사항 감지 (바뀐 행만 저장)
+    changes = diff_rows(st.session_state.original_members, members_df)
 
     # 변경사항이 있을 때만 저장 버튼 활성화
-    save_disabled = not has_changes
+    save_disabled = changes.empty
     if st.button("변경사항 저장", disabled=save_disabled, key="save_members"):
-        save_members(members_df)
-        st.session_state.original_members = members_df.copy()  # 원본 데이터 업데이트
-        st.success("팀원 정보가 저장되었습니다.")
+        try:
+            save_changes("members", changes)
+            # 원본 데이터 업데이트 (저장 후 버전 포함)
+            st.session_state.original_members = load_members()
+            st.success("팀원 정보가 저장되었습니다.")
+        except WriteConflictError:
+            # 다음 실행 때 최신 데이터로 원본을 다시 잡도록 초기화
+            st.session_state.pop("original_members", None)
+            st.error(CONFLICT_MESSAGE)
 
     # 새 팀원 추가
     st.subheader("새 팀원 추가")
     new_member = st.text_input("새 팀원 이름")
     if st.button("팀원 추가") and new_member:
         if new_member not in members_df["이름"].values:
-            new_row = pd.DataFrame({"이름": [new_member], "활성": [True]})
+            new_row = pd.DataFrame(
+                {"id": next_ids("members"), "이름": [new_member], "활성": [True]}
+            )
             members_df = pd.concat([members_df, new_row], ignore_index=True)
-            save_members(members_df)
+            try:
+                save_members(members_df, loaded_version)
+            except WriteConflictError:
+                st.error(CONFLICT_MESSAGE)
+                st.stop()
+            st.session_state.pop("original_members", None)
             st.success(f"{new_member}님이 추가되었습니다.")
             st.rerun()
         else:
@@ -105,4 +150,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_page("팀원 관리", main)
@@ -6,8 +6,18 @@ import os
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 메인 앱에서 함수 가져오기
-from main import load_areas, save_areas, check_login
+# 로그인 확인은 메인 앱에서, 데이터 함수는 공용 모듈에서 가져오기
+from main import check_login, run_page
+from core.service import (
+    load_areas,
+    save_areas,
+    save_changes,
+    next_ids,
+    WriteConflictError,
+)
+from core.changes import diff_rows
+from core.config import BULK_EDIT_ROWS
+from core.editing import CONFLICT_MESSAGE, bulk_edit, file_import
 
 # 페이지 설정
 st.set_page_config(
@@ -24,11 +34,29 @@ def main():
         return
 
     areas_df = load_areas()
+    # 저장 시 충돌 확인용 버전 (불러온 뒤 다른 사용자가 저장했는지)
+    loaded_version = areas_df.attrs.get("version")
 
     # 원본 데이터 복사본 만들기 (비교용)
     if "original_areas" not in st.session_state:
         st.session_state.original_areas = areas_df.copy()
 
+    # 구역이 많으면 행마다 위젯을 만들지 않고 표 하나로 편집
+    file_import("areas", areas_df)
+
+    if st.toggle("일괄 편집", value=len(areas_df) > BULK_EDIT_ROWS):
+        bulk_edit(
+            "areas",
+            areas_df,
+            {
+                "구역명": st.column_config.TextColumn("구역명", required=True),
+                "필요인원": st.column_config.NumberColumn(
+                    "필요인원", min_value=1, step=1, default=1, required=True
+                ),
+            },
+        )
+        return
+
     # 기존 구역 수정
     st.subheader("기존 구역 관리")
 
@@ -45,6 +73,7 @@ def main():
 
     # 각 구역을 행으로 표시하고 수정/삭제 기능 추가
     for i, row in areas_df.iterrows():
+        row_id = row["id"]  # 위젯 키는 행 순서가 바뀌어도 같은 행을 가리키도록 id 사용
         col1, col2, col3 = st.columns([3, 1, 1])
 
         with col1:
@@ -55,50 +84,61 @@ def main():
                 "필요인원",
                 min_value=1,
                 value=row["필요인원"],
-                key=f"area_people_{i}",
+                key=f"area_people_{row_id}",
                 label_visibility="collapsed",
             )
 
         with col3:
             # 삭제 확인 상태 추적을 위한 세션 상태 변수
-            if f"confirm_delete_area_{i}" not in st.session_state:
-                st.session_state[f"confirm_delete_area_{i}"] = False
+            if f"confirm_delete_area_{row_id}" not in st.session_state:
+                st.session_state[f"confirm_delete_area_{row_id}"] = False
 
             # 삭제 버튼 또는 확인 버튼 표시
-            if not st.session_state[f"confirm_delete_area_{i}"]:
-                if st.button("삭제", key=f"delete_area_{i}"):
-                    st.session_state[f"confirm_delete_area_{i}"] = True
+            if not st.session_state[f"confirm_delete_area_{row_id}"]:
+                if st.button("삭제", key=f"delete_area_{row_id}"):
+                    st.session_state[f"confirm_delete_area_{row_id}"] = True
                     st.rerun()
             else:
                 confirm_col1, confirm_col2 = st.columns(2)
                 with confirm_col1:
                     if st.button(
                         "확인",
-                        key=f"confirm_area_{i}",
+                        key=f"confirm_area_{row_id}",
                         type="primary",
                         use_container_width=True,
                     ):
-                        areas_df = areas_df.drop(i)
-                        save_areas(areas_df)
+                        areas_df = areas_df[areas_df["id"] != row_id]
+                        try:
+                            save_areas(areas_df, loaded_version)
+                        except WriteConflictError:
+                            st.error(CONFLICT_MESSAGE)
+                            st.stop()
+                        st.session_state.pop("original_areas", None)
                         st.success(f"'{row['구역명']}' 구역이 삭제되었습니다.")
-                        st.session_state[f"confirm_delete_area_{i}"] = False
+                        st.session_state[f"confirm_delete_area_{row_id}"] = False
                         st.rerun()
                 with confirm_col2:
                     if st.button(
-                        "취소", key=f"cancel_area_{i}", use_container_width=True
+                        "취소", key=f"cancel_area_{row_id}", use_container_width=True
                     ):
-                        st.session_state[f"confirm_delete_area_{i}"] = False
+                        st.session_state[f"confirm_delete_area_{row_id}"] = False
                         st.rerun()
 
-    # 변경사항 감지
-    has_changes = not areas_df.equals(st.session_state.original_areas)
+    # 변경사항 감지 (바뀐 행만 저장)
+    changes = diff_rows(st.session_state.original_areas, areas_df)
 
     # 변경사항이 있을 때만 저장 버튼 활성화
-    save_disabled = not has_changes
+    save_disabled = changes.empty
     if st.button("변경사항 저장", disabled=save_disabled, key="save_areas"):
-        save_areas(areas_df)
-        st.session_state.original_areas = areas_df.copy()  # 원본 데이터 업데이트
-        st.success("청소 구역 정보가 저장되었습니다.")
+        try:
+            save_changes("areas", changes)
+            # 원본 데이터 업데이트 (저장 후 버전 포함)
+            st.session_state.original_areas = load_areas()
+            st.success("청소 구역 정보가 저장되었습니다.")
+        except WriteConflictError:
+            # 다음 실행 때 최신 데이터로 원본을 다시 잡도록 초기화
+            st.session_state.pop("original_areas", None)
+            st.error(CONFLICT_MESSAGE)
 
     # 새 구역 추가
     st.subheader("새 청소 구역 추가")
@@ -107,9 +147,20 @@ def main():
 
     if st.button("구역 추가") and new_area:
         if new_area not in areas_df["구역명"].values:
-            new_row = pd.DataFrame({"구역명": [new_area], "필요인원": [new_people]})
+            new_row = pd.DataFrame(
+                {
+                    "id": next_ids("areas"),
+                    "구역명": [new_area],
+                    "필요인원": [new_people],
+                }
+            )
             areas_df = pd.concat([areas_df, new_row], ignore_index=True)
-            save_areas(areas_df)
+            try:
+                save_areas(areas_df, loaded_version)
+            except WriteConflictError:
+                st.error(CONFLICT_MESSAGE)
+                st.stop()
+            st.session_state.pop("original_areas", None)
             st.success(f"{new_area} 구역이 추가되었습니다.")
             st.rerun()
         else:
@@ -117,4 +168,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_page("청소 구역 관리", main)
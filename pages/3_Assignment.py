@@ -7,14 +7,18 @@ import os
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 메인 앱에서 함수 가져오기
-from main import (
+# 로그인 확인은 메인 앱에서, 데이터 함수는 공용 모듈에서 가져오기
+from main import check_login, run_page
+from core.service import (
     load_members,
     load_areas,
     generate_assignment,
+    generate_assignments_for_dates,
     export_assignment_to_excel,
-    check_login,
 )
+from core import config
+from core.assignment import ENGINE_LABELS, month_range, working_days
+from core.names import group_by_area
 
 # 페이지 설정
 st.set_page_config(
@@ -25,6 +29,51 @@ st.set_page_config(
 st.title("청소 구역 배치 생성")
 
 
+def generate_period(engine):
+    st.subheader("기간 배치 생성")
+
+    period_type = st.radio("기간 선택", ["월 단위", "직접 지정"], horizontal=True)
+    today = datetime.date.today()
+
+    if period_type == "월 단위":
+        col1, col2 = st.columns(2)
+        with col1:
+            year = st.number_input("년도", min_value=2000, max_value=2100, value=today.year)
+        with col2:
+            month = st.number_input("월", min_value=1, max_value=12, value=today.month)
+        start, end = month_range(int(year), int(month))
+    else:
+        selected = st.date_input(
+            "기간", value=(today, today + datetime.timedelta(days=6))
+        )
+        if len(selected) != 2:
+            st.info("시작일과 종료일을 선택하세요.")
+            return
+        start, end = selected
+
+    # 근무일(월~금)마다 배치 하나씩 생성
+    days = working_days(start, end)
+    st.write(f"{start} ~ {end} 근무일: {len(days)}일")
+
+    if st.button("기간 배치 생성", disabled=not days):
+        with st.spinner("배치 생성 중..."):
+            new_assignments = generate_assignments_for_dates(days, engine)
+
+        if new_assignments.empty:
+            st.info("선택한 기간의 모든 날짜에 이미 배치가 있습니다.")
+            return
+
+        st.success(f"{new_assignments['날짜'].nunique()}일치 배치가 생성되었습니다.")
+
+        # 날짜 x 구역 표로 보여주기
+        table = (
+            new_assignments.groupby(["날짜", "구역"], sort=False)["담당자"]
+            .agg(", ".join)
+            .unstack()
+        )
+        st.dataframe(table)
+
+
 def main():
     # 로그인 확인
     if not check_login():
@@ -57,17 +106,29 @@ def main():
         if proceed == "아니오":
             st.stop()
 
+    # 배치 엔진 선택
+    engines = list(ENGINE_LABELS)
+    engine = st.selectbox(
+        "배치 방식",
+        engines,
+        index=engines.index(config.ASSIGNMENT_ENGINE),
+        format_func=ENGINE_LABELS.get,
+    )
+
+    mode = st.radio("생성 방식", ["단일 배치", "기간 배치"], horizontal=True)
+    if mode == "기간 배치":
+        generate_period(engine)
+        return
+
     if st.button("새 배치 생성"):
         with st.spinner("배치 생성 중..."):
-            new_assignments = generate_assignment()
+            new_assignments = generate_assignment(engine)
 
             # 구역별로 그룹화하여 보여주기
             st.subheader("생성된 배치")
 
             # 결과를 테이블 형태로 보여주기
-            grouped = (
-                new_assignments.groupby("구역")["담당자"].apply(list).reset_index()
-            )
+            grouped = group_by_area(new_assignments)
 
             # 헤더 추가
             header_col1, header_col2 = st.columns([3, 7])
@@ -100,4 +161,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_page("배치 생성", main)
@@ -4,17 +4,28 @@ import sys
 import os
 import datetime
 import json
+import tempfile
 
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 메인 앱에서 함수 가져오기
-from main import (
-    load_assignments,
+# 로그인 확인은 메인 앱에서, 데이터 함수는 공용 모듈에서 가져오기
+from main import check_login, run_page
+from core import config
+from core.service import (
+    load_members,
+    load_areas,
+    load_assignment_batch,
+    load_batch_index,
+    list_assignment_batches,
+    load_rotation_matrix,
     export_assignment_to_excel,
-    check_login,
-    save_assignments,
+    export_history_to_excel,
+    delete_assignment_batch,
 )
+from core.artifacts import artifact_cache, content_hash, text_hash
+from core.names import group_by_area
+from core.templates import DEFAULT_FOOTER, DEFAULT_HEADER, render_template
 from streamlit.components.v1 import html
 
 # 페이지 설정
@@ -22,21 +33,6 @@ st.set_page_config(
     page_title="배치 기록 - 청소 구역 배치 시스템", page_icon="📋", layout="wide"
 )
 
-# 템플릿 기본값 설정
-DEFAULT_HEADER = """안녕하세요. 한세호대리입니다.
-
-{month}월 청소구역 공유드립니다.
-
-기간 : {period}
-
-"""
-
-DEFAULT_FOOTER = """
-자신의 청소구역을 숙지해주시고 내일 뵙겠습니다.
-안녕히주무세요:)
-
-감사합니다."""
-
 # 세션 상태 초기화
 if "template_header" not in st.session_state:
     st.session_state.template_header = DEFAULT_HEADER
@@ -44,6 +40,9 @@ if "template_header" not in st.session_state:
 if "template_footer" not in st.session_state:
     st.session_state.template_footer = DEFAULT_FOOTER
 
+# 배치 목록 한 페이지에 표시할 배치 수
+PAGE_SIZE = 20
+
 # 페이지 제목을 한글로 표시
 st.title("배치 기록")
 
@@ -57,57 +56,14 @@ def generate_template_text(
     if footer_template is None:
         footer_template = st.session_state.template_footer
 
-    # 년, 월 추출
     try:
-        # 날짜 형식에 시간이 포함되어 있을 수 있으므로 더 포괄적인 형식 처리
-        if " " in date:
-            # 날짜와 시간이 포함된 경우 (예: 2023-04-05 12:34:56)
-            date_part = date.split(" ")[0]  # 날짜 부분만 추출
-            date_obj = datetime.datetime.strptime(date_part, "%Y-%m-%d")
-        else:
-            # 날짜만 있는 경우
-            date_obj = datetime.datetime.strptime(date, "%Y-%m-%d")
+        return render_template(date, grouped_data, header_template, footer_template)
     except ValueError:
-        # 다른 형식으로 시도
-        try:
-            # 간단히 날짜 객체로 변환 (이미 날짜 객체인 경우도 처리)
-            if isinstance(date, (datetime.date, datetime.datetime)):
-                date_obj = (
-                    date
-                    if isinstance(date, datetime.datetime)
-                    else datetime.datetime.combine(date, datetime.time())
-                )
-            else:
-                # 마지막 시도로 날짜만 파싱
-                date_obj = datetime.datetime.strptime(str(date)[:10], "%Y-%m-%d")
-        except ValueError:
-            # 모든 시도가 실패하면 현재 날짜 사용
-            st.error(f"날짜 형식을 인식할 수 없습니다: {date}. 현재 날짜를 사용합니다.")
-            date_obj = datetime.datetime.now()
-
-    month = date_obj.month
-    year = date_obj.year % 100  # 년도의 마지막 두 자리만 사용
-
-    # 시작일과 마지막일 계산
-    month_start = datetime.date(date_obj.year, date_obj.month, 1)
-    next_month = month_start.replace(day=28) + datetime.timedelta(days=4)
-    month_end = (next_month - datetime.timedelta(days=next_month.day)).replace(
-        day=1
-    ) - datetime.timedelta(days=1)
-
-    period = f"{year}.{month:02d}.01~{year}.{month:02d}.{month_end.day}"
-
-    # 템플릿 헤더 (포맷팅)
-    template = header_template.format(month=month, period=period, year=year)
-
-    # 각 구역별 담당자 목록 추가
-    for i, row in grouped_data.iterrows():
-        template += f"{i+1}. {row['구역']} - {'. '.join(row['담당자'])}\n"
-
-    # 템플릿 푸터 (포맷팅)
-    template += footer_template.format(month=month, period=period, year=year)
-
-    return template
+        # 날짜를 인식할 수 없으면 현재 날짜 사용
+        st.error(f"날짜 형식을 인식할 수 없습니다: {date}. 현재 날짜를 사용합니다.")
+        return render_template(
+            datetime.date.today(), grouped_data, header_template, footer_template
+        )
 
 
 def create_copy_button(text, button_id="copy_btn"):
@@ -134,13 +90,127 @@ def create_copy_button(text, button_id="copy_btn"):
     return copy_js
 
 
+def export_period():
+    """기간(또는 전체) 배치 기록을 배치별/월별 시트로 내보내기"""
+    st.subheader("기간 엑셀 내보내기")
+
+    whole = st.checkbox("전체 기간")
+    start = end = None
+    if not whole:
+        today = datetime.date.today()
+        selected = st.date_input(
+            "내보낼 기간", value=(today.replace(day=1), today), key="export_period"
+        )
+        if len(selected) != 2:
+            st.info("시작일과 종료일을 선택하세요.")
+            return
+        start, end = selected
+
+    group_by = st.radio(
+        "시트 구분",
+        ["batch", "month"],
+        format_func={"batch": "배치별", "month": "월별"}.get,
+        horizontal=True,
+    )
+
+    if st.button("엑셀 파일 만들기"):
+        with st.spinner("엑셀 파일 생성 중..."):
+            # 통합 문서는 임시 파일에 흘려 쓰고 완성된 파일만 읽음
+            with tempfile.TemporaryFile() as f:
+                sheet_count, used_group_by = export_history_to_excel(
+                    f, start, end, group_by
+                )
+                f.seek(0)
+                excel_data = f.read()
+
+        if sheet_count == 0:
+            st.info("해당 기간의 배치 기록이 없습니다.")
+            return
+        if used_group_by != group_by:
+            st.info(
+                f"배치가 {config.EXPORT_MAX_BATCH_SHEETS}개를 넘어 월별 시트로 만들었습니다."
+            )
+
+        period = "전체" if whole else f"{start:%Y%m%d}_{end:%Y%m%d}"
+        st.download_button(
+            label=f"엑셀 파일로 다운로드 (시트 {sheet_count}개)",
+            data=excel_data,
+            file_name=f"청소구역배치기록_{period}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            on_click="ignore",
+        )
+
+
+def browse_batches():
+    """조건에 맞는 배치를 한 페이지씩 보여주고 선택된 배치 날짜를 반환"""
+    with st.expander("배치 검색", expanded=False):
+        use_period = st.checkbox("기간으로 찾기")
+        start = end = None
+        if use_period:
+            today = datetime.date.today()
+            selected = st.date_input(
+                "기간", value=(today - datetime.timedelta(days=30), today)
+            )
+            if len(selected) == 2:
+                start, end = selected
+
+        # 선택지는 id로 두고 이름으로 표시 (None = 전체)
+        member_names = load_members().set_index("id")["이름"]
+        area_names = load_areas().set_index("id")["구역명"]
+        col1, col2 = st.columns(2)
+        with col1:
+            member = st.selectbox(
+                "담당자",
+                [None] + member_names.index.tolist(),
+                format_func=lambda i: "전체" if i is None else member_names[i],
+            )
+        with col2:
+            area = st.selectbox(
+                "구역",
+                [None] + area_names.index.tolist(),
+                format_func=lambda i: "전체" if i is None else area_names[i],
+            )
+
+    # 검색 조건이 바뀌면 첫 페이지부터
+    filters = (start, end, member, area)
+    if st.session_state.get("batch_filters") != filters:
+        st.session_state.batch_filters = filters
+        st.session_state.batch_cursors = [None]
+
+    cursors = st.session_state.batch_cursors
+    page, next_cursor = list_assignment_batches(
+        start, end, member, area, before=cursors[-1], limit=PAGE_SIZE
+    )
+
+    if page.empty:
+        st.write("조건에 맞는 배치가 없습니다.")
+        return None
+
+    st.dataframe(page, hide_index=True, use_container_width=True)
+
+    # 페이지 이동
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if st.button("이전", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("다음", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+    with col3:
+        st.write(f"{len(cursors)} 페이지")
+
+    return st.selectbox("날짜 선택", page["날짜"].tolist())
+
+
 def main():
     # 로그인 확인
     if not check_login():
         return
 
     # 템플릿 설정 탭과 배치 기록 탭
-    tab1, tab2 = st.tabs(["배치 기록", "템플릿 설정"])
+    tab1, tab2, tab3 = st.tabs(["배치 기록", "템플릿 설정", "담당 통계"])
 
     with tab2:
         st.subheader("템플릿 설정")
@@ -171,21 +241,22 @@ def main():
             st.success("템플릿이 기본값으로 재설정되었습니다.")
 
     with tab1:
-        assignments_df = load_assignments()
-
-        if assignments_df.empty:
+        selected_date = None
+        if load_batch_index().empty:
             st.write("아직 생성된 배치가 없습니다.")
         else:
-            # 날짜 선택
-            dates = sorted(assignments_df["날짜"].unique(), reverse=True)
-            selected_date = st.selectbox("날짜 선택", dates)
+            selected_date = browse_batches()
 
+        if selected_date is not None:
             # 선택된 날짜의 배치 표시
-            filtered_df = assignments_df[assignments_df["날짜"] == selected_date]
+            filtered_df = load_assignment_batch(selected_date)
 
             # 구역별로 그룹화하여 보여주기
             st.subheader(f"{selected_date} 배치")
-            grouped = filtered_df.groupby("구역")["담당자"].apply(list).reset_index()
+            grouped = group_by_area(filtered_df)
+
+            # 내보내기 결과 캐시 키 (배치 날짜, 배치 내용 해시)
+            batch_key = (selected_date, content_hash(filtered_df))
 
             # 헤더 추가
             header_col1, header_col2 = st.columns([3, 7])
@@ -204,15 +275,20 @@ def main():
                 with col2:
                     st.write(", ".join(row["담당자"]))
 
-            # 엑셀 파일 다운로드 버튼
-            excel_data = export_assignment_to_excel(filtered_df)
+            # 엑셀 파일 다운로드 버튼 (누를 때 처음 한 번만 생성하고 이후에는 캐시 사용)
+            def build_excel():
+                return artifact_cache.get_or_build(
+                    ("excel",) + batch_key,
+                    lambda: export_assignment_to_excel(filtered_df),
+                )
+
             file_name = f"청소구역배치_{selected_date.replace('-', '').replace(' ', '_').replace(':', '')}.xlsx"
 
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.download_button(
                     label="엑셀 파일로 다운로드",
-                    data=excel_data,
+                    data=build_excel,
                     file_name=file_name,
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 )
@@ -227,16 +303,19 @@ def main():
                     )
 
                     if delete_confirm:
-                        # 선택된 날짜의 배치 기록을 제외한 나머지 기록만 유지
-                        assignments_df = assignments_df[
-                            assignments_df["날짜"] != selected_date
-                        ]
-                        save_assignments(assignments_df)
+                        # 선택된 날짜의 배치 기록 삭제
+                        delete_assignment_batch(selected_date)
                         st.success(f"{selected_date} 배치 기록이 삭제되었습니다.")
                         st.rerun()
 
-            # 템플릿 문자열 생성 및 복사 기능
-            template_text = generate_template_text(selected_date, grouped)
+            # 템플릿 문자열 생성 및 복사 기능 (배치와 템플릿이 같으면 캐시 사용)
+            template_key = text_hash(
+                st.session_state.template_header, st.session_state.template_footer
+            )
+            template_text = artifact_cache.get_or_build(
+                ("text",) + batch_key + (template_key,),
+                lambda: generate_template_text(selected_date, grouped),
+            )
 
             st.subheader("메시지 템플릿")
             st.text_area(
@@ -258,6 +337,25 @@ def main():
                     mime="text/plain",
                 )
 
+        st.divider()
+        export_period()
+
+    with tab3:
+        st.subheader("팀원별 구역 담당 횟수")
+        matrix = load_rotation_matrix()
+
+        if not matrix.batches:
+            st.write("아직 생성된 배치가 없습니다.")
+        else:
+            st.write(f"전체 배치 수: {len(matrix.batches)}")
+            # 팀원/구역 id로 조회한 뒤 이름으로 표시
+            members_df = load_members()
+            areas_df = load_areas()
+            counts = matrix.to_frame(members_df["id"], areas_df["id"])
+            counts.index = members_df["이름"].tolist()
+            counts.columns = areas_df["구역명"].tolist()
+            st.dataframe(counts)
+
 
 if __name__ == "__main__":
-    main()
+    run_page("배치 기록", main)
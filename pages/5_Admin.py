@@ -1,14 +1,22 @@
 import streamlit as st
 import pandas as pd
-import hashlib
 import sys
 import os
 
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 메인 앱에서 함수 가져오기
-from main import load_users, save_users, check_login
+# 로그인 확인은 메인 앱에서, 데이터 함수는 공용 모듈에서 가져오기
+from main import check_login, run_page, start_task, task_pending, task_result
+from core.service import (
+    load_users,
+    save_changes,
+    next_ids,
+    WriteConflictError,
+)
+from core import auth, bootstrap, config, instrument
+from core.changes import diff_rows, inserted_rows
+from core.editing import CONFLICT_MESSAGE
 
 # 페이지 설정
 st.set_page_config(
@@ -19,6 +27,104 @@ st.set_page_config(
 st.title("관리자 설정")
 
 
+# 사용자 목록 편집 - 행마다 위젯을 만들지 않고 표 하나로 권한 변경/삭제
+# (비밀번호가 필요한 새 계정은 아래 추가 양식으로만 만듦)
+def users_editor(users_df):
+    edited = st.data_editor(
+        users_df[["username", "is_admin"]].assign(삭제=False),
+        # 다른 사용자가 저장해서 데이터가 바뀌면 편집기를 새로 시작
+        key=f"users_editor_{users_df.attrs.get('version')}",
+        hide_index=True,
+        column_config={
+            "username": st.column_config.TextColumn("아이디", disabled=True),
+            "is_admin": st.column_config.CheckboxColumn("관리자 권한"),
+            "삭제": st.column_config.CheckboxColumn("삭제"),
+        },
+        use_container_width=True,
+    )
+    st.caption("현재 로그인한 계정은 권한을 바꾸거나 삭제할 수 없습니다.")
+
+    deleted = edited["삭제"].to_numpy(dtype=bool)
+    admin = edited["is_admin"].to_numpy(dtype=bool)
+    changes = diff_rows(users_df, users_df.assign(is_admin=admin)[~deleted])
+
+    if not changes.empty:
+        st.write(
+            ", ".join(
+                f"{label} {count}명"
+                for label, count in changes.summary().items()
+                if label != "추가"
+            )
+        )
+    if st.button("변경사항 저장", disabled=changes.empty, key="save_users"):
+        mine = (users_df["username"] == st.session_state.user["username"]).to_numpy()
+        before = users_df["is_admin"].to_numpy(dtype=bool)
+        if deleted[mine].any() or (admin[mine] != before[mine]).any():
+            st.error("현재 로그인한 계정은 권한을 바꾸거나 삭제할 수 없습니다.")
+            return
+        try:
+            save_changes("users", changes)
+        except WriteConflictError:
+            st.error(CONFLICT_MESSAGE)
+            st.stop()
+        st.success("사용자 정보가 저장되었습니다.")
+        st.rerun()
+
+
+# 새 사용자 추가 - 비밀번호 해시는 작업자 스레드에서 계산하고 끝나면 저장
+def add_user(users_df):
+    if task_pending("add_user", "비밀번호를 해시하는 중입니다..."):
+        return
+    done = task_result("add_user")
+    if done is not None:
+        task, future = done
+        # 해시하는 동안 같은 아이디가 추가되었을 수 있으므로 다시 확인
+        if task["username"] in users_df["username"].values:
+            st.error("이미 존재하는 아이디입니다.")
+        else:
+            new_row = pd.DataFrame(
+                {
+                    "id": next_ids("users"),
+                    "username": [task["username"]],
+                    "password": [future.result()],
+                    "is_admin": [task["is_admin"]],
+                }
+            )
+            try:
+                save_changes("users", inserted_rows(new_row))
+            except WriteConflictError:
+                st.error(CONFLICT_MESSAGE)
+                st.stop()
+            st.success(f"{task['username']} 계정이 추가되었습니다.")
+            st.rerun()
+
+    with st.form("add_user_form"):
+        new_username = st.text_input("아이디")
+        new_password = st.text_input("비밀번호", type="password")
+        new_password_confirm = st.text_input("비밀번호 확인", type="password")
+        is_admin = st.checkbox("관리자 권한 부여")
+
+        submit = st.form_submit_button("사용자 추가")
+
+        if submit:
+            # 유효성 검사
+            if not new_username:
+                st.error("아이디를 입력하세요.")
+            elif not new_password:
+                st.error("비밀번호를 입력하세요.")
+            elif new_password != new_password_confirm:
+                st.error("비밀번호가 일치하지 않습니다.")
+            elif new_username in users_df["username"].values:
+                st.error("이미 존재하는 아이디입니다.")
+            else:
+                start_task(
+                    "add_user",
+                    auth.new_password_hash_async(new_password),
+                    username=new_username,
+                    is_admin=is_admin,
+                )
+
+
 def main():
     # 로그인 확인
     if not check_login():
@@ -38,127 +144,84 @@ def main():
         # 사용자 정보 로드
         users_df = load_users()
 
-        # 기존 사용자 목록 표시
+        # 기존 사용자 목록 (표 하나로 권한 변경/삭제, 바뀐 행만 저장)
         st.write("기존 사용자 목록")
-
-        # 헤더 추가
-        header_col1, header_col2, header_col3 = st.columns([3, 2, 1])
-        with header_col1:
-            st.write("**아이디**")
-        with header_col2:
-            st.write("**권한**")
-        with header_col3:
-            st.write("**작업**")
-
-        st.divider()  # 구분선 추가
-
-        # 각 사용자 표시
-        for i, row in users_df.iterrows():
-            col1, col2, col3 = st.columns([3, 2, 1])
-
-            with col1:
-                st.write(row["username"])
-
-            with col2:
-                # 현재 로그인한 사용자는 관리자 권한 변경 불가
-                if row["username"] == st.session_state.user["username"]:
-                    st.write("관리자" if row["is_admin"] else "일반")
-                else:
-                    users_df.at[i, "is_admin"] = st.checkbox(
-                        "관리자 권한", value=row["is_admin"], key=f"user_admin_{i}"
-                    )
-
-            with col3:
-                # 현재 로그인한 사용자는 삭제 불가
-                if row["username"] == st.session_state.user["username"]:
-                    st.write("-")
-                else:
-                    # 삭제 확인 상태 추적을 위한 세션 상태 변수
-                    if f"confirm_delete_user_{i}" not in st.session_state:
-                        st.session_state[f"confirm_delete_user_{i}"] = False
-
-                    # 삭제 버튼 또는 확인 버튼 표시
-                    if not st.session_state[f"confirm_delete_user_{i}"]:
-                        if st.button("삭제", key=f"delete_user_{i}"):
-                            st.session_state[f"confirm_delete_user_{i}"] = True
-                            st.rerun()
-                    else:
-                        confirm_col1, confirm_col2 = st.columns(2)
-                        with confirm_col1:
-                            if st.button(
-                                "확인",
-                                key=f"confirm_user_{i}",
-                                type="primary",
-                                use_container_width=True,
-                            ):
-                                users_df = users_df.drop(i)
-                                save_users(users_df)
-                                st.success(
-                                    f"'{row['username']}' 계정이 삭제되었습니다."
-                                )
-                                st.session_state[f"confirm_delete_user_{i}"] = False
-                                st.rerun()
-                        with confirm_col2:
-                            if st.button(
-                                "취소", key=f"cancel_user_{i}", use_container_width=True
-                            ):
-                                st.session_state[f"confirm_delete_user_{i}"] = False
-                                st.rerun()
-
-        # 변경사항 감지를 위한 원본 데이터 복사
-        if "original_users" not in st.session_state:
-            st.session_state.original_users = users_df.copy()
-
-        # 변경사항 감지
-        has_changes = not users_df.equals(st.session_state.original_users)
-
-        # 변경사항이 있을 때만 저장 버튼 활성화
-        save_disabled = not has_changes
-        if st.button("변경사항 저장", disabled=save_disabled, key="save_users"):
-            save_users(users_df)
-            st.session_state.original_users = users_df.copy()  # 원본 데이터 업데이트
-            st.success("사용자 정보가 저장되었습니다.")
+        users_editor(users_df)
 
         # 새 사용자 추가
         st.subheader("새 사용자 추가")
-
-        with st.form("add_user_form"):
-            new_username = st.text_input("아이디")
-            new_password = st.text_input("비밀번호", type="password")
-            new_password_confirm = st.text_input("비밀번호 확인", type="password")
-            is_admin = st.checkbox("관리자 권한 부여")
-
-            submit = st.form_submit_button("사용자 추가")
-
-            if submit:
-                # 유효성 검사
-                if not new_username:
-                    st.error("아이디를 입력하세요.")
-                elif not new_password:
-                    st.error("비밀번호를 입력하세요.")
-                elif new_password != new_password_confirm:
-                    st.error("비밀번호가 일치하지 않습니다.")
-                elif new_username in users_df["username"].values:
-                    st.error("이미 존재하는 아이디입니다.")
-                else:
-                    # 새 사용자 추가
-                    hashed_password = hashlib.sha256(new_password.encode()).hexdigest()
-                    new_row = pd.DataFrame(
-                        {
-                            "username": [new_username],
-                            "password": [hashed_password],
-                            "is_admin": [is_admin],
-                        }
-                    )
-                    users_df = pd.concat([users_df, new_row], ignore_index=True)
-                    save_users(users_df)
-                    st.success(f"{new_username} 계정이 추가되었습니다.")
-                    st.rerun()
+        add_user(users_df)
 
     with tab2:
         st.subheader("시스템 설정")
-        st.info("향후 추가 예정인 기능입니다.")
+
+        # 데이터 준비 상태 (이 서버 프로세스)
+        st.write("**데이터 준비**")
+        ready = bootstrap.status()
+        if ready["ready"]:
+            st.caption(
+                f"준비 완료 ({ready['seconds'] * 1000:.0f} ms) - "
+                f"데이터 폴더: {ready['data_dir']}"
+            )
+        else:
+            st.warning(f"데이터가 아직 준비되지 않았습니다. 데이터 폴더: {ready['data_dir']}")
+
+        # 로그인 실패 횟수 제한 현황 (이 서버 프로세스 시작 이후)
+        st.write("**로그인 시도 제한**")
+        stats = auth.login_stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric(
+            "차단한 시도", stats["user"]["blocked"] + stats["client"]["blocked"]
+        )
+        col2.metric("제한 중인 아이디", stats["user"]["locked"])
+        col3.metric("제한 중인 접속 주소", stats["client"]["locked"])
+
+        # 데이터 함수/페이지 실행 시간 (이 서버 프로세스, 항목마다 최근 기록만 보관)
+        st.write("**실행 시간**")
+        timings = instrument.summary()
+        if timings:
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "항목": [row["name"] for row in timings],
+                        "호출 수": [row["count"] for row in timings],
+                        "p50 (ms)": [row["p50"] * 1000 for row in timings],
+                        "p95 (ms)": [row["p95"] * 1000 for row in timings],
+                        "최대 (ms)": [row["max"] * 1000 for row in timings],
+                    }
+                ),
+                hide_index=True,
+                column_config={
+                    name: st.column_config.NumberColumn(format="%.1f")
+                    for name in ["p50 (ms)", "p95 (ms)", "최대 (ms)"]
+                },
+            )
+        else:
+            st.caption("아직 기록된 실행 시간이 없습니다.")
+        st.caption(
+            f"p50/p95/최대는 항목마다 최근 {config.TIMING_SAMPLES}회 기준입니다."
+        )
+        if st.button("실행 시간 기록 초기화"):
+            instrument.reset()
+            st.rerun()
+
+        # 화면 한 번 실행 프로파일 (다음 실행에서 한 번만)
+        st.write("**프로파일**")
+        profiler = st.selectbox("프로파일러", instrument.available_profilers())
+        if st.button("다음 화면 실행 프로파일"):
+            st.session_state.profile_next_run = profiler
+            st.info(
+                "다음에 화면이 다시 그려질 때 (다른 페이지로 이동하거나 버튼을 누를 때) "
+                "한 번 프로파일합니다. 결과는 이 탭에서 확인하세요."
+            )
+
+        for result in instrument.recent_profiles():
+            with st.expander(
+                f"{result['time']} {result['name']} "
+                f"({result['seconds'] * 1000:.0f} ms, {result['profiler']})"
+            ):
+                st.code(result["text"], language=None)
 
 
 if __name__ == "__main__":
-    main()
+    run_page("관리자 설정", main)
@@ -1,14 +1,23 @@
 import streamlit as st
 import pandas as pd
-import hashlib
+import math
 import sys
 import os
 
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 메인 앱에서 함수 가져오기
-from main import load_users, save_users, check_login
+# 로그인 확인은 메인 앱에서, 데이터 함수는 공용 모듈에서 가져오기
+from main import (
+    check_login,
+    client_key,
+    run_page,
+    start_task,
+    task_pending,
+    task_result,
+)
+from core.service import WriteConflictError
+from core import auth
 
 # 페이지 설정
 st.set_page_config(
@@ -26,6 +35,25 @@ def main():
 
     username = st.session_state.user["username"]
 
+    # 비밀번호 확인/변경 중이면 기다렸다가 결과 처리
+    if task_pending("password_change", "비밀번호를 확인하는 중입니다..."):
+        return
+    done = task_result("password_change")
+    if done is not None:
+        task, future = done
+        try:
+            checked = future.result()
+        except WriteConflictError:
+            # 현재 비밀번호는 맞았음
+            auth.record_password_check(username, task["client"], True)
+            st.error("다른 사용자가 계정 정보를 변경 중입니다. 다시 시도하세요.")
+        else:
+            auth.record_password_check(username, task["client"], checked)
+            if checked:
+                st.success("비밀번호가 변경되었습니다.")
+            else:
+                st.error("현재 비밀번호가 일치하지 않습니다.")
+
     with st.form("change_password_form"):
         st.write(f"사용자: {username}")
         current_password = st.text_input("현재 비밀번호", type="password")
@@ -35,28 +63,27 @@ def main():
         submit = st.form_submit_button("비밀번호 변경")
 
         if submit:
-            # 사용자 정보 로드
-            users_df = load_users()
-            user_idx = users_df[users_df["username"] == username].index[0]
-
-            # 현재 비밀번호 확인
-            hashed_current = hashlib.sha256(current_password.encode()).hexdigest()
+            # 현재 비밀번호 확인도 로그인과 같은 실패 횟수 제한 적용
+            client = client_key()
+            wait = auth.password_check_retry_after(username, client)
+            if wait:
+                st.error(f"실패가 많아 잠시 제한되었습니다. {math.ceil(wait)}초 후 다시 시도하세요.")
+                return
 
-            if hashed_current != users_df.loc[user_idx, "password"]:
-                st.error("현재 비밀번호가 일치하지 않습니다.")
-            elif not new_password:
+            # 해시 계산이 필요 없는 입력 검사 먼저
+            if not new_password:
                 st.error("새 비밀번호를 입력하세요.")
             elif new_password != new_password_confirm:
                 st.error("새 비밀번호가 일치하지 않습니다.")
             elif current_password == new_password:
                 st.error("새 비밀번호가 현재 비밀번호와 같습니다.")
             else:
-                # 비밀번호 변경
-                hashed_new = hashlib.sha256(new_password.encode()).hexdigest()
-                users_df.loc[user_idx, "password"] = hashed_new
-                save_users(users_df)
-                st.success("비밀번호가 변경되었습니다.")
-
+                # 현재 비밀번호 확인과 변경은 작업자 스레드에서
+                start_task(
+                    "password_change",
+                    auth.change_password_async(username, current_password, new_password),
+                    client=client,
+                )
 
 if __name__ == "__main__":
-    main()
+    run_page("비밀번호 변경", main)
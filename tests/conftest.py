@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+
+import pandas as pd
+import pytest
+
+# 테스트는 프로젝트의 data 폴더 대신 임시 폴더를 사용
+# (core.config가 import할 때 경로를 정하므로 core를 불러오기 전에 설정)
+os.environ["CLEANING_DATA_DIR"] = tempfile.mkdtemp(prefix="cleaning-test-")
+os.environ["CLEANING_STORAGE_BACKEND"] = "csv"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 위에서 환경 변수를 정한 뒤에 불러옴
+from core import backends, config, rotation
+from core.backends import TABLES, CsvBackend
+
+# empty_data 저장소의 팀원 수와 구역 수 (구역마다 MEMBERS // AREAS명)
+MEMBERS = 18
+AREAS = 6
+
+
+@pytest.fixture
+def empty_data(tmp_path, monkeypatch):
+    """임시 폴더의 빈 CSV 저장소 (다른 테스트의 배치 기록과 섞이지 않도록)"""
+    for table in TABLES:
+        name = os.path.basename(TABLES[table]["file"])
+        monkeypatch.setitem(TABLES[table], "file", str(tmp_path / name))
+    for setting in [
+        "ASSIGNMENT_TOMBSTONES_FILE",
+        "ASSIGNMENT_INDEX_FILE",
+        "ROTATION_FILE",
+        "ID_SEQUENCE_FILE",
+    ]:
+        name = os.path.basename(getattr(config, setting))
+        monkeypatch.setattr(config, setting, str(tmp_path / name))
+    monkeypatch.setattr(backends, "_backend", CsvBackend())
+    monkeypatch.setattr(rotation, "_matrix", None)
+
+    backend = backends.get_backend()
+    backend.save(
+        "members",
+        pd.DataFrame(
+            {
+                "id": range(1, MEMBERS + 1),
+                "이름": [f"팀원{i}" for i in range(MEMBERS)],
+                "활성": True,
+            }
+        ),
+    )
+    backend.save(
+        "areas",
+        pd.DataFrame(
+            {
+                "id": range(1, AREAS + 1),
+                "구역명": [f"구역{i}" for i in range(AREAS)],
+                "필요인원": MEMBERS // AREAS,
+            }
+        ),
+    )
+    backend.save(
+        "assignments", pd.DataFrame(columns=list(TABLES["assignments"]["columns"]))
+    )
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from core import metrics
+from core.artifacts import ArtifactCache, content_hash, text_hash
+
+
+def _batch(*members):
+    return pd.DataFrame(
+        {"날짜": "2025-03-03", "구역": "화장실", "담당자": list(members)}
+    )
+
+
+def test_get_or_build_builds_once():
+    cache = ArtifactCache(100)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b"excel"
+
+    metrics.reset()
+    assert cache.get_or_build(("excel", "2025-03-03"), build) == b"excel"
+    assert cache.get_or_build(("excel", "2025-03-03"), build) == b"excel"
+
+    assert len(builds) == 1
+    assert metrics.CACHE_REQUESTS.value(cache="artifact", result="hit") == 1
+    assert metrics.CACHE_REQUESTS.value(cache="artifact", result="miss") == 1
+
+
+def test_size_limit_evicts_least_recently_used():
+    cache = ArtifactCache(10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234" and cache.get("c") == b"1234"
+    assert cache.size == 8
+
+
+def test_text_size_counts_utf8_bytes_and_large_values_are_skipped():
+    cache = ArtifactCache(10)
+    cache.put("text", "화장실")  # 9바이트
+    cache.put("big", b"x" * 11)
+
+    assert cache.size == 9
+    assert cache.get("big") is None
+
+
+def test_keys_change_with_content_and_template():
+    assert content_hash(_batch("김", "이")) == content_hash(_batch("김", "이"))
+    assert content_hash(_batch("김", "이")) != content_hash(_batch("김", "박"))
+    # 머리말/맺음말 경계가 달라지면 다른 키
+    assert text_hash("ab", "c") != text_hash("a", "bc")
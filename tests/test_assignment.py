@@ -0,0 +1,118 @@
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import assignment
+from core.rotation import RotationMatrix
+
+
+def _brute_force(cost, capacity):
+    """자리마다 열을 펼쳐서 모든 배정을 확인한 최소 비용"""
+    slots = np.repeat(np.arange(len(capacity)), capacity)
+    rows = np.arange(cost.shape[0])
+    return min(
+        cost[rows, slots[list(chosen)]].sum()
+        for chosen in itertools.permutations(range(len(slots)), cost.shape[0])
+    )
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_min_cost_transport_is_optimal(seed):
+    rng = np.random.default_rng(seed)
+    n, b = rng.integers(1, 7), rng.integers(1, 4)
+    cost = rng.integers(0, 4, (n, b)) + rng.random((n, b)) * 0.1
+    capacity = rng.integers(0, 3, b)
+    capacity[0] += max(0, n - capacity.sum())
+
+    bin_of = assignment.min_cost_transport(cost, capacity)
+
+    assert (np.bincount(bin_of, minlength=b) <= capacity).all()
+    assert cost[np.arange(n), bin_of].sum() == pytest.approx(_brute_force(cost, capacity))
+
+
+def _areas(need):
+    return pd.DataFrame({"id": range(1, len(need) + 1), "필요인원": need})
+
+
+def test_matching_engine_fills_required_before_extra():
+    members = list(range(1, 9))
+    pairs = assignment.matching_engine(
+        members, _areas([2, 1, 3]), RotationMatrix(), np.random.default_rng(0)
+    )
+
+    areas = [area for area, _ in pairs]
+    # 필요 인원 6명을 구역 순서대로 채운 뒤 남는 2명은 구역 1, 2에 차례로
+    assert areas == [1, 1, 2, 3, 3, 3, 1, 2]
+    assert sorted(member for _, member in pairs) == members
+
+
+def test_matching_engine_avoids_recent_area():
+    history = RotationMatrix.from_assignments(
+        pd.DataFrame(
+            {
+                "날짜": ["2025-03-03"] * 4,
+                "구역_id": [1, 1, 2, 2],
+                "담당자_id": [1, 2, 3, 4],
+            }
+        )
+    )
+    pairs = assignment.matching_engine(
+        [1, 2, 3, 4], _areas([2, 2]), history, np.random.default_rng(0)
+    )
+
+    assert sorted(pairs) == [(1, 3), (1, 4), (2, 1), (2, 2)]
+
+
+def test_matching_engine_5000_members_under_a_second():
+    # 팀원 5000명 x 구역 500개 (구역마다 10명), 이력 200배치
+    rng = np.random.default_rng(0)
+    n, a, batches = 5000, 500, 200
+    counts = rng.poisson(batches / a, (n, a)).astype(np.int32)
+    recent = np.full((n, a, 4), -1, dtype=np.int64)
+    recent[..., 0] = np.where(counts > 0, rng.integers(0, batches, (n, a)), -1)
+    history = RotationMatrix(
+        range(1, n + 1),
+        range(1, a + 1),
+        counts,
+        recent,
+        [str(i) for i in range(batches)],
+    )
+    members = list(range(1, n + 1))
+
+    start = time.perf_counter()
+    pairs = assignment.matching_engine(
+        members, _areas([10] * a), history, np.random.default_rng(0)
+    )
+    elapsed = time.perf_counter() - start
+
+    assert sorted(member for _, member in pairs) == members
+    assert (np.bincount([area for area, _ in pairs])[1:] == 10).all()
+    assert elapsed < 1.0
+
+
+def test_plan_batches_carries_rotation_forward():
+    history = RotationMatrix()
+    dates = [f"2025-03-{day:02d} 09:00:00" for day in (3, 4, 5)]
+
+    plan = assignment.plan_batches(
+        dates, list(range(1, 7)), _areas([2, 2, 2]), history, "matching", candidates=3
+    )
+
+    assert plan["날짜"].unique().tolist() == dates
+    # 구역이 세 개이므로 사흘 동안 모든 팀원이 구역마다 한 번씩
+    visits = plan.groupby("담당자_id")["구역_id"].agg(lambda areas: sorted(areas))
+    assert visits.tolist() == [[1, 2, 3]] * 6
+    # 넘겨준 이력은 바꾸지 않음
+    assert history.batches == []
+
+
+def test_working_days_of_month():
+    start, end = assignment.month_range(2025, 3)
+    days = assignment.working_days(start, end)
+
+    assert (start.day, end.day) == (1, 31)
+    assert len(days) == 21
+    assert all(day.weekday() < 5 for day in days)
@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from core import auth, config, metrics
+from core.ratelimit import SlidingWindowLimiter
+
+
+def test_new_password_hash_runs_on_hash_worker(monkeypatch):
+    threads = []
+    hash_password = auth.hash_password
+
+    def recording(password):
+        threads.append(threading.current_thread().name)
+        return hash_password(password)
+
+    monkeypatch.setattr(auth, "hash_password", recording)
+    hashed = auth.new_password_hash("비밀번호")
+
+    assert threads and threads[0].startswith("password-hash")
+    assert auth._verify("비밀번호", hashed) == (True, False)
+    assert auth._verify("다른 비밀번호", hashed)[0] is False
+
+
+@pytest.fixture
+def users(monkeypatch):
+    """색인 대신 쓰는 사용자 목록 (해시 반복 횟수는 테스트용으로 줄임)"""
+    monkeypatch.setattr(config, "PASSWORD_HASH_ITERATIONS", 1000)
+    users = {
+        "kim": {
+            "id": 1,
+            "username": "kim",
+            "password": auth.hash_password("비밀번호"),
+            "is_admin": False,
+        }
+    }
+    monkeypatch.setattr(auth, "get_user", lambda username: users.get(username))
+    return users
+
+
+@pytest.fixture
+def verified(monkeypatch):
+    """_verify 호출마다 (스레드 이름, 저장된 해시) 기록"""
+    calls = []
+    verify = auth._verify
+
+    def recording(password, stored):
+        calls.append((threading.current_thread().name, stored))
+        return verify(password, stored)
+
+    monkeypatch.setattr(auth, "_verify", recording)
+    return calls
+
+
+def test_login_returns_user_only_for_matching_password(users):
+    future = auth.login_async("kim", "비밀번호")
+
+    assert isinstance(future, Future)
+    assert future.result()["username"] == "kim"
+    assert auth.login_async("kim", "다른 비밀번호").result() is None
+
+
+def test_unknown_user_is_hashed_like_a_real_one(users, verified):
+    assert auth.login_async("lee", "비밀번호").result() is None
+    assert auth.login_async("kim", "다른 비밀번호").result() is None
+
+    # 없는 아이디도 같은 반복 횟수의 해시를 작업자 스레드에서 계산
+    (unknown_thread, dummy), (wrong_thread, stored) = verified
+    assert unknown_thread.startswith("password-hash")
+    assert wrong_thread.startswith("password-hash")
+    assert dummy.split("$")[:2] == stored.split("$")[:2]
+
+
+def test_change_password_checks_current_password(users, monkeypatch):
+    saved = []
+    monkeypatch.setattr(
+        auth, "_update_password", lambda user, hashed: saved.append(hashed)
+    )
+
+    assert auth.change_password_async("kim", "틀림", "새 비밀번호").result() is False
+    assert saved == []
+    assert auth.change_password_async("kim", "비밀번호", "새 비밀번호").result() is True
+    assert auth._verify("새 비밀번호", saved[0])[0]
+
+
+def test_password_checks_are_not_counted_as_logins():
+    metrics.reset()
+
+    auth.record_password_check("pw-check", "client-1", False)
+    auth.record_password_check("pw-check", "client-1", True)
+
+    assert metrics.PASSWORD_CHECKS.items() == [(("failure",), 1), (("success",), 1)]
+    assert metrics.LOGINS.items() == []
+
+
+def test_password_checks_share_login_limits(monkeypatch):
+    monkeypatch.setitem(auth._limiters, "user", SlidingWindowLimiter(2, 60, 100))
+    metrics.reset()
+
+    auth.record_password_check("pw-limit", "client-2", False)
+    auth.record_login("pw-limit", "client-2", False)
+
+    assert auth.password_check_retry_after("pw-limit", "client-2") > 0
+    assert auth.login_retry_after("pw-limit", "client-2") > 0
+    assert metrics.PASSWORD_CHECKS.value(result="blocked") == 1
+    assert metrics.LOGINS.value(result="blocked") == 1
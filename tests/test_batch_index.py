@@ -0,0 +1,187 @@
+import os
+
+import pytest
+
+from core import batch_index, storage
+from core.batch_index import BatchIndex
+
+HEADER = "날짜,구역,담당자,구역_id,담당자_id\n"
+
+
+def _rows(date, pairs):
+    return "".join(f"{date},{area},{member},1,1\n" for area, member in pairs)
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "assignments.csv"
+    path.write_bytes(
+        ("﻿" + HEADER).encode("utf-8")
+        + _rows("2025-03-03", [("화장실", "김"), ("복도", "이")]).encode("utf-8")
+        + _rows("2025-03-04", [("화장실", "박")]).encode("utf-8")
+    )
+    return path
+
+
+@pytest.fixture
+def index(log, tmp_path):
+    return BatchIndex(str(log), str(tmp_path / "assignment_index.jsonl"))
+
+
+def _append(path, text):
+    with open(path, "ab") as f:
+        f.write(text.encode("utf-8"))
+
+
+def _scans(monkeypatch):
+    """_scan 호출마다 시작 바이트 위치 기록"""
+    starts = []
+    scan = batch_index._scan
+
+    def recording(path, start, *args, **kwargs):
+        starts.append(start)
+        return scan(path, start, *args, **kwargs)
+
+    monkeypatch.setattr(batch_index, "_scan", recording)
+    return starts
+
+
+def test_read_batch_byte_offsets(log, index):
+    runs = index.current().runs
+    data = log.read_bytes()
+
+    for date, offset, length in runs[["날짜", "위치", "길이"]].itertuples(index=False):
+        lines = data[offset : offset + length].decode("utf-8").splitlines()
+        assert lines and all(line.startswith(date) for line in lines)
+
+    batch = index.read_batch("2025-03-03")
+    assert batch["담당자"].tolist() == ["김", "이"]
+    assert list(batch.columns) == HEADER.strip().split(",")
+    assert index.read_batch("2025-03-05").empty
+
+
+def test_quoted_newline_stays_in_one_record(log, index):
+    _append(log, '2025-03-05,"화장실\n(2층)",최,1,1\n2025-03-05,복도,정,1,1\n')
+
+    batch = index.read_batch("2025-03-05")
+
+    assert batch["구역"].tolist() == ["화장실\n(2층)", "복도"]
+    assert index.summary().set_index("날짜").loc["2025-03-05", "구역수"] == 2
+
+
+def test_extend_reads_only_appended_bytes(log, index, monkeypatch):
+    index.current()
+    before = storage.file_version(str(log))
+    starts = _scans(monkeypatch)
+
+    _append(log, _rows("2025-03-05", [("복도", "최")]))
+    index.extend(before)
+
+    assert starts == [before[1]]
+    assert index.read_batch("2025-03-05")["담당자"].tolist() == ["최"]
+    assert index.summary()["날짜"].tolist() == ["2025-03-03", "2025-03-04", "2025-03-05"]
+
+
+def test_extend_is_saved_for_other_processes(log, index, tmp_path):
+    index.current()
+    before = storage.file_version(str(log))
+    _append(log, _rows("2025-03-05", [("복도", "최")]))
+    index.extend(before)
+
+    other = BatchIndex(str(log), str(tmp_path / "assignment_index.jsonl"))
+    assert other.latest() == "2025-03-05"
+
+
+def test_extend_appends_to_index_file(log, index, tmp_path):
+    index.current()
+    index_file = tmp_path / "assignment_index.jsonl"
+    saved = index_file.read_bytes()
+    inode = os.stat(index_file).st_ino
+
+    before = storage.file_version(str(log))
+    _append(log, _rows("2025-03-05", [("복도", "최")]))
+    index.extend(before)
+
+    # 기존 내용은 그대로 두고 새 배치 한 줄만 덧붙임
+    data = index_file.read_bytes()
+    assert os.stat(index_file).st_ino == inode
+    assert data.startswith(saved)
+    assert data[len(saved) :].count(b"\n") == 1
+    assert b"2025-03-03" not in data[len(saved) :]
+
+
+def test_broken_index_file_is_rebuilt(log, index, tmp_path):
+    index.current()
+    before = storage.file_version(str(log))
+    _append(log, _rows("2025-03-05", [("복도", "최")]))
+    index.extend(before)
+    # 덧붙이다가 중단된 줄
+    _append(tmp_path / "assignment_index.jsonl", '{"version": [1')
+
+    other = BatchIndex(str(log), str(tmp_path / "assignment_index.jsonl"))
+    assert other.summary()["날짜"].tolist() == ["2025-03-03", "2025-03-04", "2025-03-05"]
+
+
+def test_rebuild_when_file_is_replaced(log, index, monkeypatch):
+    index.current()
+    starts = _scans(monkeypatch)
+
+    # 같은 크기의 다른 파일로 교체 (inode가 바뀜)
+    replacement = log.with_name("replacement.csv")
+    replacement.write_bytes(log.read_bytes().replace(b"2025-03-04", b"2025-03-09"))
+    os.replace(replacement, log)
+
+    assert index.latest() == "2025-03-09"
+    assert starts == [0]
+
+
+def test_rebuild_when_file_shrinks(log, index, monkeypatch):
+    index.current()
+    starts = _scans(monkeypatch)
+
+    # 같은 파일에서 마지막 배치를 잘라냄 (크기가 바뀜)
+    offset = int(index.current().runs.set_index("날짜").loc["2025-03-04", "위치"])
+    with open(log, "r+b") as f:
+        f.truncate(offset)
+
+    assert index.latest() == "2025-03-03"
+    assert index.read_batch("2025-03-04").empty
+    assert starts == [0]
+
+
+def test_extend_rebuilds_when_index_is_stale(log, index, monkeypatch):
+    index.current()
+    _append(log, _rows("2025-03-05", [("복도", "최")]))
+    starts = _scans(monkeypatch)
+
+    # 색인이 모르는 사이 추가된 뒤의 버전을 넘기면 처음부터 다시 읽음
+    middle = storage.file_version(str(log))
+    _append(log, _rows("2025-03-06", [("복도", "정")]))
+    index.extend(middle)
+
+    assert starts == [0]
+    assert index.summary()["날짜"].tolist()[-2:] == ["2025-03-05", "2025-03-06"]
+
+
+def test_tombstoned_batches_are_hidden(index):
+    deleted = {"2025-03-04"}
+
+    assert index.summary(deleted)["날짜"].tolist() == ["2025-03-03"]
+    assert index.latest(deleted) == "2025-03-03"
+    assert index.latest({"2025-03-03", "2025-03-04"}) is None
+
+
+def test_split_batch_is_summarised_once(log, index):
+    _append(log, _rows("2025-03-03", [("계단", "최")]))
+
+    summary = index.summary().set_index("날짜")
+
+    assert summary.loc["2025-03-03", "인원"] == 3
+    assert summary.loc["2025-03-03", "구역수"] == 3
+    assert index.read_batch("2025-03-03")["담당자"].tolist() == ["김", "이", "최"]
+    assert index.read_batches(["2025-03-04", "2025-03-03"])["담당자"].tolist() == [
+        "김",
+        "이",
+        "박",
+        "최",
+    ]
@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+
+from core import assignment, batches, service
+from core.backends import CsvBackend
+
+START = datetime.date(2025, 5, 1)
+END = datetime.date(2025, 6, 30)
+
+
+@pytest.fixture(scope="module")
+def history():
+    service.initialize_data()
+    service.generate_assignments_for_dates(assignment.working_days(START, END), "greedy")
+    return service.load_assignments()
+
+
+def _expected(history, column, value):
+    rows = history[history[column] == value]
+    return sorted(set(rows["날짜"].astype(str)), reverse=True)
+
+
+@pytest.fixture
+def no_full_load(monkeypatch):
+    def load(self, table):
+        if table == "assignments":
+            raise AssertionError("배치 기록 전체를 읽으면 안 됨")
+        return original(self, table)
+
+    original = CsvBackend.load
+    monkeypatch.setattr(CsvBackend, "load", load)
+
+
+@pytest.mark.parametrize("limit", [1, 5, 200])
+def test_member_filter_pages(history, no_full_load, limit):
+    member = int(history["담당자_id"].iloc[0])
+    expected = _expected(history, "담당자_id", member)
+
+    dates, before = [], None
+    while True:
+        page, before = batches.list_batches(member=member, before=before, limit=limit)
+        assert len(page) <= limit
+        dates += page["날짜"].tolist()
+        if before is None:
+            break
+
+    assert dates == expected
+
+
+def test_area_filter_with_range(history, no_full_load):
+    area = int(history["구역_id"].iloc[0])
+    start, end = "2025-06-01", "2025-06-15"
+    expected = [
+        date for date in _expected(history, "구역_id", area) if start <= date < end
+    ]
+
+    page, before = batches.list_batches(start, end, area=area, limit=len(expected))
+
+    assert page["날짜"].tolist() == expected
+    assert before is None
+
+
+def test_filter_without_matches(history, no_full_load):
+    page, before = batches.list_batches(member=-1)
+
+    assert page.empty
+    assert before is None
@@ -0,0 +1,60 @@
+import importlib.util
+import json
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load(name):
+    path = os.path.join(ROOT, "benchmarks", f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"benchmarks_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_measure_calls_setup_outside_timing():
+    suite = _load("suite")
+    prepared = []
+
+    timing = suite.measure(prepared.append, 3, setup=lambda: len(prepared))
+
+    assert prepared == [0, 1, 2]
+    assert set(timing) == {"first", "median", "min"}
+
+
+def test_baselines_cover_default_scenarios():
+    suite = _load("suite")
+    with open(suite.BASELINE_FILE, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    for scenario in suite.DEFAULT_SCENARIOS:
+        limits = baseline[f"{scenario}/csv"]
+        for name in ["generate_assignment", "export_history_to_excel", "login_lookup"]:
+            assert name in limits
+        for table in ["members", "areas", "assignments", "users"]:
+            assert f"load_{table}" in limits and f"save_{table}" in limits
+
+    import_time = _load("import_time")
+    with open(import_time.BASELINE_FILE, encoding="utf-8") as f:
+        assert set(import_time.TARGETS) <= set(json.load(f))
+
+
+def test_startup_does_not_import_lazy_modules():
+    import_time = _load("import_time")
+
+    for module in import_time.TARGETS:
+        assert import_time.loaded_lazy_modules(module) == []
+
+
+def test_openpyxl_is_imported_on_first_export():
+    import_time = _load("import_time")
+    code = (
+        "import sys, pandas as pd; from core import service; "
+        "before = 'openpyxl' in sys.modules; "
+        "service.export_assignment_to_excel("
+        "pd.DataFrame({'날짜': ['2025-03-03'], '구역': ['화장실'], '담당자': ['김']})); "
+        "print(before, 'openpyxl' in sys.modules)"
+    )
+
+    assert import_time._run(code).stdout.split() == ["False", "True"]
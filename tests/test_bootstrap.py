@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from core import bootstrap, config, metrics, migrations
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    """프로세스를 새로 시작한 것처럼 준비 상태 초기화"""
+    monkeypatch.setattr(bootstrap, "_ready", False)
+    monkeypatch.setattr(bootstrap, "_ready_seconds", None)
+    calls = []
+    initialize = bootstrap.initialize_data
+
+    def recording(backend):
+        calls.append(backend)
+        initialize(backend)
+
+    monkeypatch.setattr(bootstrap, "initialize_data", recording)
+    return calls
+
+
+def test_data_paths_are_absolute():
+    assert os.path.isabs(config.DATA_DIR)
+    assert os.path.dirname(config.MEMBERS_FILE) == config.DATA_DIR
+
+
+def test_ensure_ready_runs_once_per_process(fresh):
+    assert bootstrap.status()["ready"] is False
+    assert "cleaning_ready 0" in metrics.exposition()
+
+    bootstrap.ensure_ready()
+    bootstrap.ensure_ready()
+
+    assert len(fresh) == 1
+    status = bootstrap.status()
+    assert status["ready"] is True
+    assert status["seconds"] >= 0
+    assert status["data_dir"] == config.DATA_DIR
+    assert "cleaning_ready 1" in metrics.exposition()
+    assert "cleaning_bootstrap_seconds " in metrics.exposition()
+
+
+def test_failed_bootstrap_is_retried(fresh, monkeypatch):
+    failures = [OSError("disk full")]
+    migrate = migrations.migrate
+
+    def failing_once(backend):
+        if failures:
+            raise failures.pop()
+        migrate(backend)
+
+    monkeypatch.setattr(migrations, "migrate", failing_once)
+    with pytest.raises(OSError):
+        bootstrap.ensure_ready()
+    assert bootstrap.status()["ready"] is False
+
+    bootstrap.ensure_ready()
+    assert bootstrap.status()["ready"] is True
+    assert len(fresh) == 2
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from core.changes import diff_rows, inserted_rows
+
+ORIGINAL = pd.DataFrame(
+    {
+        "id": [1, 2, 3],
+        "이름": ["김", "이", "박"],
+        "활성": [True, True, False],
+    }
+)
+
+
+def _sorted(df, key="id"):
+    return df.sort_values(key).reset_index(drop=True)
+
+
+def test_no_changes():
+    changes = diff_rows(ORIGINAL, ORIGINAL.copy())
+
+    assert changes.empty
+    assert changes.summary() == {"추가": 0, "수정": 0, "삭제": 0}
+
+
+def test_reordered_rows_are_not_changes():
+    changes = diff_rows(ORIGINAL, ORIGINAL.iloc[::-1].reset_index(drop=True))
+    assert changes.empty
+
+
+def test_reordered_columns_are_not_changes():
+    changes = diff_rows(ORIGINAL, ORIGINAL[["활성", "이름", "id"]])
+    assert changes.empty
+
+
+def test_added_rows():
+    edited = pd.concat(
+        [
+            ORIGINAL,
+            pd.DataFrame({"id": [np.nan, 9], "이름": ["최", "정"], "활성": [True, True]}),
+        ],
+        ignore_index=True,
+    )
+
+    changes = diff_rows(ORIGINAL, edited)
+
+    # id가 비어 있는 행과 원본에 없는 id의 행은 모두 추가
+    assert changes.inserted["이름"].tolist() == ["최", "정"]
+    assert changes.updated.empty and changes.deleted.empty
+
+
+def test_removed_rows():
+    changes = diff_rows(ORIGINAL, ORIGINAL[ORIGINAL["id"] != 2])
+
+    assert changes.deleted.to_dict("records") == [{"id": 2, "이름": "이", "활성": True}]
+    assert changes.inserted.empty and changes.updated.empty
+
+
+def test_modified_rows_keep_previous_values():
+    edited = ORIGINAL.copy()
+    edited.loc[edited["id"] == 3, "활성"] = True
+    edited.loc[edited["id"] == 1, "이름"] = "김민"
+
+    changes = diff_rows(ORIGINAL, edited.iloc[::-1])
+
+    assert _sorted(changes.updated).to_dict("records") == [
+        {"id": 1, "이름": "김민", "활성": True},
+        {"id": 3, "이름": "박", "활성": True},
+    ]
+    assert _sorted(changes.previous).to_dict("records") == [
+        {"id": 1, "이름": "김", "활성": True},
+        {"id": 3, "이름": "박", "활성": False},
+    ]
+    assert changes.summary() == {"추가": 0, "수정": 2, "삭제": 0}
+
+
+def test_missing_values_compare_equal():
+    original = ORIGINAL.assign(메모=[None, "a", np.nan])
+    changes = diff_rows(original, original.copy())
+    assert changes.empty
+
+    edited = original.copy()
+    edited.loc[0, "메모"] = "b"
+    assert diff_rows(original, edited).updated["id"].tolist() == [1]
+
+
+def test_other_key_column():
+    users = pd.DataFrame(
+        {"id": [1, 2], "username": ["admin", "user"], "is_admin": [True, False]}
+    )
+    edited = users.assign(is_admin=[True, True], id=[10, 20])
+
+    changes = diff_rows(users, edited, key="username")
+
+    # key가 username이면 id 컬럼은 보통 값처럼 비교
+    assert changes.key == "username"
+    assert changes.updated["username"].tolist() == ["admin", "user"]
+    assert changes.inserted.empty and changes.deleted.empty
+
+
+def test_apply_to_reproduces_edit():
+    edited = pd.concat(
+        [
+            ORIGINAL[ORIGINAL["id"] != 2].assign(활성=True),
+            pd.DataFrame({"id": [4], "이름": ["최"], "활성": [False]}),
+        ],
+        ignore_index=True,
+    )
+
+    result = diff_rows(ORIGINAL, edited).apply_to(ORIGINAL)
+
+    assert list(result.columns) == list(ORIGINAL.columns)
+    pd.testing.assert_frame_equal(_sorted(result), _sorted(edited), check_dtype=False)
+
+
+def test_matches_detects_conflicts():
+    edited = ORIGINAL.copy()
+    edited.loc[0, "이름"] = "김민"
+    changes = diff_rows(ORIGINAL, edited.drop(index=2))
+
+    assert changes.matches(ORIGINAL)
+    # 다른 행만 바뀌었으면 충돌 아님
+    assert changes.matches(ORIGINAL.assign(이름=["김", "이2", "박"]))
+    # 수정/삭제할 행이 먼저 바뀌었거나 없어졌으면 충돌
+    assert not changes.matches(ORIGINAL.assign(이름=["김2", "이", "박"]))
+    assert not changes.matches(ORIGINAL.assign(활성=[True, True, True]))
+    assert not changes.matches(ORIGINAL[ORIGINAL["id"] != 3])
+
+
+def test_matches_rejects_taken_insert_key():
+    edited = pd.concat(
+        [ORIGINAL, pd.DataFrame({"id": [4], "이름": ["최"], "활성": [True]})],
+        ignore_index=True,
+    )
+    changes = diff_rows(ORIGINAL, edited)
+
+    assert changes.matches(ORIGINAL)
+    assert not changes.matches(edited)
+
+
+def test_inserted_rows_adds_key_column():
+    changes = inserted_rows(pd.DataFrame({"이름": ["최"], "활성": [True]}))
+
+    assert list(changes.inserted.columns) == ["id", "이름", "활성"]
+    assert changes.inserted["id"].isna().all()
+    assert changes.summary() == {"추가": 1, "수정": 0, "삭제": 0}
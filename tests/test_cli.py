@@ -0,0 +1,55 @@
+import openpyxl
+
+from conftest import AREAS, MEMBERS
+from core import cli, service
+
+
+def _run(capsys, *argv):
+    assert cli.main(list(argv)) == 0
+    return capsys.readouterr().out.splitlines()
+
+
+def test_generate_month_then_skip_existing(empty_data, capsys):
+    lines = _run(capsys, "generate", "--month", "2025-03", "--engine", "greedy")
+
+    assert len(lines) == 21
+    assert lines[0].startswith("2025-03-03 ")
+    assert lines[0].endswith(f"{MEMBERS}명, {AREAS}개 구역")
+    assert _run(capsys, "generate", "--month", "2025-03") == [
+        "새로 만든 배치가 없습니다. (이미 배치가 있는 날짜)"
+    ]
+
+
+def test_export_and_render_latest_batch(empty_data, capsys, tmp_path):
+    service.generate_assignment("greedy")
+    date = service.load_batch_index()["날짜"].iloc[-1]
+
+    output = tmp_path / "batch.xlsx"
+    _run(capsys, "export-excel", "--output", str(output))
+    # 구역마다 한 행 (헤더 제외)
+    assert openpyxl.load_workbook(output).active.max_row == AREAS + 1
+
+    header = tmp_path / "header.txt"
+    header.write_text("머리말\n", encoding="utf-8")
+    (path,) = _run(
+        capsys,
+        "render",
+        "--header-file",
+        str(header),
+        "--output-dir",
+        str(tmp_path / "msgs"),
+    )
+    text = open(path, encoding="utf-8").read()
+    assert text.startswith("머리말")
+    assert "구역0" in text
+    assert date.replace("-", "")[:8] in path
+
+
+def test_export_history(empty_data, capsys, tmp_path):
+    _run(capsys, "generate", "--start", "2025-03-03", "--end", "2025-03-05")
+    output = tmp_path / "history.xlsx"
+
+    lines = _run(capsys, "export-history", "--output", str(output))
+
+    assert lines == [f"{output}: 시트 3개"]
+    assert len(openpyxl.load_workbook(output).sheetnames) == 3
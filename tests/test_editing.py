@@ -0,0 +1,47 @@
+import pandas as pd
+
+from core.changes import diff_rows
+from core.editing import check_edit, normalize
+
+
+def _members(names, active):
+    return pd.DataFrame({"id": range(1, len(names) + 1), "이름": names, "활성": active})
+
+
+def test_check_edit_blank_and_duplicate_names():
+    assert check_edit("members", _members(["김", "이"], [True, True])) is None
+    assert check_edit("members", _members(["김", " "], [True, True])) == "이름을 입력하세요."
+    assert check_edit("areas", pd.DataFrame({"구역명": ["복도", "복도 "]})) == (
+        "이미 존재하는 구역입니다: 복도"
+    )
+
+
+def test_normalize_strips_names_and_fills_defaults():
+    original = _members(["김", "이"], [True, True])
+    edited = pd.concat(
+        [
+            original.assign(이름=["김 ", "이"]),
+            pd.DataFrame({"id": [None], "이름": [" 박"], "활성": [None]}),
+        ],
+        ignore_index=True,
+    )
+
+    changes = normalize("members", diff_rows(original, edited))
+
+    assert changes.updated["이름"].tolist() == ["김"]
+    assert changes.inserted["이름"].tolist() == ["박"]
+    assert changes.inserted["활성"].tolist() == [True]
+    assert changes.inserted["활성"].dtype == bool
+
+
+def test_normalize_area_headcount_is_integer():
+    original = pd.DataFrame({"id": [1], "구역명": ["복도"], "필요인원": [2]})
+    edited = pd.concat(
+        [original, pd.DataFrame({"id": [None], "구역명": ["계단"], "필요인원": [3.0]})],
+        ignore_index=True,
+    )
+
+    changes = normalize("areas", diff_rows(original, edited))
+
+    assert changes.inserted["필요인원"].tolist() == [3]
+    assert changes.inserted["필요인원"].dtype == "int64"
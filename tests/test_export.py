@@ -0,0 +1,34 @@
+import datetime
+
+import pytest
+from openpyxl import load_workbook
+
+from core import assignment, config, service
+
+START = datetime.date(2025, 3, 3)
+END = datetime.date(2025, 3, 5)
+
+
+@pytest.fixture(scope="module")
+def history():
+    service.initialize_data()
+    service.generate_assignments_for_dates(assignment.working_days(START, END), "greedy")
+
+
+def test_export_history_by_batch(tmp_path, history):
+    output = str(tmp_path / "history.xlsx")
+
+    sheets, group_by = service.export_history_to_excel(output, START, END, "batch")
+
+    assert (sheets, group_by) == (3, "batch")
+    assert len(load_workbook(output, read_only=True).sheetnames) == 3
+
+
+def test_export_history_falls_back_to_month(tmp_path, history, monkeypatch):
+    monkeypatch.setattr(config, "EXPORT_MAX_BATCH_SHEETS", 2)
+    output = str(tmp_path / "history.xlsx")
+
+    sheets, group_by = service.export_history_to_excel(output, START, END, "batch")
+
+    assert (sheets, group_by) == (1, "month")
+    assert load_workbook(output, read_only=True).sheetnames == ["2025-03"]
@@ -0,0 +1,83 @@
+import io
+
+import openpyxl
+import pytest
+
+from core import importer
+
+
+def _csv(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+def _xlsx(rows):
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    data = io.BytesIO()
+    workbook.save(data)
+    data.seek(0)
+    return data
+
+
+@pytest.fixture
+def closed(monkeypatch):
+    """preview가 연 엑셀 파일을 닫을 때마다 기록"""
+    closed = []
+    load_workbook = openpyxl.load_workbook
+
+    def recording(*args, **kwargs):
+        workbook = load_workbook(*args, **kwargs)
+        close = workbook.close
+        workbook.close = lambda: (closed.append(True), close())
+        return workbook
+
+    monkeypatch.setattr(openpyxl, "load_workbook", recording)
+    return closed
+
+
+def test_preview_checks_each_row():
+    df = importer.preview(
+        "members", _csv("이름,활성\n김,예\n이,몰라\n,\n박,\n김,아니오\n"), "a.csv", ["박"]
+    )
+
+    assert df["이름"].tolist() == ["김", "이", "박", "김"]
+    assert df["오류"].str.len().gt(0).tolist() == [False, True, True, True]
+    assert importer.valid_rows(df)["이름"].tolist() == ["김"]
+
+
+def test_duplicate_of_invalid_row_is_reported():
+    df = importer.preview("areas", _csv("구역명,필요인원\n복도,0\n복도,2\n"), "a.csv", [])
+
+    assert df["오류"].tolist()[1] == "파일 안에서 중복됩니다."
+    assert importer.valid_rows(df).empty
+
+
+def test_multiline_record_keeps_file_line_numbers():
+    df = importer.preview(
+        "areas", _csv('구역명,필요인원\n"화장실\n(2층)",2\n복도,1\n\n계단,1\n'), "a.csv", []
+    )
+
+    assert df["구역명"].tolist() == ["화장실\n(2층)", "복도", "계단"]
+    assert df["행"].tolist() == [2, 4, 6]
+
+
+def test_xlsx_rows_and_workbook_closed(closed):
+    rows = [["구역명", "필요인원"], ["복도", 2], [None, None], ["계단", None]]
+    df = importer.preview("areas", _xlsx(rows), "a.xlsx", [])
+
+    assert df["구역명"].tolist() == ["복도", "계단"]
+    assert df["행"].tolist() == [2, 4]
+    assert df["필요인원"].tolist() == [2, 1]
+    assert closed == [True]
+
+
+def test_xlsx_closed_when_header_is_missing(closed):
+    with pytest.raises(ValueError):
+        importer.preview("areas", _xlsx([["이름"], ["복도"]]), "a.xlsx", [])
+    assert closed == [True]
+
+
+def test_unsupported_file():
+    with pytest.raises(ValueError):
+        importer.preview("areas", _csv(""), "a.txt", [])
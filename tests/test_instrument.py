@@ -0,0 +1,59 @@
+import pytest
+
+from core import instrument, metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh():
+    instrument.reset()
+    yield
+    instrument.reset()
+
+
+def test_timed_records_timings_and_metrics(monkeypatch):
+    metrics.reset()
+    times = iter([0.0, 0.25])
+    monkeypatch.setattr(instrument.time, "perf_counter", lambda: next(times))
+
+    @instrument.timed("load_things")
+    def load():
+        return "loaded"
+
+    assert load() == "loaded"
+    (row,) = instrument.summary()
+    assert (row["name"], row["count"], row["p50"]) == ("load_things", 1, 0.25)
+    assert metrics.OPERATION_SECONDS._values[("load_things",)][-1] == 1
+
+
+def test_span_records_even_when_block_fails():
+    with pytest.raises(RuntimeError):
+        with instrument.span("page:test"):
+            raise RuntimeError
+
+    assert [row["name"] for row in instrument.summary()] == ["page:test"]
+
+
+def test_samples_are_bounded_and_percentiles():
+    timings = instrument._Timings(size=100)
+    for value in range(1, 201):
+        timings.record("save", value / 1000)
+
+    (row,) = timings.summary()
+    assert row["count"] == 200 and row["samples"] == 100
+    # 최근 100개(0.101~0.200초) 기준
+    assert row["p50"] == pytest.approx(0.150)
+    assert row["p95"] == pytest.approx(0.195)
+    assert row["max"] == pytest.approx(0.200)
+
+
+def test_profile_keeps_recent_results(monkeypatch):
+    monkeypatch.setattr(instrument, "_profiles", instrument.deque(maxlen=2))
+
+    for name in ["첫째", "둘째", "셋째"]:
+        with instrument.profile(name):
+            sum(range(1000))
+
+    profiles = instrument.recent_profiles()
+    assert [p["name"] for p in profiles] == ["셋째", "둘째"]
+    assert profiles[0]["profiler"] == "cProfile"
+    assert "function calls" in profiles[0]["text"]
@@ -0,0 +1,44 @@
+import os
+import stat
+
+from core import config, metrics, storage
+
+
+def test_write_file_uses_default_file_mode(tmp_path):
+    path = tmp_path / "cleaning.prom"
+
+    metrics.write_file(str(path))
+
+    # mkstemp의 0600이 아니라 새 파일을 만들 때와 같은 권한
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~storage._UMASK
+    assert "# TYPE cleaning_logins_total counter" in path.read_text(encoding="utf-8")
+    assert [p.name for p in tmp_path.iterdir()] == ["cleaning.prom"]
+
+
+def test_write_file_keeps_existing_mode(tmp_path):
+    path = tmp_path / "cleaning.prom"
+    path.write_text("")
+    os.chmod(path, 0o640)
+
+    metrics.write_file(str(path))
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_file_metrics_are_labelled_by_table():
+    metrics.reset()
+
+    metrics.record_read(config.MEMBERS_FILE, 100)
+    for month in ("2025-01", "2025-02", "2025-03"):
+        metrics.record_write(os.path.join(config.PARQUET_DIR, f"{month}.parquet"), 10)
+    metrics.record_read(config.SQLITE_FILE)
+    metrics.record_read("/somewhere/else.csv")
+
+    assert metrics.FILE_READS.items() == [
+        (("members",), 1),
+        (("other",), 1),
+        (("sqlite",), 1),
+    ]
+    assert metrics.FILE_WRITES.items() == [(("assignments",), 3)]
+    assert metrics.FILE_WRITE_BYTES.value(table="assignments") == 30
+    assert 'cleaning_file_read_bytes_total{table="members"} 100' in metrics.exposition()
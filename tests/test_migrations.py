@@ -0,0 +1,89 @@
+import os
+
+import pandas as pd
+import pytest
+
+from core import backends, config, migrations
+from core.backends import TABLES, CsvBackend
+
+
+@pytest.fixture
+def legacy(tmp_path, monkeypatch):
+    """id 컬럼이 없던 예전 형식의 CSV 저장소"""
+    for table in TABLES:
+        name = os.path.basename(TABLES[table]["file"])
+        monkeypatch.setitem(TABLES[table], "file", str(tmp_path / name))
+    for setting in [
+        "ASSIGNMENT_TOMBSTONES_FILE",
+        "ASSIGNMENT_INDEX_FILE",
+        "ID_SEQUENCE_FILE",
+    ]:
+        name = os.path.basename(getattr(config, setting))
+        monkeypatch.setattr(config, setting, str(tmp_path / name))
+
+    def write(table, df):
+        df.to_csv(TABLES[table]["file"], index=False, encoding="utf-8-sig")
+
+    write("members", pd.DataFrame({"이름": ["김", "이"], "활성": [True, False]}))
+    write("areas", pd.DataFrame({"구역명": ["화장실", "복도"], "필요인원": [1, 1]}))
+    write(
+        "users",
+        pd.DataFrame({"username": ["admin"], "password": ["x"], "is_admin": [True]}),
+    )
+    write(
+        "assignments",
+        pd.DataFrame(
+            {
+                "날짜": ["2025-03-03", "2025-03-03", "2025-03-04"],
+                "구역": ["화장실", "복도", "계단"],
+                # 박은 이미 삭제된 팀원
+                "담당자": ["김", "이", "박"],
+            }
+        ),
+    )
+    backend = CsvBackend()
+    monkeypatch.setattr(backends, "_backend", backend)
+    return backend
+
+
+def test_migrate_gives_rows_and_history_ids(legacy):
+    migrations.migrate(legacy)
+
+    members = legacy.load("members")
+    areas = legacy.load("areas")
+    assert members["id"].tolist() == [1, 2]
+    assert areas["id"].tolist() == [1, 2]
+    assert legacy.load("users")["id"].tolist() == [1]
+
+    history = legacy.load("assignments")
+    assert history["구역_id"].tolist() == [1, 2, 3]
+    assert history["담당자_id"].tolist() == [1, 2, 3]
+    # 기록에만 남은 이름에 준 id는 새 행에 다시 쓰지 않음
+    assert legacy.next_ids("members") == [4]
+    assert legacy.next_ids("areas") == [4]
+
+
+def test_migrate_twice_changes_nothing(legacy):
+    migrations.migrate(legacy)
+    versions = {table: legacy.version(table) for table in TABLES}
+
+    migrations.migrate(legacy)
+
+    assert {table: legacy.version(table) for table in TABLES} == versions
+
+
+def test_migrate_retries_after_conflict(legacy, monkeypatch):
+    save = legacy.save
+    conflicts = [migrations.storage.WriteConflictError("busy")]
+
+    def conflicting(table, df, expected_version=None):
+        if conflicts:
+            raise conflicts.pop()
+        return save(table, df, expected_version=expected_version)
+
+    monkeypatch.setattr(legacy, "save", conflicting)
+    migrations.migrate(legacy)
+
+    # 충돌한 시도에서 받은 id는 다시 쓰지 않음
+    assert legacy.load("members")["id"].tolist() == [3, 4]
+    assert not conflicts
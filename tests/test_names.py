@@ -0,0 +1,53 @@
+import pandas as pd
+
+from core import names
+from core.names import NameDictionary
+
+
+def test_encode_uses_shared_ids():
+    dictionary = NameDictionary()
+
+    first = dictionary.encode(pd.Series(["화장실", "복도", "화장실"]))
+    second = dictionary.encode(pd.Series(["계단", "복도"]))
+
+    assert second.dtype == dictionary.dtype
+    assert first.cat.codes.tolist() == [0, 1, 0]
+    assert second.cat.codes.tolist() == [2, 1]
+    # 사전이 커져도 이미 정한 코드는 그대로
+    assert dictionary.encode(first).cat.codes.tolist() == [0, 1, 0]
+    assert dictionary.decode([2, 0]) == ["계단", "화장실"]
+
+
+def test_encode_recodes_other_categoricals_and_keeps_missing():
+    dictionary = NameDictionary()
+    dictionary.add(["복도"])
+    other = pd.Series(pd.Categorical(["화장실", None, "복도"]))
+
+    encoded = dictionary.encode(other)
+
+    assert encoded.cat.codes.tolist() == [1, -1, 0]
+    assert dictionary.encode(encoded) is encoded
+
+
+def test_categorize_returns_input_when_already_encoded():
+    df = pd.DataFrame({"구역": ["화장실", "복도"], "담당자": ["김", "이"]})
+
+    encoded = names.categorize(df)
+
+    assert isinstance(encoded["구역"].dtype, pd.CategoricalDtype)
+    assert not isinstance(df["구역"].dtype, pd.CategoricalDtype)  # 입력은 그대로
+    assert names.categorize(encoded) is encoded
+
+
+def test_group_by_area_sorts_by_name_and_keeps_member_order():
+    df = pd.DataFrame(
+        {
+            "구역": ["화장실", "복도", "화장실", "복도"],
+            "담당자": ["최", "박", "김", "이"],
+        }
+    )
+
+    grouped = names.group_by_area(df)
+
+    assert grouped["구역"].tolist() == ["복도", "화장실"]
+    assert grouped["담당자"].tolist() == [["박", "이"], ["최", "김"]]
@@ -0,0 +1,149 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from core import backends, config
+from core.backends import ParquetBackend
+
+
+def _month(month, days, areas=("화장실", "복도", "계단")):
+    rows = [
+        {
+            "날짜": f"{month}-{day:02d} 09:00:00",
+            "구역": area,
+            "담당자": f"팀원{i}",
+            "구역_id": j + 1,
+            "담당자_id": i + 1,
+        }
+        for day in days
+        for j, area in enumerate(areas)
+        for i in range(j + 1)
+    ]
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = ParquetBackend(str(tmp_path / "assignments"))
+    for month in ("2025-01", "2025-02", "2025-03"):
+        backend._write_partition(month, _month(month, [3, 4]))
+    return backend
+
+
+def test_batch_summary_reads_only_needed_columns(backend, monkeypatch):
+    columns = []
+    read_table = backends.pq.read_table
+
+    def recording(path, *args, **kwargs):
+        columns.append(kwargs.get("columns"))
+        return read_table(path, *args, **kwargs)
+
+    monkeypatch.setattr(backends.pq, "read_table", recording)
+    summary = backend.batch_summary()
+
+    assert columns == [["날짜", "구역"]] * 3
+    assert summary["날짜"].tolist() == [
+        f"{month}-{day:02d} 09:00:00"
+        for month in ("2025-01", "2025-02", "2025-03")
+        for day in (3, 4)
+    ]
+    assert summary["인원"].tolist() == [6] * 6
+    assert summary["구역수"].tolist() == [3] * 6
+
+
+def test_batch_summary_rereads_only_changed_months(backend, monkeypatch):
+    backend.batch_summary()
+    paths = []
+    read_table = backends.pq.read_table
+
+    def recording(path, *args, **kwargs):
+        paths.append(path)
+        return read_table(path, *args, **kwargs)
+
+    monkeypatch.setattr(backends.pq, "read_table", recording)
+    assert len(backend.batch_summary()) == 6
+    assert paths == []
+
+    backend.append("assignments", _month("2025-02", [5]))
+    paths.clear()
+    summary = backend.batch_summary()
+
+    assert [path for path in paths if path.endswith(".parquet")] == [
+        backend._partition_path("2025-02")
+    ]
+    assert summary["날짜"].tolist()[4] == "2025-02-05 09:00:00"
+    assert len(summary) == 7
+
+
+def test_no_csv_batch_index(backend):
+    assert backend.batch_index is None
+
+
+def test_batch_summary_empty(tmp_path):
+    summary = ParquetBackend(str(tmp_path / "empty")).batch_summary()
+    assert summary.empty
+    assert list(summary.columns) == ["날짜", "인원", "구역수"]
+
+
+def test_partition_cache_is_bounded(backend, monkeypatch):
+    paths = list(backend._partitions().values())
+    backend._read_partition(paths[0])
+    one_month = backend._cache_bytes
+    monkeypatch.setattr(config, "PARQUET_CACHE_BYTES", one_month * 2)
+
+    for path in paths:
+        backend._read_partition(path)
+
+    # 가장 오래 안 쓴 1월 파일이 먼저 빠짐
+    assert list(backend._cache) == paths[1:]
+    assert backend._cache_bytes <= config.PARQUET_CACHE_BYTES
+
+    # 다시 쓴 파일은 최근으로 옮겨짐
+    backend._read_partition(paths[1])
+    backend._read_partition(paths[0])
+    assert list(backend._cache) == [paths[1], paths[0]]
+
+
+def test_partition_cache_skips_files_over_limit(backend, monkeypatch):
+    monkeypatch.setattr(config, "PARQUET_CACHE_BYTES", 1)
+    path = next(iter(backend._partitions().values()))
+
+    df = backend._read_partition(path)
+
+    assert len(df) == 12
+    assert not backend._cache and backend._cache_bytes == 0
+
+
+def test_partition_cache_replaces_changed_file(backend):
+    path = backend._partition_path("2025-01")
+    backend._read_partition(path)
+    before = backend._cache_bytes
+
+    backend._write_partition("2025-01", _month("2025-01", [3, 4, 5]))
+    df = backend._read_partition(path)
+
+    assert len(df) == 18
+    assert len(backend._cache) == 1
+    assert backend._cache_bytes > before
+
+
+def test_clear_cache_rereads_partitions(backend, monkeypatch):
+    backend.load("assignments")
+    backend.batch_summary()
+    backend.clear_cache()
+    assert not backend._cache and backend._cache_bytes == 0
+    assert not backend._summaries
+
+    paths = []
+    read_table = backends.pq.read_table
+
+    def recording(path, *args, **kwargs):
+        paths.append(path)
+        return read_table(path, *args, **kwargs)
+
+    monkeypatch.setattr(backends.pq, "read_table", recording)
+    backend.load("assignments")
+    backend.batch_summary()
+
+    assert len(paths) == 6
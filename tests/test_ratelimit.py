@@ -0,0 +1,74 @@
+import pytest
+
+from core.ratelimit import SlidingWindowLimiter
+
+
+@pytest.fixture
+def limiter():
+    return SlidingWindowLimiter(limit=3, window=60, max_keys=100)
+
+
+def test_blocks_after_limit(limiter):
+    for now in (0, 1, 2):
+        assert limiter.retry_after("kim", now=now) == 0
+        limiter.record_failure("kim", now=now)
+
+    # 가장 오래된 실패가 창 밖으로 나갈 때까지 남은 시간
+    assert limiter.retry_after("kim", now=10) == 50
+    assert limiter.retry_after("lee", now=10) == 0
+
+
+def test_old_failures_leave_window(limiter):
+    for now in (0, 1, 2):
+        limiter.record_failure("kim", now=now)
+
+    assert limiter.retry_after("kim", now=60) == 0
+    assert limiter.retry_after("kim", now=61.5) == 0
+
+    # 창 안에 남은 실패는 계속 셈
+    limiter.record_failure("kim", now=62)
+    limiter.record_failure("kim", now=63)
+    assert limiter.retry_after("kim", now=63) == 0
+    limiter.record_failure("kim", now=64)
+    assert limiter.retry_after("kim", now=64) == 58
+
+
+def test_reset_clears_key(limiter):
+    for now in (0, 1, 2):
+        limiter.record_failure("kim", now=now)
+
+    limiter.reset("kim")
+
+    assert limiter.retry_after("kim", now=3) == 0
+    assert limiter.stats(now=3)["tracked"] == 0
+
+
+def test_expired_keys_are_evicted(limiter):
+    limiter.record_failure("kim", now=0)
+    limiter.record_failure("lee", now=30)
+
+    assert limiter.stats(now=61)["tracked"] == 1
+    assert limiter.stats(now=91)["tracked"] == 0
+
+
+def test_max_keys_drops_oldest():
+    limiter = SlidingWindowLimiter(limit=1, window=60, max_keys=2)
+    limiter.record_failure("a", now=0)
+    limiter.record_failure("b", now=1)
+    limiter.record_failure("a", now=2)
+    limiter.record_failure("c", now=3)
+
+    # "b"가 가장 오래 전에 실패한 키
+    assert limiter.retry_after("b", now=4) == 0
+    assert limiter.retry_after("a", now=4) > 0
+    assert limiter.retry_after("c", now=4) > 0
+    assert limiter.stats(now=4)["tracked"] == 2
+
+
+def test_stats(limiter):
+    for now in (0, 1, 2):
+        limiter.record_failure("kim", now=now)
+    limiter.record_failure("lee", now=3)
+    limiter.record_block()
+
+    assert limiter.stats(now=4) == {"blocked": 1, "tracked": 2, "locked": 1}
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import config
+from core.rotation import RotationMatrix
+
+
+def _batch(date, pairs):
+    """(담당자_id, 구역_id) 목록으로 배치 하나"""
+    return pd.DataFrame(
+        {
+            "날짜": [date] * len(pairs),
+            "담당자_id": [member for member, _ in pairs],
+            "구역_id": [area for _, area in pairs],
+        }
+    )
+
+
+def _assert_same(matrix, expected):
+    members, areas = expected.members, expected.areas
+    assert matrix.batches == expected.batches
+    for actual, wanted in zip(matrix.submatrix(members, areas), expected.submatrix(members, areas)):
+        np.testing.assert_array_equal(actual, wanted)
+
+
+def _no_history():
+    raise AssertionError("배치 기록을 다시 읽으면 안 됨")
+
+
+def test_add_batch_counts_and_batches_ago():
+    matrix = RotationMatrix()
+    matrix.add_batch(_batch("2025-03-03", [(1, 10), (2, 20)]))
+    matrix.add_batch(_batch("2025-03-04", [(1, 10), (2, 10)]))
+
+    assert matrix.count(1, 10) == 2
+    assert matrix.batches_ago(1, 10) == 0
+    assert matrix.batches_ago(2, 20) == 1
+    assert matrix.batches_ago(3, 10) is None
+
+
+def test_add_past_batch_shifts_later_ordinals():
+    matrix = RotationMatrix()
+    matrix.add_batch(_batch("2025-03-05", [(1, 10)]))
+    matrix.add_batch(_batch("2025-03-03", [(1, 20)]))
+
+    assert matrix.batches == ["2025-03-03", "2025-03-05"]
+    assert matrix.batches_ago(1, 10) == 0
+    assert matrix.batches_ago(1, 20) == 1
+
+
+def test_remove_latest_batch_uses_recent_ordinals():
+    batches = [_batch(f"2025-03-0{day}", [(1, 10), (2, 20)]) for day in range(1, 4)]
+    matrix = RotationMatrix()
+    for batch in batches:
+        matrix.add_batch(batch)
+
+    matrix.remove_batch("2025-03-03", batches[-1], _no_history)
+
+    _assert_same(matrix, RotationMatrix.from_assignments(pd.concat(batches[:-1])))
+    assert matrix.batches_ago(1, 10) == 0
+
+
+def test_remove_more_than_recent_depth_reloads_history():
+    depth = config.ROTATION_RECENT_BATCHES
+    batches = [
+        _batch(f"2025-03-{day:02d}", [(1, 10), (2, 20 + day)])
+        for day in range(1, depth + 3)
+    ]
+    matrix = RotationMatrix.from_assignments(pd.concat(batches))
+
+    remaining = list(batches)
+    loads = []
+
+    def load_history():
+        loads.append(1)
+        return pd.concat(remaining)
+
+    while len(remaining) > 1:
+        removed = remaining.pop()
+        matrix.remove_batch(removed["날짜"].iloc[0], removed, load_history)
+        _assert_same(matrix, RotationMatrix.from_assignments(pd.concat(remaining)))
+
+    # 팀원 1의 구역 10 순번을 모두 보관하지 못했을 때 한 번만 다시 읽음
+    assert len(loads) == 1
+
+
+def test_incremental_updates_match_rebuild():
+    rng = np.random.default_rng(0)
+    dates = [f"2025-04-{day:02d}" for day in rng.permutation(np.arange(1, 21))]
+    batches = {
+        date: _batch(
+            date, list(zip(range(1, 7), rng.integers(1, 4, 6).tolist()))
+        )
+        for date in dates
+    }
+
+    matrix = RotationMatrix()
+    for date in dates:
+        matrix.add_batch(batches[date])
+    _assert_same(matrix, RotationMatrix.from_assignments(pd.concat(batches.values())))
+
+    for date in rng.permutation(dates)[:15]:
+        removed = batches.pop(date)
+        matrix.remove_batch(date, removed, lambda: pd.concat(batches.values()))
+        _assert_same(matrix, RotationMatrix.from_assignments(pd.concat(batches.values())))
+
+
+def test_missing_ids_are_ignored():
+    batch = pd.DataFrame(
+        {
+            "날짜": ["2025-03-03"] * 3,
+            "담당자_id": [1, None, 2],
+            "구역_id": [10, 10, None],
+        }
+    )
+    matrix = RotationMatrix.from_assignments(batch)
+    matrix.add_batch(batch.assign(날짜="2025-03-04"))
+
+    assert matrix.members == [1, 2]
+    assert matrix.areas == [10]
+    assert matrix.counts.tolist() == [[2], [0]]
+    assert matrix.batches_ago(2, 10) is None
+
+    matrix.remove_batch("2025-03-04", batch.assign(날짜="2025-03-04"), _no_history)
+    assert matrix.counts.tolist() == [[1], [0]]
+
+
+def test_submatrix_unknown_ids():
+    matrix = RotationMatrix.from_assignments(_batch("2025-03-03", [(1, 10)]))
+
+    counts, batches_ago = matrix.submatrix([1, 99], [10, 77])
+
+    assert counts.tolist() == [[1, 0], [0, 0]]
+    assert batches_ago[0, 0] == 0
+    assert np.isinf(batches_ago[1]).all() and np.isinf(batches_ago[:, 1]).all()
+
+
+def test_save_and_load(tmp_path):
+    matrix = RotationMatrix.from_assignments(_batch("2025-03-03", [(1, 10), (2, 20)]))
+    matrix.source_version = [1, 2, 3]
+    path = tmp_path / "rotation.npz"
+
+    matrix.save(path)
+    loaded = RotationMatrix.load(path)
+
+    _assert_same(loaded, matrix)
+    assert loaded.source_version == [1, 2, 3]
+    np.testing.assert_array_equal(loaded.recent, matrix.recent)
+
+
+def test_load_rejects_other_depth(tmp_path, monkeypatch):
+    path = tmp_path / "rotation.npz"
+    RotationMatrix.from_assignments(_batch("2025-03-03", [(1, 10)])).save(path)
+
+    monkeypatch.setattr(config, "ROTATION_RECENT_BATCHES", config.ROTATION_RECENT_BATCHES + 1)
+    with pytest.raises(ValueError):
+        RotationMatrix.load(path)
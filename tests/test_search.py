@@ -0,0 +1,114 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import assignment, config, search
+from core.rotation import RotationMatrix
+
+AREAS = pd.DataFrame({"id": [1, 2, 3], "필요인원": [2, 2, 2]})
+MEMBERS = list(range(1, 7))
+DATES = ["2025-03-03 09:00:00", "2025-03-04 09:00:00", "2025-03-05 09:00:00"]
+
+
+def _search_args(workers):
+    rng = np.random.default_rng(0)
+    need = np.array([2, 2, 2])
+    return dict(
+        cost=rng.random((6, 3)),
+        weight=1.0 / need,
+        base_load=np.zeros(6),
+        need=need,
+        slot_areas=np.repeat(np.arange(3), need),
+        seed=1,
+        workers=workers,
+        restarts=2,
+        iterations=200,
+        time_budget=10.0,
+        balance_penalty=1.0,
+        headcount_penalty=100.0,
+    )
+
+
+def test_search_reuses_process_pool():
+    try:
+        first, _ = search.search_assignment(**_search_args(workers=2))
+        pool = search._pool
+        second, _ = search.search_assignment(**_search_args(workers=2))
+
+        assert search._pool is pool
+        np.testing.assert_array_equal(first, second)
+    finally:
+        search.shutdown_pool()
+    assert search._pool is None
+
+
+def test_search_seed_sequence_matches_int_seed():
+    args = _search_args(workers=1)
+    by_int, _ = search.search_assignment(**args)
+    by_sequence, _ = search.search_assignment(
+        **dict(args, seed=np.random.SeedSequence(1))
+    )
+    np.testing.assert_array_equal(by_int, by_sequence)
+
+
+def test_plan_batches_uses_different_seed_per_day(monkeypatch):
+    monkeypatch.setattr(config, "SEARCH_SEED", "7")
+    seen = []
+
+    def record_engine(members, areas_df, history, rng=None):
+        seen.append(int(rng.integers(2**63)))
+        return assignment.greedy_engine(members, areas_df, history, rng)
+
+    monkeypatch.setitem(assignment.ENGINES, "record", record_engine)
+    first = assignment.plan_batches(
+        DATES, MEMBERS, AREAS, RotationMatrix(), "record", candidates=2
+    )
+
+    assert len(seen) == len(set(seen)) == len(DATES) * 2
+
+    # 같은 SEARCH_SEED면 같은 결과
+    second = assignment.plan_batches(
+        DATES, MEMBERS, AREAS, RotationMatrix(), "record", candidates=2
+    )
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_plan_batches_runs_searching_engine_once_per_day(monkeypatch):
+    calls = []
+
+    def fake_search(members, areas_df, history, rng=None, time_budget=None):
+        calls.append(1)
+        return assignment.greedy_engine(members, areas_df, history, rng)
+
+    monkeypatch.setitem(assignment.ENGINES, "search", fake_search)
+    assignment.plan_batches(DATES, MEMBERS, AREAS, RotationMatrix(), "search", candidates=4)
+
+    assert len(calls) == len(DATES)
+
+
+def test_plan_batches_shares_one_search_budget(monkeypatch):
+    monkeypatch.setattr(config, "SEARCH_TIME_BUDGET", 0.5)
+    budgets, deadlines = [], []
+
+    def fake_search(members, areas_df, history, rng=None, time_budget=None):
+        budgets.append(time_budget)
+        deadlines.append(time.monotonic() + time_budget)
+        return assignment.greedy_engine(members, areas_df, history, rng)
+
+    monkeypatch.setitem(assignment.ENGINES, "search", fake_search)
+    start = time.monotonic()
+    assignment.plan_batches(DATES, MEMBERS, AREAS, RotationMatrix(), "search")
+
+    # 날짜마다 전체 시간을 주지 않고 기간 전체 시간 하나를 남은 날짜에 나눠 씀
+    assert len(budgets) == len(DATES)
+    assert budgets[0] <= 0.5 / len(DATES)
+    assert max(deadlines) < start + 0.5 + 0.05
+
+
+def test_search_pool_uses_spawn():
+    try:
+        pool = search._get_pool(2)
+        assert pool._mp_context.get_start_method() == "spawn"
+    finally:
+        search.shutdown_pool()
@@ -0,0 +1,99 @@
+import time
+
+import pandas as pd
+
+from conftest import AREAS, MEMBERS
+from core import assignment, backends, config, names, service
+from core.changes import diff_rows
+
+def _add_history(batches):
+    """batches개 배치를 한 번에 추가 (새로 생성할 배치보다 앞선 날짜)"""
+    rows = pd.DataFrame(
+        {
+            "날짜": [f"2000-01-01 {i // MEMBERS:06d}" for i in range(batches * MEMBERS)],
+            "구역_id": [i % AREAS + 1 for i in range(batches * MEMBERS)],
+            "담당자_id": [i % MEMBERS + 1 for i in range(batches * MEMBERS)],
+        }
+    )
+    service.append_assignments(
+        service.attach_names(rows, service.load_members(), service.load_areas())
+    )
+
+
+def _generation_seconds():
+    # 배치 기록을 캐시에 올려 둔 상태 (화면이 기록을 보여 준 뒤 생성하는 경우)
+    service.load_assignments()
+    service.generate_assignment("greedy")
+
+    times = []
+    for _ in range(5):
+        service.load_assignments()
+        start = time.process_time()
+        service.generate_assignment("greedy")
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def test_generation_time_does_not_grow_with_history(empty_data):
+    _add_history(100)
+    small = _generation_seconds()
+
+    _add_history(4000)
+    large = _generation_seconds()
+
+    # 기록이 40배 늘어도 배치 하나 생성 시간은 거의 같아야 함
+    # (추가할 때 기존 기록을 복사하거나 다시 변환하지 않음)
+    assert large < small * 2 + 0.005
+    assert len(service.load_assignments()) == (4100 + 12) * MEMBERS
+
+
+def test_month_is_generated_with_one_append(empty_data, monkeypatch):
+    backend = backends.get_backend()
+    appended = []
+    append = backend.append
+
+    def recording(table, df):
+        appended.append(len(df))
+        return append(table, df)
+
+    monkeypatch.setattr(backend, "append", recording)
+    days = assignment.working_days(*assignment.month_range(2025, 3))
+
+    generated = service.generate_assignments_for_dates(days, "greedy")
+
+    assert appended == [len(days) * MEMBERS]
+    assert generated["날짜"].nunique() == len(days)
+    assert service.load_batch_index()["날짜"].tolist() == sorted(
+        f"{day:%Y-%m-%d} {config.PLAN_BATCH_TIME}" for day in days
+    )
+
+    # 이미 배치가 있는 날짜는 건너뜀
+    assert service.generate_assignments_for_dates(days[:3], "greedy").empty
+    assert appended == [len(days) * MEMBERS]
+
+
+def test_loaded_names_share_one_dictionary(empty_data):
+    _add_history(3)
+    service.generate_assignment("greedy")
+
+    history = service.load_assignments()
+    batch = service.load_assignment_batch(history["날짜"].iloc[0])
+
+    for df in (history, batch):
+        assert df["구역"].dtype == names.AREAS.dtype
+        assert df["담당자"].dtype == names.MEMBERS.dtype
+    assert history["구역"].cat.codes.max() < len(names.AREAS.names)
+
+
+def test_renamed_member_keeps_rotation_history(empty_data):
+    service.generate_assignment("greedy")
+    members = service.load_members()
+    renamed = members.copy()
+    renamed.loc[renamed["id"] == 1, "이름"] = "새이름"
+
+    service.save_changes("members", diff_rows(members, renamed))
+    batch = service.generate_assignment("greedy")
+
+    matrix = service.load_rotation_matrix()
+    assert sum(matrix.count(1, area) for area in range(1, AREAS + 1)) == 2
+    assert batch.loc[batch["담당자_id"] == 1, "담당자"].tolist() == ["새이름"]
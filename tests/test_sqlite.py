@@ -0,0 +1,89 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from core import names
+from core.backends import SqliteBackend
+
+
+def _batch(date, pairs):
+    return pd.DataFrame(
+        [
+            {
+                "날짜": date,
+                "구역": area,
+                "담당자": member,
+                "구역_id": i + 1,
+                "담당자_id": i + 1,
+            }
+            for i, (area, member) in enumerate(pairs)
+        ]
+    )
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "cleaning.db"))
+    backend.save(
+        "assignments",
+        pd.concat(
+            [
+                _batch("2025-03-03 09:00:00", [("화장실", "김"), ("복도", "이")]),
+                _batch("2025-03-04 09:00:00", [("화장실", "박")]),
+            ],
+            ignore_index=True,
+        ),
+    )
+    return backend
+
+
+def test_find_without_conditions_returns_all_rows(backend):
+    df = backend.find("assignments")
+
+    assert df["담당자"].tolist() == ["김", "이", "박"]
+    assert df["담당자"].dtype == names.MEMBERS.dtype
+
+
+def test_find_with_conditions(backend):
+    df = backend.find("assignments", 날짜="2025-03-03 09:00:00", 구역="복도")
+
+    assert df["담당자"].tolist() == ["이"]
+    assert df.attrs["version"] == backend.version("assignments")
+
+
+def test_batches_and_summary(backend):
+    backend.append("assignments", _batch("2025-03-05 09:00:00", [("계단", "최")]))
+
+    assert backend.latest_batch() == "2025-03-05 09:00:00"
+    assert backend.batch_summary()["인원"].tolist() == [2, 1, 1]
+    assert backend.batches_with(
+        ["2025-03-03 09:00:00", "2025-03-04 09:00:00"], 구역="화장실"
+    ) == {"2025-03-03 09:00:00", "2025-03-04 09:00:00"}
+
+    backend.delete_batch("2025-03-04 09:00:00")
+    assert backend.load_batch("2025-03-04 09:00:00").empty
+    assert backend.batch_summary()["날짜"].tolist() == [
+        "2025-03-03 09:00:00",
+        "2025-03-05 09:00:00",
+    ]
+
+
+def test_wal_mode_is_set_once(backend, monkeypatch):
+    # 저장소를 처음 쓸 때 설정한 WAL 모드가 파일에 남아 있음
+    with sqlite3.connect(backend.path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    statements = []
+    connect = sqlite3.connect
+
+    def tracing(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracing)
+    backend.load("assignments")
+    backend.find("assignments", 구역="화장실")
+
+    assert statements and not any("journal_mode" in s for s in statements)
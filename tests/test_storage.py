@@ -0,0 +1,97 @@
+import os
+import stat
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import names, storage
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_csv_new_file_uses_umask(tmp_path):
+    path = tmp_path / "members.csv"
+    storage.write_csv(path, pd.DataFrame({"id": [1]}))
+    assert _mode(path) == 0o666 & ~storage._UMASK
+
+
+def test_write_csv_keeps_existing_mode(tmp_path):
+    path = tmp_path / "members.csv"
+    storage.write_csv(path, pd.DataFrame({"id": [1]}))
+    os.chmod(path, 0o640)
+
+    storage.write_csv(path, pd.DataFrame({"id": [1, 2]}))
+
+    assert _mode(path) == 0o640
+    assert storage.read_csv(path)["id"].tolist() == [1, 2]
+
+
+def test_write_csv_conflict(tmp_path):
+    path = tmp_path / "members.csv"
+    storage.write_csv(path, pd.DataFrame({"id": [1]}))
+    version, df = storage.read_csv_versioned(path)
+    storage.write_csv(path, pd.DataFrame({"id": [2]}))
+
+    with pytest.raises(storage.WriteConflictError):
+        storage.write_csv(path, df, expected_version=version)
+    assert storage.read_csv(path)["id"].tolist() == [2]
+
+
+def test_read_csv_reuses_cache_until_file_changes(tmp_path):
+    path = tmp_path / "members.csv"
+    pd.DataFrame({"id": [1, 2]}).to_csv(path, index=False)
+
+    first = storage.read_csv(path)
+    second = storage.read_csv(path)
+    # 같은 버전이면 다시 파싱하지 않고 캐시된 데이터를 공유
+    assert np.shares_memory(first["id"].to_numpy(), second["id"].to_numpy())
+
+    pd.DataFrame({"id": [1, 2, 3]}).to_csv(path, index=False)
+    assert storage.read_csv(path)["id"].tolist() == [1, 2, 3]
+
+
+def test_read_csv_changes_do_not_reach_cache(tmp_path):
+    path = tmp_path / "members.csv"
+    storage.write_csv(path, pd.DataFrame({"id": [1, 2], "이름": ["가", "나"]}))
+
+    df = storage.read_csv(path)
+    df.loc[0, "id"] = 9
+    df["추가"] = 0
+    df.attrs["version"] = "x"
+
+    again = storage.read_csv(path)
+    assert again["id"].tolist() == [1, 2]
+    assert list(again.columns) == ["id", "이름"]
+    assert "version" not in again.attrs
+
+
+def test_append_csv_defers_cache_update(tmp_path):
+    path = tmp_path / "assignments.csv"
+    storage.write_csv(path, pd.DataFrame({"id": [1, 2]}))
+    first = storage.read_csv(path)
+
+    storage.append_csv(path, pd.DataFrame({"id": [3]}))
+    storage.append_csv(path, pd.DataFrame({"id": [4, 5]}))
+
+    # 추가할 때는 기존 기록을 복사하지 않고, 다음에 읽을 때 한 번에 붙임
+    version, cached, appended = storage._cache[os.path.abspath(path)]
+    assert version == storage.file_version(path)
+    assert np.shares_memory(cached["id"].to_numpy(), first["id"].to_numpy())
+    assert len(appended) == 2
+    assert storage.read_csv(path)["id"].tolist() == [1, 2, 3, 4, 5]
+    assert pd.read_csv(path)["id"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_append_csv_keeps_categories(tmp_path):
+    path = tmp_path / "assignments.csv"
+    storage.write_csv(path, pd.DataFrame({"구역": ["화장실"], "담당자": ["김"]}))
+    storage.read_csv(path, names.categorize)
+
+    storage.append_csv(path, pd.DataFrame({"구역": ["복도"], "담당자": ["새이름"]}))
+
+    df = storage.read_csv(path, names.categorize)
+    assert df["담당자"].dtype == names.MEMBERS.dtype
+    assert df["담당자"].tolist() == ["김", "새이름"]